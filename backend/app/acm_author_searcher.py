@@ -1,72 +1,129 @@
-import time
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
 from bs4 import BeautifulSoup
 import re
 
+from backend.app import http_client
+
 
 class ACMAuthorSearcher:
     results_per_page = 21
+    base_url = "https://dl.acm.org"
+    max_workers = 3
 
-    def __init__(self):
+    def __init__(self, page_cache=None):
         self.seen_authors = set()
         self.current_query = None
         self.next_page_cache = []
+        # optional SearchPageCache shared across requests and workers
+        self.page_cache = page_cache
 
-    def scrape_page(self, url, headers, profile_url_pattern, is_field):
+    def fetch_page(self, url, headers):
         try:
-            time.sleep(1)
-
-            response = requests.get(url, headers=headers)
+            response = http_client.get(url, headers=headers)
             if response.status_code != 200:
                 print(f"Failed to retrieve data from URL: {url}")
-                return []
-
-            soup = BeautifulSoup(response.content, 'html.parser')
-            items = soup.find_all('li', class_='search__item') if is_field else soup.find_all('li', class_='people__people-list')
-
-            results = []
-            for item in items:
-                if is_field:
-                    author_elements = item.find_all('a', title=True)
-                    for author in author_elements:
-                        author_name = author['title'].strip()
-                        author_link = f"https://dl.acm.org{author['href']}"
-                        if profile_url_pattern.match(author_link) and author_name not in self.seen_authors:
-                            self.seen_authors.add(author_name)
-                            results.append({
-                                "Name": author_name,
-                                "Location": None,
-                                "Profile Link": author_link
-                            })
-                else:
-                    name_tag = item.find('div', class_='name')
-                    name = name_tag.text.strip() if name_tag else 'Unknown'
-                    location_tag = item.find('div', class_='location')
-                    location = location_tag.text.strip() if location_tag else 'Unknown location'
-                    profile_link_tag = item.find('a', href=True, title="View Profile")
-                    profile_link = f"https://dl.acm.org{profile_link_tag['href']}" if profile_link_tag else 'No profile link'
-
-                    if name not in self.seen_authors:
-                        self.seen_authors.add(name)
+                return None
+            return response.content
+        except Exception as e:
+            print(f"Error fetching page: {e}")
+            return None
+
+    @staticmethod
+    def parse_page(content, profile_url_pattern, is_field):
+        '''Extract the author entries of a search page, without deduplication.'''
+        soup = BeautifulSoup(content, 'html.parser')
+        items = soup.find_all('li', class_='search__item') if is_field else soup.find_all('li', class_='people__people-list')
+
+        results = []
+        for item in items:
+            if is_field:
+                author_elements = item.find_all('a', title=True)
+                for author in author_elements:
+                    author_name = author['title'].strip()
+                    author_link = f"https://dl.acm.org{author['href']}"
+                    if profile_url_pattern.match(author_link):
                         results.append({
-                            "Name": name,
-                            "Location": location,
-                            "Profile Link": profile_link
+                            "Name": author_name,
+                            "Location": None,
+                            "Profile Link": author_link
                         })
+            else:
+                name_tag = item.find('div', class_='name')
+                name = name_tag.text.strip() if name_tag else 'Unknown'
+                location_tag = item.find('div', class_='location')
+                location = location_tag.text.strip() if location_tag else 'Unknown location'
+                profile_link_tag = item.find('a', href=True, title="View Profile")
+                profile_link = f"https://dl.acm.org{profile_link_tag['href']}" if profile_link_tag else 'No profile link'
+
+                results.append({
+                    "Name": name,
+                    "Location": location,
+                    "Profile Link": profile_link
+                })
 
-            return results
+        return results
 
+    def _fetch_and_parse(self, url, headers, profile_url_pattern, is_field):
+        '''Return the parsed entries of a page, or None if it could not be fetched or parsed.'''
+        content = self.fetch_page(url, headers)
+        if content is None:
+            return None
+        try:
+            return self.parse_page(content, profile_url_pattern, is_field)
         except Exception as e:
             print(f"Error scraping page: {e}")
+            return None
+
+    def _filter_unseen(self, page_results):
+        results = []
+        for result in page_results:
+            if result["Name"] not in self.seen_authors:
+                self.seen_authors.add(result["Name"])
+                results.append(result)
+        return results
+
+    def scrape_page(self, url, headers, profile_url_pattern, is_field):
+        return self._filter_unseen(self._fetch_and_parse(url, headers, profile_url_pattern, is_field) or [])
+
+    def fetch_page_window(self, base_url, headers, profile_url_pattern, is_field, start_page, end_page):
+        '''Return the new authors of each page in [start_page, end_page) as one list per page.'''
+        page_numbers = list(range(start_page, end_page))
+        if not page_numbers:
             return []
 
+        search_type = 'field' if is_field else 'author'
+        pages = {}
+        if self.page_cache is not None and self.current_query is not None:
+            for page_number in page_numbers:
+                cached = self.page_cache.get(search_type, self.current_query, page_number)
+                if cached is not None:
+                    pages[page_number] = cached
+
+        missing = [page_number for page_number in page_numbers if page_number not in pages]
+        if missing:
+            # pages are fetched and parsed concurrently, the shared rate limiter keeps the
+            # requests to ACM spaced out; deduplication runs afterwards in page order
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                fetched = executor.map(
+                    lambda page_number: self._fetch_and_parse(
+                        f"{base_url}&startPage={page_number}", headers, profile_url_pattern, is_field
+                    ),
+                    missing
+                )
+                for page_number, page_results in zip(missing, fetched):
+                    if page_results is None:
+                        # failed pages are not cached so they are retried on the next request
+                        page_results = []
+                    elif self.page_cache is not None and self.current_query is not None:
+                        self.page_cache.set(search_type, self.current_query, page_number, page_results)
+                    pages[page_number] = page_results
+
+        return [self._filter_unseen(pages[page_number]) for page_number in page_numbers]
 
     def fetch_pages(self, base_url, headers, profile_url_pattern, is_field, start_page, end_page):
-        urls = [f"{base_url}&startPage={i}" for i in range(start_page, end_page)]
         results = []
-
-        for url in urls:
-            page_results = self.scrape_page(url, headers, profile_url_pattern, is_field)
+        for page_results in self.fetch_page_window(base_url, headers, profile_url_pattern, is_field, start_page, end_page):
             results.extend(page_results)
 
         return results
@@ -85,7 +142,7 @@ class ACMAuthorSearcher:
             self.current_query = author_name
 
         profile_url_pattern = re.compile(r"^https://dl\.acm\.org/profile/\d+$")
-        base_url = f"https://dl.acm.org/action/doSearch?AllField={formatted_name}&content=people&target=people-tab&sortBy=relevancy&groupByField=ContribIdSingleValued"
+        base_url = f"{self.base_url}/action/doSearch?AllField={formatted_name}&content=people&target=people-tab&sortBy=relevancy&groupByField=ContribIdSingleValued"
         results = []
 
         if self.next_page_cache:
@@ -124,28 +181,29 @@ class ACMAuthorSearcher:
             self.current_query = field_name
 
         profile_url_pattern = re.compile(r"^https://dl.acm\.org/profile/\d+$")
-        base_url = f"https://dl.acm.org/action/doSearch?AllField={formatted_field}&content=standard&target=default&sortBy="
+        base_url = f"{self.base_url}/action/doSearch?AllField={formatted_field}&content=standard&target=default&sortBy="
         results = []
 
         if self.next_page_cache:
             results.extend(self.next_page_cache[:self.results_per_page])
             self.next_page_cache = self.next_page_cache[self.results_per_page:]
 
-        if len(results) < self.results_per_page:
-            current_page_results = self.fetch_pages(
-                base_url, headers, profile_url_pattern, is_field=True,
-                start_page=page_number, end_page=page_number + 1
-            )
+        # the current page (when still needed) and the next page are fetched together
+        fetch_current_page = len(results) < self.results_per_page
+        pages = self.fetch_page_window(
+            base_url, headers, profile_url_pattern, is_field=True,
+            start_page=page_number if fetch_current_page else page_number + 1, end_page=page_number + 2
+        )
+
+        if fetch_current_page:
+            current_page_results = pages.pop(0)
             for result in current_page_results:
                 if len(results) < self.results_per_page:
                     results.append(result)
                 else:
                     self.next_page_cache.append(result)
 
-        next_page_results = self.fetch_pages(
-            base_url, headers, profile_url_pattern, is_field=True,
-            start_page=page_number + 1, end_page=page_number + 2
-        )
+        next_page_results = pages[0]
         for result in next_page_results:
             self.next_page_cache.append(result)
 
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+import aiohttp
+
+# Requests allowed in flight at once per host. Hosts that are not listed use
+# DEFAULT_HOST_CONCURRENCY. Request rates are limited separately by
+# http_client.rate_limiter.
+HOST_CONCURRENCY = {
+    "dl.acm.org": 3,
+}
+DEFAULT_HOST_CONCURRENCY = 10
+
+CONNECTION_LIMIT = 100
+DNS_CACHE_TTL = 300
+
+
+class AsyncRuntime:
+    '''A single event loop running in a background thread for the lifetime of the process.
+
+    Flask request threads hand coroutines to the loop with run(); background work is
+    scheduled with submit(). Every coroutine shares one aiohttp.ClientSession, so
+    connections are reused across requests, and per-host semaphores cap how many
+    requests to each host are in flight.'''
+
+    def __init__(self, host_concurrency=None, default_concurrency=DEFAULT_HOST_CONCURRENCY):
+        self.host_concurrency = HOST_CONCURRENCY if host_concurrency is None else host_concurrency
+        self.default_concurrency = default_concurrency
+        self.loop = None
+        self.thread = None
+        self.session = None
+        self.semaphores = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self.loop is not None:
+                return self.loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self.thread = threading.Thread(target=run, name="async-runtime", daemon=True)
+            self.thread.start()
+            ready.wait()
+            self.loop = loop
+            return loop
+
+    def submit(self, coroutine):
+        '''Schedule coroutine on the runtime's loop and return a concurrent.futures.Future.'''
+        return asyncio.run_coroutine_threadsafe(coroutine, self.start())
+
+    def run(self, coroutine, timeout=None):
+        '''Run coroutine on the runtime's loop and block the calling thread until it finishes.'''
+        return self.submit(coroutine).result(timeout)
+
+    async def get_session(self):
+        '''Return the shared aiohttp session; must be called from the runtime's loop.'''
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=CONNECTION_LIMIT, ttl_dns_cache=DNS_CACHE_TTL)
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    @asynccontextmanager
+    async def host_slot(self, url):
+        '''Hold one of the host's concurrency slots for the duration of the block.'''
+        host = urlsplit(url).hostname or ''
+        semaphore = self.semaphores.get(host)
+        if semaphore is None:
+            semaphore = self.semaphores[host] = asyncio.Semaphore(
+                self.host_concurrency.get(host, self.default_concurrency)
+            )
+        async with semaphore:
+            yield
+
+    def shutdown(self):
+        with self._lock:
+            loop, self.loop = self.loop, None
+        if loop is None:
+            return
+        if self.session is not None:
+            asyncio.run_coroutine_threadsafe(self.session.close(), loop).result()
+            self.session = None
+        loop.call_soon_threadsafe(loop.stop)
+        self.thread.join()
+        loop.close()
+        self.semaphores = {}
+
+
+runtime = AsyncRuntime()
@@ -1,6 +1,5 @@
 import os
 import random
-import time
 
 from fake_useragent import UserAgent
 from collections import Counter
@@ -8,16 +7,17 @@ import aiohttp
 from bs4 import BeautifulSoup
 import re
 import networkx as nx
-import datetime
 from node2vec import Node2Vec
 import numpy as np
 from sklearn.cluster import DBSCAN
-import nest_asyncio
 import traceback
 import asyncio
 import hashlib
 
-nest_asyncio.apply()
+from backend.app import async_runtime, config, http_client
+from backend.app.graph_embeddings import EmbeddingStore
+from backend.app.recommendations_cache import RecommendationsCache
+from backend.app.search_cache import FieldAuthorCache
 
 def safe_int(value, default=0):
     try:
@@ -32,19 +32,21 @@ def safe_float(value, default=0.0):
         return default
 
 
+# authors per field, shared by every request; stale entries are served while they are refreshed
+field_author_cache = FieldAuthorCache(db_path=config.FIELD_CACHE_PATH, ttl=24 * 3600, stale_ttl=7 * 24 * 3600)
+
+
 class ACMAuthorSearcher:
-    def __init__(self, crawl_delay=1):
+    base_url = "https://dl.acm.org"
+
+    def __init__(self, crawl_delay=1, field_cache=None, runtime=None):
         self.seen_authors = set()
-        self.field_cache = {}
+        self.field_cache = field_cache if field_cache is not None else field_author_cache
+        self.runtime = runtime if runtime is not None else async_runtime.runtime
         self.ua = UserAgent()
         self.crawl_delay = crawl_delay
-        self.semaphore = asyncio.Semaphore(1)
-
-    async def fetch_page(self, session, field_name, page_number, start_time):
-        delay = max(0, start_time + self.crawl_delay * (page_number - 1) - time.time())
-        if delay > 0:
-            await asyncio.sleep(delay)
 
+    async def fetch_page(self, session, field_name, page_number):
         formatted_field = field_name.replace(' ', '+')
         headers = {
             'User-Agent': self.ua.random,
@@ -53,99 +55,147 @@ class ACMAuthorSearcher:
             'Accept-Encoding': 'gzip, deflate, br',
             'Connection': 'keep-alive',
         }
-        base_url = "https://dl.acm.org/action/doSearch"
+        search_url = f"{self.base_url}/action/doSearch"
         params = {
             "AllField": formatted_field,
             "content": "standard",
             "target": "default",
             "startPage": page_number,
         }
+        timeout = aiohttp.ClientTimeout(
+            total=60,
+            connect=10,
+            sock_connect=10,
+            sock_read=50
+        )
 
-        async with self.semaphore:
-            for attempt in range(3):
-                try:
-                    query_string = '&'.join(f"{key}={value}" for key, value in params.items())
-                    full_url = f"{base_url}?{query_string}"
-
-                    timeout = aiohttp.ClientTimeout(
-                        total=60,
-                        connect=10,
-                        sock_connect=10,
-                        sock_read=50
-                    )
-
-                    async with session.get(base_url, headers=headers, params=params, timeout=timeout) as response:
+        for attempt in range(3):
+            try:
+                # the per-host slot caps requests in flight, the rate limiter spaces them out
+                async with self.runtime.host_slot(search_url):
+                    await http_client.rate_limiter.wait_async(search_url)
+                    async with session.get(search_url, headers=headers, params=params, timeout=timeout) as response:
                         if response.status == 200:
                             return await response.text()
                         print(f"[WARNING] Failed to fetch page {page_number} for field '{field_name}'. Status: {response.status}")
-                except asyncio.TimeoutError as e:
-                    print(f"[ERROR] TimeoutError while fetching page {page_number} for field '{field_name}': {e}")
-                except aiohttp.ClientError as e:
-                    print(f"[ERROR] ClientError while fetching page {page_number} for field '{field_name}': {e}")
-                except Exception as e:
-                    print(f"[ERROR] Unexpected exception occurred: {e}")
-                sleep_time = 2 ** attempt
-                await asyncio.sleep(sleep_time)
+            except asyncio.TimeoutError as e:
+                print(f"[ERROR] TimeoutError while fetching page {page_number} for field '{field_name}': {e}")
+            except aiohttp.ClientError as e:
+                print(f"[ERROR] ClientError while fetching page {page_number} for field '{field_name}': {e}")
+            except Exception as e:
+                print(f"[ERROR] Unexpected exception occurred: {e}")
+            sleep_time = 2 ** attempt
+            await asyncio.sleep(sleep_time)
         print(f"[ERROR] Failed to fetch page {page_number} for field '{field_name}' after {attempt + 1} attempts.")
         return None
 
-    async def search_acm_field_async(self, field_name, pages_to_fetch=1):
+    @staticmethod
+    def parse_authors(content):
+        authors = []
+        soup = BeautifulSoup(content, 'html.parser')
+        profile_url_pattern = re.compile(r"^https://dl.acm.org/profile/\d+$")
+        items = soup.find_all('li', class_='search__item')
+
+        for item in items:
+            author_elements = item.find_all('a', title=True)
+            for author in author_elements:
+                author_name = author['title'].strip()
+                author_link = f"https://dl.acm.org{author['href']}"
+                if profile_url_pattern.match(author_link):
+                    authors.append({
+                        "Name": author_name,
+                        "Profile Link": author_link
+                    })
+        return authors
+
+    async def scrape_field(self, field_name, pages_to_fetch=1):
+        '''Fetch and parse the ACM search pages of a field, without caching or deduplication.'''
+        session = await self.runtime.get_session()
+        tasks = [
+            self.fetch_page(session, field_name, page_number)
+            for page_number in range(1, pages_to_fetch + 1)
+        ]
+        pages_content = await asyncio.gather(*tasks)
+
         authors = []
+        for content in pages_content:
+            if content:
+                # parse off the event loop, which is shared by every request
+                authors.extend(await asyncio.to_thread(self.parse_authors, content))
+        return authors
+
+    def _field_cache_key(self, field_name, pages_to_fetch):
+        return field_name if pages_to_fetch == 1 else f"{field_name} (pages: {pages_to_fetch})"
+
+    async def _refresh_field(self, field_name, pages_to_fetch=1):
+        key = self._field_cache_key(field_name, pages_to_fetch)
+        authors = None
         try:
-            async with aiohttp.ClientSession() as session:
-                tasks = []
-                start_time = time.time()
-                for page_number in range(1, pages_to_fetch + 1):
-                    task = asyncio.create_task(
-                        self.fetch_page(session, field_name, page_number, start_time)
-                    )
-                    tasks.append(task)
-                pages_content = await asyncio.gather(*tasks)
-                for content in pages_content:
-                    if not content:
-                        continue
-                    # Parse content and extract authors
-                    soup = BeautifulSoup(content, 'html.parser')
-                    profile_url_pattern = re.compile(r"^https://dl.acm.org/profile/\d+$")
-                    items = soup.find_all('li', class_='search__item')
-
-                    for item in items:
-                        author_elements = item.find_all('a', title=True)
-                        for author in author_elements:
-                            author_name = author['title'].strip()
-                            author_link = f"https://dl.acm.org{author['href']}"
-                            if profile_url_pattern.match(author_link) and author_name not in self.seen_authors:
-                                self.seen_authors.add(author_name)
-                                authors.append({
-                                    "Name": author_name,
-                                    "Profile Link": author_link
-                                })
+            authors = await self.scrape_field(field_name, pages_to_fetch)
+            if authors:
+                # the cache writes through to SQLite, so keep it off the shared event loop
+                await asyncio.to_thread(self.field_cache.set, key, authors)
             return authors
+        finally:
+            self.field_cache.end_refresh(key, authors)
+
+    def _refresh_field_in_background(self, field_name, pages_to_fetch=1):
+        future = self.runtime.submit(self._refresh_field(field_name, pages_to_fetch))
+
+        def report(future):
+            if future.exception() is not None:
+                print(f"[ERROR] Background refresh failed for field '{field_name}': {future.exception()}")
+
+        future.add_done_callback(report)
+
+    def _unseen(self, authors):
+        unseen = []
+        for author in authors:
+            if author["Name"] not in self.seen_authors:
+                self.seen_authors.add(author["Name"])
+                unseen.append(author)
+        return unseen
+
+    async def search_acm_field_async(self, field_name, pages_to_fetch=1, refresh=False):
+        try:
+            key = self._field_cache_key(field_name, pages_to_fetch)
+            # a miss in memory reads SQLite, so look up off the shared event loop
+            cached_authors, fresh = (None, False) if refresh else await asyncio.to_thread(self.field_cache.get, key)
+            if cached_authors is not None:
+                if not fresh and self.field_cache.begin_refresh(key):
+                    self._refresh_field_in_background(field_name, pages_to_fetch)
+                return self._unseen(cached_authors)
+
+            if self.field_cache.begin_refresh(key):
+                authors = await self._refresh_field(field_name, pages_to_fetch)
+            else:
+                # another request is already scraping this field, so wait for its result
+                pending = self.field_cache.refresh_future(key)
+                authors = await asyncio.wrap_future(pending) if pending is not None else None
+                if authors is None:
+                    authors, _ = await asyncio.to_thread(self.field_cache.get, key)
+            return self._unseen(authors or [])
         except Exception as e:
             print(f"[ERROR] Exception in search_acm_field_async for field '{field_name}': {e}")
             traceback.print_exc()
             return []
 
     async def retry_search_acm_field(self, field_name, max_retries=3, required_minimum=0):
-        if field_name in self.field_cache:
-            cached_authors = self.field_cache[field_name]
-            if len(cached_authors) >= required_minimum:
-                return cached_authors
-
+        best = []
         for attempt in range(max_retries):
             try:
-                authors = await self.search_acm_field_async(field_name, pages_to_fetch=1)
-                if authors:
-                    self.field_cache[field_name] = authors
-                    if len(authors) >= required_minimum:
-                        return authors
+                # the first attempt may be served from the shared field cache
+                authors = await self.search_acm_field_async(field_name, pages_to_fetch=1, refresh=attempt > 0)
+                if len(authors) > len(best):
+                    best = authors
+                if authors and len(authors) >= required_minimum:
+                    return authors
             except Exception as e:
                 print(f"[ERROR] Attempt {attempt + 1}/{max_retries} failed for field '{field_name}': {e}")
                 traceback.print_exc()
                 await asyncio.sleep(self.crawl_delay * (2 ** attempt))  # Exponential backoff
 
-        self.field_cache[field_name] = self.field_cache.get(field_name, [])
-        return self.field_cache[field_name]
+        return best
 
 class DynamicOntologyManager:
     def __init__(self):
@@ -174,81 +224,72 @@ class DynamicOntologyManager:
 
 import threading
 
-class RecommendationsCache:
-    def __init__(self):
-        self.cache = {}
-        self.lock = threading.Lock()
-
-    def get(self, key):
-        with self.lock:
-            cached_data = self.cache.get(key)
-            if cached_data:
-                recommendations, weights, timestamp = cached_data
-                if (datetime.datetime.now() - timestamp).seconds < 3600:
-                    print("[DEBUG] Cache hit.")
-                    self.debug_cache()
-                    return recommendations, weights
-            print("[DEBUG] Cache miss or expired.")
-            self.debug_cache()
-            return None, None
-
-    def set(self, key, recommendations, weights):
-        weights = [(field, safe_int(weight)) for field, weight in weights]
-        with self.lock:
-            self.cache[key] = (recommendations, weights, datetime.datetime.now())
-            self.debug_cache()
-
-
-
-    def debug_cache(self):
-        for key, (recommendations, weights, timestamp) in self.cache.items():
-            print(f"  Key: {key}")
-            print(f"  Recommendations: {recommendations}, type: {type(recommendations)}")
-            print(f"  Weights: {weights}, type: {type(weights)}")
-            print(f"  Timestamp: {timestamp}, type: {type(timestamp)}\n")
+# number of nearest authors by embedding that are re-ranked for a recommendation request
+EMBEDDING_CANDIDATES = 200
+
+
+def node_tag(node):
+    return "author" if node.startswith("Author: ") else "field"
+
+
+def train_node2vec(graph, dimensions=32):
+    '''Train Node2Vec on graph and return a dict of node -> embedding vector.'''
+    num_cpus = max(1, os.cpu_count() // 2)
+    node2vec = Node2Vec(
+        graph,
+        dimensions=dimensions,
+        walk_length=15,
+        num_walks=100,
+        workers=num_cpus
+    )
+    model = node2vec.fit()
+    return {node: model.wv[node] for node in graph.nodes if node in model.wv}
 
 
 class ACMRecommender:
-    def __init__(self, acm_searcher, cache):
+    def __init__(self, acm_searcher, cache, graph=None, graph_lock=None, embeddings=None):
         self.acm_searcher = acm_searcher
-        self.graph = nx.Graph()
+        self.graph = graph if graph is not None else nx.Graph()
+        self.graph_lock = graph_lock if graph_lock is not None else threading.Lock()
+        self.embeddings = embeddings if embeddings is not None else EmbeddingStore(
+            self.graph, self.graph_lock, train_node2vec, tag_for=node_tag
+        )
         self.cache = cache
         self.ontology_manager = DynamicOntologyManager()
 
     def build_network(self, authors, acm_results):
-        for author in authors:
-            author_node = f"Author: {author['Name']}"
-            self.graph.add_node(author_node, type="author", profile_link=author.get("Profile Link", ""))
-
-            for field in author.get("Fields of Study", []):
-                field_node = f"Field: {field}"
-                self.graph.add_node(field_node, type="field")
-                self.graph.add_edge(author_node, field_node, weight=1.0, reason="Author studies this field")
-
-        for field, field_authors in acm_results.items():
-            self.ontology_manager.update_ontology(field, field_authors)
-            for acm_author in field_authors:
-                acm_author_node = f"Author: {acm_author['Name']}"
-                self.graph.add_node(acm_author_node, type="author", profile_link=acm_author.get("Profile Link", ""))
-                field_node = f"Field: {field}"
-                if self.graph.has_node(field_node):
-                    self.graph.add_edge(
-                        acm_author_node, field_node,
-                        weight=0.5,
-                        reason="Author linked to this field from ACM results"
-                    )
+        nodes = set()
+        with self.graph_lock:
+            for author in authors:
+                author_node = f"Author: {author['Name']}"
+                self.graph.add_node(author_node, type="author", profile_link=author.get("Profile Link", ""))
+                nodes.add(author_node)
+
+                for field in author.get("Fields of Study", []):
+                    field_node = f"Field: {field}"
+                    self.graph.add_node(field_node, type="field")
+                    self.graph.add_edge(author_node, field_node, weight=1.0, reason="Author studies this field")
+                    nodes.add(field_node)
+
+            for field, field_authors in acm_results.items():
+                self.ontology_manager.update_ontology(field, field_authors)
+                for acm_author in field_authors:
+                    acm_author_node = f"Author: {acm_author['Name']}"
+                    self.graph.add_node(acm_author_node, type="author", profile_link=acm_author.get("Profile Link", ""))
+                    nodes.add(acm_author_node)
+                    field_node = f"Field: {field}"
+                    if self.graph.has_node(field_node):
+                        self.graph.add_edge(
+                            acm_author_node, field_node,
+                            weight=0.5,
+                            reason="Author linked to this field from ACM results"
+                        )
+
+        # embed the new nodes from their neighbours; a full retrain runs in the background when due
+        self.embeddings.add_nodes(nodes)
 
     def compute_graph_embeddings(self):
-        num_cpus = os.cpu_count() // 2
-        node2vec = Node2Vec(
-            self.graph,
-            dimensions=32,
-            walk_length=15,
-            num_walks=100,
-            workers=num_cpus
-        )
-        self.model = node2vec.fit()
-
+        self.embeddings.retrain()
 
     def recommend_authors(self, target_authors, max_recommendations=5):
         if isinstance(max_recommendations, str) and max_recommendations.isdigit():
@@ -283,44 +324,53 @@ class ACMRecommender:
         return recommendations[:max_recommendations]
 
     def recommend_authors_by_embeddings(self, target_authors, max_recommendations=5):
-        self.compute_graph_embeddings()
-
         target_author_names = {f"Author: {author['Name']}" for author in target_authors}
-        target_embeddings = np.array([
-            self.model.wv[f"Author: {author['Name']}"]
-            for author in target_authors
-            if f"Author: {author['Name']}" in self.model.wv
-        ])
-
-        all_authors = [
-            (
-                node,
-                self.graph.nodes[node].get("profile_link", ""),
-                [
-                    field.replace("Field: ", "")
-                    for field in self.graph.neighbors(node)
-                    if field.startswith("Field: ")
-                ]
-            )
-            for node, attrs in self.graph.nodes(data=True) if attrs["type"] == "author"
-        ]
-        all_embeddings = np.array([self.model.wv[node] for node, _, _ in all_authors])
+        target_fields = set(
+            field for author in target_authors for field in author.get("Fields of Study", [])
+        )
 
-        if target_embeddings.size == 0 or all_embeddings.size == 0:
+        # authors sharing a target field rank above all others, so every one of them is scored
+        with self.graph_lock:
+            overlapping = {
+                author
+                for field in target_fields if f"Field: {field}" in self.graph
+                for author in self.graph.neighbors(f"Field: {field}")
+                if author.startswith("Author: ") and author not in target_author_names
+            }
+        similarities = {}
+        if overlapping:
+            similarities.update(self.embeddings.most_similar(
+                target_author_names, k=len(overlapping), tag="author",
+                exclude=target_author_names, among=overlapping
+            ))
+        # the remaining slots are filled from the nearest authors without a shared field
+        candidate_count = max(EMBEDDING_CANDIDATES, max_recommendations * 10)
+        for node, similarity in self.embeddings.most_similar(
+            target_author_names, k=candidate_count, tag="author", exclude=target_author_names
+        ):
+            similarities.setdefault(node, similarity)
+
+        if not similarities:
             print("[ERROR] No embeddings found for target authors or all authors.")
             return []
 
-        similarities = target_embeddings @ all_embeddings.T
-        mean_similarities = similarities.mean(axis=0)
+        with self.graph_lock:
+            candidates = [
+                (
+                    node,
+                    self.graph.nodes[node].get("profile_link", ""),
+                    [
+                        field.replace("Field: ", "")
+                        for field in self.graph.neighbors(node)
+                        if field.startswith("Field: ")
+                    ],
+                    similarity
+                )
+                for node, similarity in similarities.items() if node in self.graph
+            ]
 
         recommendations = []
-        target_fields = set(
-            field for author in target_authors for field in author.get("Fields of Study", [])
-        )
-        for (author_node, profile_link, fields), similarity in zip(all_authors, mean_similarities):
-            if author_node in target_author_names:
-                continue
-
+        for author_node, profile_link, fields, similarity in candidates:
             overlap_score = sum(1 for field in fields if field in target_fields)
             recommendations.append({
                 "Author": author_node.replace("Author: ", ""),
@@ -425,13 +475,27 @@ class ACMRecommender:
 
         return sorted(combined_fields, key=lambda x: -x[1])[:5]
 
-recommendations_cache = RecommendationsCache()
+# shared with the other worker processes through config.RECOMMENDATIONS_CACHE_PATH
+recommendations_cache = RecommendationsCache(max_entries=1024, ttl=3600, db_path=config.RECOMMENDATIONS_CACHE_PATH)
+
+# the author-field graph and its embeddings are kept for the lifetime of the process and
+# grow with every request up to MAX_GRAPH_NODES; both are persisted to config.EMBEDDINGS_PATH
+MAX_GRAPH_NODES = 50_000
+author_field_graph = nx.Graph()
+author_field_graph_lock = threading.Lock()
+author_embeddings = EmbeddingStore(
+    author_field_graph, author_field_graph_lock, train_node2vec,
+    tag_for=node_tag, path=config.EMBEDDINGS_PATH, max_nodes=MAX_GRAPH_NODES
+)
 
 async def get_acm_recommendations_and_field_authors(authors, max_recommendations=5, max_results_per_field=5):
     try:
         print("Getting Recommendations...")
         acm_searcher = ACMAuthorSearcher()
-        recommender = ACMRecommender(acm_searcher, recommendations_cache)
+        recommender = ACMRecommender(
+            acm_searcher, recommendations_cache,
+            graph=author_field_graph, graph_lock=author_field_graph_lock, embeddings=author_embeddings
+        )
 
         max_recommendations = (
             int(max_recommendations) if isinstance(max_recommendations, str) and max_recommendations.isdigit()
@@ -456,7 +520,8 @@ async def get_acm_recommendations_and_field_authors(authors, max_recommendations
 
         random.seed(seed)
 
-        cached_recommendations, cached_weights = recommender.cache.get(authors_key)
+        # a memory miss reads the SQLite backing store, so look up off the shared event loop
+        cached_recommendations, cached_weights = await asyncio.to_thread(recommender.cache.get, authors_key)
         if cached_recommendations:
             print("[DEBUG] Returning cached recommendations.")
             return cached_recommendations
@@ -505,9 +570,13 @@ async def get_acm_recommendations_and_field_authors(authors, max_recommendations
         all_results = await asyncio.gather(*tasks)
         acm_results = {field: result for field, result in zip(fields_to_fetch, all_results)}
 
-        recommender.build_network(authors, acm_results)
+        # graph updates, embedding lookups and ranking block or use the CPU, so they run in a
+        # worker thread instead of stalling every other request on the shared event loop
+        await asyncio.to_thread(recommender.build_network, authors, acm_results)
 
-        recommendations, explanations = recommender.recommend_authors_with_explanations(authors, max_recommendations)
+        recommendations, explanations = await asyncio.to_thread(
+            recommender.recommend_authors_with_explanations, authors, max_recommendations
+        )
 
         diverse_picks = [
             {
@@ -546,7 +615,7 @@ async def get_acm_recommendations_and_field_authors(authors, max_recommendations
         }
 
         authors_key = tuple(sorted(author['Name'] for author in authors))
-        recommender.cache.set(authors_key, final_recommendations, current_weights)
+        await asyncio.to_thread(recommender.cache.set, authors_key, final_recommendations, current_weights)
         return final_recommendations
 
     except Exception as e:
@@ -6,22 +6,33 @@ from bs4 import BeautifulSoup
 import math
 import json
 
+from backend.app import http_client
 from backend.app.progress_manager import ProgressManager
 from backend.db.db_helper import *
 from backend.app.acm_author_searcher import ACMAuthorSearcher
+from backend.app.search_cache import SearchPageCache
+from backend.app.semantic_scholar import SemanticScholarClient, DEFAULT_METADATA
 from backend.llm import llmNew
-import time
+
+# Settings for the concurrent DOI metadata fetch stage
+DOI_FETCH_CONCURRENCY = 8
+DOI_FETCH_TIMEOUT = 10
+
+metadata_client = SemanticScholarClient(max_workers=DOI_FETCH_CONCURRENCY, timeout=DOI_FETCH_TIMEOUT)
+
+# parsed ACM search pages, shared by every search request
+search_page_cache = SearchPageCache()
 
 def delayed_request(url, headers=None, params=None, timeout=30):
-    time.sleep(1)
-    response = requests.get(url, headers=headers, params=params, timeout=timeout)
+    # politeness towards ACM is enforced by the shared per-host rate limiter
+    response = http_client.get(url, headers=headers, params=params, timeout=timeout)
     return response
 
 def identify_input_type_and_search(input_value, page_number, search_type, max_pages=None):
     if page_number < 0:
         page_number = 0
 
-    searcher = ACMAuthorSearcher()
+    searcher = ACMAuthorSearcher(page_cache=search_page_cache)
 
     if max_pages is None:
         max_pages = get_estimated_max_pages(input_value)
@@ -147,7 +158,7 @@ def scrape_author_publications(profile_link, author_name):
     publication_items = soup.find_all('li', class_='search__item')
 
     unique_publications = set()
-    publications = []
+    scraped_items = []
 
     for item in publication_items:
         title_link = item.find('a', href=True)
@@ -178,8 +189,15 @@ def scrape_author_publications(profile_link, author_name):
             except Exception as e:
                 print(f"Error processing co-author '{co_author.get('title', 'Unknown')}': {e}")
 
+        scraped_items.append((title, doi, co_authors))
+
+    # resolve the metadata for every DOI on the page in parallel
+    metadata = get_metadata_for_dois([doi for _, doi, _ in scraped_items])
+
+    publications = []
+    for title, doi, co_authors in scraped_items:
         if doi:
-            abstract, publication_date, citation_count = get_metadata_from_doi(doi)
+            abstract, publication_date, citation_count = metadata[doi]
         else:
             abstract, publication_date, citation_count = 'N/A', 'Unknown', 0
 
@@ -195,26 +213,21 @@ def scrape_author_publications(profile_link, author_name):
     return publications
 
 
+def get_metadata_for_dois(dois, max_workers=None, timeout=None):
+    '''Fetch the metadata of several DOIs through the batched, cached Semantic Scholar client.
 
-def get_metadata_from_doi(doi):
-    semantic_scholar_url = f"https://api.semanticscholar.org/graph/v1/paper/{doi}?fields=title,abstract,publicationDate,citationCount"
+    Returns a dict mapping each DOI to its (abstract, publication date, citation count)
+    tuple, using the fallback values for DOIs that could not be resolved.'''
+    if max_workers is None:
+        max_workers = DOI_FETCH_CONCURRENCY
+    if timeout is None:
+        timeout = DOI_FETCH_TIMEOUT
 
-    try:
-        response = requests.get(semantic_scholar_url, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            abstract = data.get('abstract', 'No abstract available.')
-            publication_date = data.get('publicationDate', 'Unknown publication date')
-            citation_count = data.get('citationCount', 0)
+    return metadata_client.get_metadata(dois, max_workers=max_workers, timeout=timeout)
 
-            return abstract, publication_date, citation_count
 
-        else:
-            print(f"Failed to retrieve data for DOI: {doi}")
-    except Exception as e:
-        print(f"Error retrieving metadata from DOI: {e}")
-
-    return "No abstract available.", "Unknown", 0
+def get_metadata_from_doi(doi, timeout=None):
+    return get_metadata_for_dois([doi], timeout=timeout).get(doi, DEFAULT_METADATA)
 
 
 def scrape_latest_publication(profile_link):
@@ -227,7 +240,7 @@ def scrape_latest_publication(profile_link):
         "Connection": "keep-alive",
     }
 
-    response = requests.get(publications_url, headers=headers)
+    response = http_client.get(publications_url, headers=headers)
     if response.status_code != 200:
         print(f"Failed to retrieve publications for {profile_link}")
         return None
@@ -292,6 +305,21 @@ def clear_progress(profile_link):
     profile_id = extract_profile_id(profile_link)
     progress_manager.clear_progress(profile_id)
 
+def stop_progress(profile_link, status):
+    '''Report a final status for the profile and end its progress.'''
+    update_progress(profile_link, status)
+    clear_progress(profile_link)
+
+def request_summary(author_name):
+    '''Generate the researcher's summary. A timed out generation fails the job;
+    other errors keep the stored summary.'''
+    try:
+        llmNew.request(author_name)
+    except llmNew.SummaryTimeoutError:
+        raise
+    except Exception as e:
+        traceback.print_exc()
+
 def update_author_if_needed(author_name, profile_link):
     try:
         update_progress(profile_link, "Checking database for existing author...")
@@ -306,7 +334,7 @@ def update_author_if_needed(author_name, profile_link):
         update_progress(profile_link, "Scraping latest publications...")
         latest_scraped_publication = scrape_latest_publication(profile_link)
         if not latest_scraped_publication:
-            update_progress(profile_link, "No latest publication found.")
+            stop_progress(profile_link, "No latest publication found. Process stopped.")
             return None, None
 
         update_progress(profile_link, "Fetching author details from database...")
@@ -316,7 +344,7 @@ def update_author_if_needed(author_name, profile_link):
             update_progress(profile_link, "No details in database. Scraping full author details...")
             scraped_author_details_json = scrape_author_details(author_name, profile_link)
             if not scraped_author_details_json:
-                update_progress(profile_link, "Scraping failed. Process stopped.")
+                stop_progress(profile_link, "Scraping failed. Process stopped.")
                 return None, None
 
             scraped_author_details = json.loads(scraped_author_details_json)
@@ -326,14 +354,11 @@ def update_author_if_needed(author_name, profile_link):
             author_details_db = get_author_details_from_db(author_name)
             if not author_details_db:
                 print(f"Failed to retrieve updated details from database for new author: {author_name}")
-                update_progress(profile_link, "Failed to update database. Process stopped.")
+                stop_progress(profile_link, "Failed to update database. Process stopped.")
                 return None, None
 
-            try:
-                update_progress(profile_link, "Generating new summary using LLM...")
-                llmNew.request(author_name)
-            except Exception as e:
-                update_progress(profile_link, "Generating new summary using LLM...")
+            update_progress(profile_link, "Generating new summary using LLM...")
+            request_summary(author_name)
             summary = get_researcher_summary(author_name)
             update_progress(profile_link, "Process complete. Author details updated successfully.")
             clear_progress(profile_link)
@@ -360,11 +385,8 @@ def update_author_if_needed(author_name, profile_link):
                     clear_progress(profile_link)
                     return summary, author_details_db
                 else:
-                    try:
-                        update_progress(profile_link, "Generating new summary using LLM...")
-                        llmNew.request(author_name)
-                    except Exception as e:
-                        update_progress(profile_link, "Generating new summary using LLM...")
+                    update_progress(profile_link, "Generating new summary using LLM...")
+                    request_summary(author_name)
                     summary = get_researcher_summary(author_name)
                     update_progress(profile_link, "Process complete. Summary updated successfully.")
                     clear_progress(profile_link)
@@ -373,29 +395,34 @@ def update_author_if_needed(author_name, profile_link):
         update_progress(profile_link, "Scraping full author details due to new publication...")
         scraped_author_details_json = scrape_author_details(author_name, profile_link)
         if not scraped_author_details_json:
-            update_progress(profile_link, "Failed to scrape author details. Process stopped.")
+            stop_progress(profile_link, "Failed to scrape author details. Process stopped.")
             return None, None
 
         scraped_author_details = json.loads(scraped_author_details_json)
         update_progress(profile_link, "Updating author details in database...")
-        update_author_details_in_db(scraped_author_details)
+        if update_author_details_in_db(scraped_author_details) is None:
+            stop_progress(profile_link, "Failed to update database. Process stopped.")
+            return None, None
 
         author_details_db_after_update = get_author_details_from_db(author_name)
-        try:
-            update_progress(profile_link, "Generating summary using LLM for updated author details...")
-            llmNew.request(author_name)
-        except Exception as e:
-            update_progress(profile_link, "Generating summary using LLM for updated author details...")
+        update_progress(profile_link, "Generating summary using LLM for updated author details...")
+        request_summary(author_name)
         summary = get_researcher_summary(author_name)
         update_progress(profile_link, "Process complete. Author details and summary updated successfully.")
         clear_progress(profile_link)
         return summary, author_details_db_after_update
 
+    except llmNew.SummaryTimeoutError:
+        # re-raised so the job queue records the job as failed
+        stop_progress(profile_link, "Summary generation timed out. Process stopped.")
+        raise
     except KeyError as e:
         traceback.print_exc()
+        stop_progress(profile_link, "Missing author details. Process stopped.")
         return None, None
     except Exception as e:
         traceback.print_exc()
+        stop_progress(profile_link, "An error occurred. Process stopped.")
         return None, None
 
 
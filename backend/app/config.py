@@ -0,0 +1,25 @@
+import os
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Directory of the backend's local caches, independent of the working directory
+CACHE_DIR = os.getenv('BACKEND_CACHE_DIR', os.path.normpath(os.path.join(base_dir, '..', 'cache')))
+
+
+def cache_path(env_var, filename):
+    '''Path of a local cache file: env_var if it is set, else filename inside CACHE_DIR'''
+    return os.getenv(env_var, os.path.join(CACHE_DIR, filename))
+
+
+def ensure_parent_dir(path):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+
+DOI_CACHE_PATH = cache_path('DOI_CACHE_PATH', 'doi_cache.db')
+SEARCH_CACHE_PATH = cache_path('SEARCH_CACHE_PATH', 'search_cache.db')
+FIELD_CACHE_PATH = cache_path('FIELD_CACHE_PATH', 'field_cache.db')
+RECOMMENDATIONS_CACHE_PATH = cache_path('RECOMMENDATIONS_CACHE_PATH', 'recommendations_cache.db')
+EMBEDDINGS_PATH = cache_path('EMBEDDINGS_PATH', 'author_embeddings.npz')
+# scraping progress and the author job queue, shared by every worker process
+PROGRESS_DB_PATH = cache_path('PROGRESS_DB_PATH', 'progress.db')
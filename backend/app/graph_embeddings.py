@@ -0,0 +1,436 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+
+class EmbeddingIndex:
+    '''Row-normalized float32 embedding matrix with an id map and top-k cosine search.
+
+    Each row can carry a tag (e.g. "author") so searches can be limited to one kind
+    of node without copying the matrix. build_clusters() adds an optional inverted
+    file index: search(approximate=True) then only scores the rows of the n_probe
+    clusters closest to the query, plus any rows added since the clusters were built.'''
+
+    def __init__(self, dimensions, capacity=1024):
+        self.dimensions = dimensions
+        self.ids = []
+        self.positions = {}
+        self.tag_codes = {}
+        self._matrix = np.zeros((capacity, dimensions), dtype=np.float32)
+        self._tags = np.full(capacity, -1, dtype=np.int16)
+        self.centroids = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, id):
+        return id in self.positions
+
+    @property
+    def matrix(self):
+        return self._matrix[:len(self.ids)]
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def _tag_code(self, tag):
+        if tag is None:
+            return -1
+        return self.tag_codes.setdefault(tag, len(self.tag_codes))
+
+    def _grow(self, size):
+        capacity = len(self._matrix)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        matrix = np.zeros((capacity, self.dimensions), dtype=np.float32)
+        matrix[:len(self.ids)] = self.matrix
+        tags = np.full(capacity, -1, dtype=np.int16)
+        tags[:len(self.ids)] = self._tags[:len(self.ids)]
+        self._matrix, self._tags = matrix, tags
+
+    def add_many(self, ids, vectors, tags=None):
+        '''Insert or replace the vectors of ids.'''
+        ids = list(ids)
+        if not ids:
+            return
+        vectors = self._normalize(vectors).reshape(len(ids), self.dimensions)
+        tags = tags if tags is not None else [None] * len(ids)
+
+        new_ids = [id for id in dict.fromkeys(ids) if id not in self.positions]
+        self._grow(len(self.ids) + len(new_ids))
+        for id in new_ids:
+            self.positions[id] = len(self.ids)
+            self.ids.append(id)
+
+        rows = np.array([self.positions[id] for id in ids])
+        self._matrix[rows] = vectors
+        self._tags[rows] = [self._tag_code(tag) for tag in tags]
+
+    def add(self, id, vector, tag=None):
+        self.add_many([id], [vector], [tag])
+
+    def get(self, id):
+        position = self.positions.get(id)
+        return None if position is None else self._matrix[position]
+
+    def remove_many(self, ids):
+        '''Remove the vectors of ids, compacting the matrix; approximate search needs new clusters.'''
+        removed = [self.positions[id] for id in ids if id in self.positions]
+        if not removed:
+            return
+        keep = np.ones(len(self.ids), dtype=bool)
+        keep[removed] = False
+        kept = np.flatnonzero(keep)
+        self._matrix[:len(kept)] = self._matrix[kept]
+        self._tags[:len(kept)] = self._tags[kept]
+        self._matrix[len(kept):len(self.ids)] = 0
+        self._tags[len(kept):len(self.ids)] = -1
+        self.ids = [self.ids[position] for position in kept]
+        self.positions = {id: position for position, id in enumerate(self.ids)}
+        self.centroids = None
+
+    def copy(self):
+        index = EmbeddingIndex(self.dimensions, capacity=max(1, len(self.ids)))
+        index.ids = list(self.ids)
+        index.positions = dict(self.positions)
+        index.tag_codes = dict(self.tag_codes)
+        index._matrix[:len(self.ids)] = self.matrix
+        index._tags[:len(self.ids)] = self._tags[:len(self.ids)]
+        return index
+
+    def build_clusters(self, n_clusters=None, iterations=10, sample_size=50_000, seed=0):
+        '''Cluster the rows with spherical k-means for approximate search.
+
+        Centroids are trained on a sample of at most sample_size rows. Rows added
+        later are always scanned until the clusters are rebuilt.'''
+        count = len(self.ids)
+        if count == 0:
+            return
+        if n_clusters is None:
+            n_clusters = max(1, int(np.sqrt(count)))
+        n_clusters = min(n_clusters, count)
+
+        rng = np.random.default_rng(seed)
+        matrix = self.matrix
+        sample = matrix[rng.choice(count, min(count, max(sample_size, n_clusters)), replace=False)]
+        centroids = sample[rng.choice(len(sample), n_clusters, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            # empty clusters keep their previous centroid
+            empty = ~sums.any(axis=1)
+            sums[empty] = centroids[empty]
+            centroids = self._normalize(sums)
+
+        clusters = np.argmax(matrix @ centroids.T, axis=1)
+        self.centroids = centroids
+        # rows ordered by cluster, so a cluster's rows are one slice of _cluster_order
+        self._cluster_order = np.argsort(clusters, kind='stable')
+        self._cluster_offsets = np.searchsorted(clusters[self._cluster_order], np.arange(n_clusters + 1))
+        self._clustered_count = count
+
+    def search(self, query, k=10, tag=None, exclude=(), approximate=False, n_probe=8, among=None):
+        '''Return up to k (id, cosine similarity) pairs, most similar first.
+
+        If among is given, only those ids are scored.'''
+        count = len(self.ids)
+        if count == 0 or k <= 0:
+            return []
+        query = self._normalize(query).reshape(self.dimensions)
+
+        rows = None
+        if among is not None:
+            rows = np.array([self.positions[id] for id in among if id in self.positions], dtype=np.intp)
+            if len(rows) == 0:
+                return []
+        elif approximate and self.centroids is not None:
+            n_probe = min(n_probe, len(self.centroids))
+            probes = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+            rows = np.concatenate(
+                [self._cluster_order[self._cluster_offsets[p]:self._cluster_offsets[p + 1]] for p in probes]
+                + [np.arange(self._clustered_count, count)]
+            )
+
+        candidates = self.matrix if rows is None else self._matrix[rows]
+        scores = candidates @ query
+        valid = np.ones(len(scores), dtype=bool)
+        if tag is not None:
+            tags = self._tags[:count] if rows is None else self._tags[rows]
+            valid &= tags == self.tag_codes.get(tag, -2)
+        excluded = [self.positions[id] for id in exclude if id in self.positions]
+        if excluded:
+            if rows is None:
+                valid[excluded] = False
+            else:
+                valid &= ~np.isin(rows, excluded)
+        scores = np.where(valid, scores, -np.inf)
+
+        k = min(k, int(valid.sum()))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        positions = top if rows is None else rows[top]
+        return [(self.ids[position], float(score)) for position, score in zip(positions, scores[top])]
+
+    def save(self, path, **extra):
+        '''Write the index to path (an .npz file), together with any extra arrays.'''
+        tag_names = sorted(self.tag_codes, key=self.tag_codes.get)
+        np.savez(
+            path,
+            matrix=self.matrix,
+            ids=np.array(self.ids, dtype=str),
+            tags=self._tags[:len(self.ids)],
+            tag_names=np.array(tag_names, dtype=str),
+            **extra
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            matrix = data['matrix']
+            index = cls(matrix.shape[1], capacity=max(1, len(matrix)))
+            index.tag_codes = {str(name): code for code, name in enumerate(data['tag_names'])}
+            index.ids = [str(id) for id in data['ids']]
+            index.positions = {id: position for position, id in enumerate(index.ids)}
+            index._matrix[:len(matrix)] = matrix
+            index._tags[:len(matrix)] = data['tags']
+        return index
+
+
+class EmbeddingStore:
+    '''Node embeddings for a long-lived graph that grows across requests.
+
+    Nodes added after the last training run get an incremental embedding: the mean
+    of their already embedded neighbours, or a deterministic random vector when
+    none of them is embedded yet. Once enough nodes have been added, the full model is retrained
+    in a background thread and swapped in, so requests only ever do lookups.
+
+    train is a callable taking a graph and returning a dict of node -> vector.
+    Vectors are kept in an EmbeddingIndex tagged with tag_for(node). When path is
+    given, the graph and the index are saved there together after every retrain
+    and loaded into the graph on first use. When max_nodes is given, the least
+    recently added nodes are dropped from the graph and the index once it is larger.'''
+
+    def __init__(self, graph, lock, train, dimensions=32, retrain_ratio=0.2,
+                 min_new_nodes=50, min_retrain_interval=300, tag_for=None, path=None, max_nodes=None):
+        self.graph = graph
+        self.lock = lock
+        self.train = train
+        self.dimensions = dimensions
+        self.retrain_ratio = retrain_ratio
+        self.min_new_nodes = min_new_nodes
+        self.min_retrain_interval = min_retrain_interval
+        self.tag_for = tag_for if tag_for is not None else (lambda node: None)
+        self.path = path
+        self.max_nodes = max_nodes
+        self.index = EmbeddingIndex(dimensions)
+        self.trained_count = 0
+        self.new_since_training = 0
+        self.last_trained = 0.0
+        self.retraining = False
+        # insertion ordered, so the first nodes are the least recently added
+        self.last_added = {}
+        self.evictions = 0
+        self._vectors_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._loaded = path is None
+
+    def _load(self):
+        '''Load the persisted graph and its vectors, once, on first use.'''
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not os.path.exists(self.path):
+                return
+            try:
+                with np.load(self.path) as data:
+                    if 'graph' not in data:
+                        print(f"[WARNING] Ignoring graph embeddings without a graph in {self.path}")
+                        return
+                    graph = json.loads(str(data['graph']))
+                index = EmbeddingIndex.load(self.path)
+            except Exception as e:
+                print(f"[ERROR] Failed to load graph embeddings from {self.path}: {e}")
+                return
+
+            nodes = [node for node, _ in graph['nodes']]
+            with self.lock:
+                self.graph.add_nodes_from(graph['nodes'])
+                self.graph.add_edges_from(graph['edges'])
+            # vectors are only useful for nodes of the graph they were trained on
+            index.remove_many(set(index.ids) - set(nodes))
+            with self._vectors_lock:
+                self.index = index
+                self.trained_count = len(index)
+                # loaded nodes count as the least recently added ones
+                last_added = dict.fromkeys((node for node in nodes if node not in self.last_added), 0.0)
+                last_added.update(self.last_added)
+                self.last_added = last_added
+
+    def save(self):
+        '''Write the graph and the current vectors to path, replacing the previous file.'''
+        if self.path is None:
+            return
+        with self.lock:
+            graph = json.dumps({
+                "nodes": list(self.graph.nodes(data=True)),
+                "edges": list(self.graph.edges(data=True)),
+            })
+        with self._vectors_lock:
+            index = self.index.copy()
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # write next to the target and rename, so readers never see a partial file
+        temporary = os.path.join(directory, f".{os.path.basename(self.path)}.{os.getpid()}.npz")
+        index.save(temporary, graph=np.array(graph))
+        os.replace(temporary, self.path)
+
+    def _random_vector(self, node):
+        seed = int(hashlib.sha256(node.encode('utf-8')).hexdigest(), 16) % (2**32)
+        return np.random.default_rng(seed).normal(scale=0.1, size=self.dimensions).astype(np.float32)
+
+    def _embed(self, index, pending, neighbours):
+        '''Add vectors for pending nodes to index from their neighbours already in it.'''
+        # a node may only be connected through other new nodes, so repeat until all are embedded
+        while pending:
+            remaining = []
+            for node in pending:
+                embedded = [index.get(n) for n in neighbours[node] if n in index]
+                if embedded:
+                    index.add(node, np.mean(embedded, axis=0), self.tag_for(node))
+                else:
+                    remaining.append(node)
+            if len(remaining) == len(pending):
+                # no new node touches an embedded one: seed the best connected one
+                seed = max(remaining, key=lambda node: len(neighbours[node]))
+                index.add(seed, self._random_vector(seed), self.tag_for(seed))
+                remaining.remove(seed)
+            pending = remaining
+
+    def add_nodes(self, nodes):
+        '''Embed nodes that have no vector yet, then schedule a retrain if due.'''
+        self._load()
+        with self.lock:
+            neighbours = {
+                node: list(self.graph.neighbors(node))
+                for node in nodes if node in self.graph
+            }
+
+        with self._vectors_lock:
+            now = time.monotonic()
+            for node in neighbours:
+                self.last_added.pop(node, None)
+                self.last_added[node] = now
+            pending = [node for node in neighbours if node not in self.index]
+            self.new_since_training += len(pending)
+            self._embed(self.index, pending, neighbours)
+
+        self._evict()
+        self.schedule_retrain()
+
+    def _evict(self):
+        '''Drop the least recently added tenth of the nodes once the graph exceeds max_nodes.'''
+        if self.max_nodes is None:
+            return
+        with self.lock:
+            if self.graph.number_of_nodes() <= self.max_nodes:
+                return
+            with self._vectors_lock:
+                # nodes that were never passed to add_nodes go first
+                unseen = [node for node in self.graph if node not in self.last_added]
+                count = self.graph.number_of_nodes() - self.max_nodes + max(1, self.max_nodes // 10)
+                evicted = (unseen + list(self.last_added))[:count]
+                for node in evicted:
+                    self.last_added.pop(node, None)
+                self.index.remove_many(evicted)
+                self.evictions += len(evicted)
+            self.graph.remove_nodes_from(evicted)
+
+    def get(self, node):
+        '''Return the normalized vector of node, or None if it has not been embedded.'''
+        self._load()
+        with self._vectors_lock:
+            vector = self.index.get(node)
+            return None if vector is None else vector.copy()
+
+    def most_similar(self, nodes, k=10, tag=None, exclude=(), among=None):
+        '''Return the k nodes with the highest mean cosine similarity to nodes,
+        optionally only considering the nodes in among.'''
+        self._load()
+        with self._vectors_lock:
+            vectors = [self.index.get(node) for node in nodes if node in self.index]
+            if not vectors:
+                return []
+            query = np.mean(vectors, axis=0)
+            results = self.index.search(query, k=k, tag=tag, exclude=exclude, among=among)
+        # search normalizes the query, so scale back to the mean of the individual similarities
+        scale = float(np.linalg.norm(query))
+        return [(node, score * scale) for node, score in results]
+
+    def retrain_due(self):
+        if self.retraining or self.new_since_training == 0:
+            return False
+        if time.monotonic() - self.last_trained < self.min_retrain_interval and self.trained_count:
+            return False
+        return self.new_since_training >= max(self.min_new_nodes, self.retrain_ratio * self.trained_count)
+
+    def schedule_retrain(self):
+        '''Start a background retrain if enough nodes have been added since the last one.'''
+        with self._vectors_lock:
+            if not self.retrain_due():
+                return False
+            self.retraining = True
+        threading.Thread(target=self._retrain, name="embedding-retrain", daemon=True).start()
+        return True
+
+    def retrain(self):
+        '''Retrain on the current graph and block until the new vectors are in use.'''
+        self._load()
+        with self._vectors_lock:
+            self.retraining = True
+        self._retrain()
+
+    def _retrain(self):
+        try:
+            with self._vectors_lock:
+                new_before = self.new_since_training
+            with self.lock:
+                snapshot = self.graph.copy()
+
+            trained = self.train(snapshot)
+            nodes = list(trained)
+            index = EmbeddingIndex(self.dimensions, capacity=max(1024, len(nodes)))
+            index.add_many(nodes, [trained[node] for node in nodes], [self.tag_for(node) for node in nodes])
+
+            with self.lock, self._vectors_lock:
+                # nodes embedded while training ran were placed in the old basis, which is an
+                # arbitrary rotation of the new one, so embed them again from their neighbours;
+                # nodes that were evicted from the graph meanwhile are dropped
+                index.remove_many([node for node in index.ids if node not in self.graph])
+                late = [node for node in self.index.ids if node not in index and node in self.graph]
+                self._embed(index, late, {node: list(self.graph.neighbors(node)) for node in late})
+                self.index = index
+                self.trained_count = len(nodes)
+                self.new_since_training -= new_before
+                self.last_trained = time.monotonic()
+
+            self.save()
+        except Exception as e:
+            print(f"[ERROR] Failed to retrain graph embeddings: {e}")
+        finally:
+            self.retraining = False
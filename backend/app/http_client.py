@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Requests per second and burst size allowed for each host. Hosts that are not
+# listed use DEFAULT_HOST_LIMIT.
+HOST_LIMITS = {
+    "dl.acm.org": (1.0, 1),
+    "api.semanticscholar.org": (5.0, 5),
+}
+DEFAULT_HOST_LIMIT = (5.0, 5)
+
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 20
+DEFAULT_TIMEOUT = 30
+
+
+class TokenBucket:
+    '''Thread-safe token bucket. A request only waits when the bucket is empty,
+    so a call made long after the previous one goes out immediately.'''
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        '''Take a token and return how many seconds the caller has to wait before using it.'''
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # the balance may go negative, which queues callers one interval apart
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class HostRateLimiter:
+    '''Keeps one TokenBucket per host so politeness is enforced process-wide.'''
+
+    def __init__(self, host_limits=None, default_limit=DEFAULT_HOST_LIMIT):
+        self.host_limits = HOST_LIMITS if host_limits is None else host_limits
+        self.default_limit = default_limit
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket_for(self, url):
+        host = urlsplit(url).hostname or ''
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                rate, capacity = self.host_limits.get(host, self.default_limit)
+                bucket = self.buckets[host] = TokenBucket(rate, capacity)
+            return bucket
+
+    def wait(self, url):
+        return self.bucket_for(url).acquire()
+
+    async def wait_async(self, url):
+        return await self.bucket_for(url).acquire_async()
+
+
+rate_limiter = HostRateLimiter()
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    '''Return the process-wide requests session with keep-alive connection pooling.'''
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+
+def request(method, url, timeout=DEFAULT_TIMEOUT, **kwargs):
+    rate_limiter.wait(url)
+    return get_session().request(method, url, timeout=timeout, **kwargs)
+
+
+def get(url, headers=None, params=None, timeout=DEFAULT_TIMEOUT, **kwargs):
+    return request('GET', url, headers=headers, params=params, timeout=timeout, **kwargs)
+
+
+def post(url, timeout=DEFAULT_TIMEOUT, **kwargs):
+    return request('POST', url, timeout=timeout, **kwargs)
@@ -0,0 +1,258 @@
+import json
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.app import config
+from backend.db.models import extract_profile_id
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class Job:
+    def __init__(self, author_name, profile_link, job_id=None):
+        self.job_id = job_id or uuid.uuid4().hex
+        self.author_name = author_name
+        self.profile_link = profile_link
+        self.profile_id = extract_profile_id(profile_link) or profile_link
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    @classmethod
+    def from_row(cls, row):
+        job_id, author_name, profile_link, status, result, error, created_at, finished_at = row
+        job = cls(author_name, profile_link, job_id=job_id)
+        job.status = status
+        job.result = json.loads(result) if result is not None else None
+        job.error = error
+        job.created_at = created_at
+        job.finished_at = finished_at
+        return job
+
+    def to_dict(self):
+        return {
+            "job_id": self.job_id,
+            "name": self.author_name,
+            "profile_id": self.profile_id,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+class AuthorJobQueue:
+    '''Runs author ingestion jobs on a bounded worker pool.
+
+    Job state lives in SQLite at db_path (config.PROGRESS_DB_PATH by default) so
+    every worker process sees it: a job can be polled from any worker, and enqueueing
+    an author that already has a queued or running job in any process returns that
+    job instead of starting a new one (jobs are deduplicated by ACM profile id).
+    Each process refreshes the heartbeat of its unfinished jobs every
+    heartbeat_interval seconds; a job whose heartbeat is older than stale_after
+    seconds belongs to a dead process and is marked failed. Finished jobs are kept
+    for finished_ttl seconds so clients can collect their result.'''
+
+    _columns = "job_id, author_name, profile_link, status, result, error, created_at, finished_at"
+
+    def __init__(self, handler, max_workers=4, on_enqueue=None, finished_ttl=3600,
+                 db_path=None, stale_after=120, heartbeat_interval=30):
+        self.handler = handler
+        self.on_enqueue = on_enqueue
+        self.finished_ttl = finished_ttl
+        self.stale_after = stale_after
+        self.heartbeat_interval = heartbeat_interval
+        self.db_path = db_path if db_path is not None else config.PROGRESS_DB_PATH
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="author-job")
+        # jobs run by this process, so callers here see their status change in place
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._initialize_db()
+        threading.Thread(target=self._heartbeat_loop, name="author-job-heartbeat", daemon=True).start()
+
+    def _connect(self):
+        # autocommit mode, so enqueue can take the write lock with BEGIN IMMEDIATE
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _initialize_db(self):
+        config.ensure_parent_dir(self.db_path)
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    profile_id TEXT,
+                    author_name TEXT,
+                    profile_link TEXT,
+                    status TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL,
+                    finished_at REAL,
+                    heartbeat_at REAL
+                )
+            """)
+            # tables created before heartbeats were added
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "heartbeat_at" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_profile_id_status ON jobs (profile_id, status)")
+        finally:
+            conn.close()
+
+    def enqueue(self, author_name, profile_link):
+        '''Return the job handling this profile, creating and scheduling it if needed.'''
+        profile_id = extract_profile_id(profile_link) or profile_link
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            self._purge_finished(conn, now)
+            row = conn.execute(
+                f"SELECT {self._columns} FROM jobs WHERE profile_id = ? AND status IN (?, ?) ORDER BY created_at LIMIT 1",
+                (profile_id, QUEUED, RUNNING)
+            ).fetchone()
+            if row is not None:
+                conn.execute("COMMIT")
+                with self.lock:
+                    return self.jobs.get(row[0]) or Job.from_row(row)
+
+            job = Job(author_name, profile_link)
+            conn.execute(
+                "INSERT INTO jobs (job_id, profile_id, author_name, profile_link, status, created_at, heartbeat_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job.job_id, job.profile_id, job.author_name, job.profile_link, job.status, job.created_at, job.created_at)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        with self.lock:
+            self.jobs[job.job_id] = job
+        if self.on_enqueue is not None:
+            self.on_enqueue(job)
+        self.executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        '''Return the job with this id from any worker process, or None if unknown or expired.'''
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is not None:
+            return job
+        conn = self._connect()
+        try:
+            row = conn.execute(f"SELECT {self._columns} FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+        return Job.from_row(row) if row else None
+
+    def has_active_job(self, profile_link):
+        '''Whether any worker process has a queued or running job for the profile.'''
+        profile_id = extract_profile_id(profile_link) or profile_link
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT 1 FROM jobs WHERE profile_id = ? AND status IN (?, ?) "
+                "AND COALESCE(heartbeat_at, created_at) >= ? LIMIT 1",
+                (profile_id, QUEUED, RUNNING, time.time() - self.stale_after)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row is not None
+
+    def _encode_result(self, job):
+        '''Return the job result as JSON; a result that cannot be encoded fails the job.'''
+        if job.result is None:
+            return None
+        try:
+            return json.dumps(job.result)
+        except (TypeError, ValueError) as e:
+            traceback.print_exc()
+            job.result = None
+            job.error = f"Job result could not be encoded: {e}"
+            job.status = FAILED
+            return None
+
+    def _save(self, job):
+        result = self._encode_result(job)
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, heartbeat_at = ? WHERE job_id = ?",
+                (job.status, result, job.error, job.finished_at, time.time(), job.job_id)
+            )
+        finally:
+            conn.close()
+
+    def _run(self, job):
+        job.status = RUNNING
+        try:
+            self._save(job)
+            job.result = self.handler(job.author_name, job.profile_link)
+            job.status = DONE
+        except Exception as e:
+            traceback.print_exc()
+            job.error = str(e)
+            job.status = FAILED
+        job.finished_at = time.time()
+        try:
+            self._save(job)
+        except sqlite3.Error:
+            # the heartbeat stops with the job, so other workers see it as abandoned
+            traceback.print_exc()
+
+    def _heartbeat_loop(self):
+        while not self._stopped.wait(self.heartbeat_interval):
+            with self.lock:
+                job_ids = [job.job_id for job in self.jobs.values() if job.finished_at is None]
+            if not job_ids:
+                continue
+            try:
+                conn = self._connect()
+                try:
+                    # stay well below SQLite's bound parameter limit
+                    for i in range(0, len(job_ids), 500):
+                        chunk = job_ids[i:i + 500]
+                        placeholders = ",".join("?" * len(chunk))
+                        conn.execute(
+                            f"UPDATE jobs SET heartbeat_at = ? WHERE finished_at IS NULL AND job_id IN ({placeholders})",
+                            (time.time(), *chunk)
+                        )
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                print(f"[DEBUG] Failed to record job heartbeats: {e}")
+
+    def _purge_finished(self, conn, now):
+        conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ? "
+            "WHERE status IN (?, ?) AND COALESCE(heartbeat_at, created_at) < ?",
+            (FAILED, "Job was abandoned by its worker.", now, QUEUED, RUNNING, now - self.stale_after)
+        )
+        conn.execute("DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (now - self.finished_ttl,))
+        with self.lock:
+            expired = [
+                job_id for job_id, job in self.jobs.items()
+                if job.finished_at is not None and job.finished_at < now - self.finished_ttl
+            ]
+            for job_id in expired:
+                del self.jobs[job_id]
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+        self._stopped.set()
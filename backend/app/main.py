@@ -1,24 +1,39 @@
 import json
-from datetime import timedelta
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
 
 import requests
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
 import backend.app.author_scraper as scraper
 import backend.db.db_helper as db
 import backend.db.models as model
 import backend.llm.llmNew as llm
 import backend.authorNetworkCode as nw
-from backend.app.author_recommender import get_acm_recommendations_and_field_authors
-import asyncio
+from backend.app.author_recommender import get_acm_recommendations_and_field_authors, recommendations_cache, field_author_cache
+from backend.app import async_runtime, config
 
+from backend.app.job_queue import AuthorJobQueue, DONE
 from backend.app.progress_manager import ProgressManager
 
 CACHE_LIFETIME = timedelta(weeks=4)
+# seconds a request waits for a regenerated summary before answering 504
+REGENERATE_TIMEOUT = 120
+# seconds a progress stream holds a worker before the client has to reconnect
+PROGRESS_STREAM_DURATION = 60
 app = Flask(__name__)
 
 progress_manager = ProgressManager()
 
+job_queue = AuthorJobQueue(
+    scraper.update_author_if_needed,
+    max_workers=4,
+    on_enqueue=lambda job: scraper.update_progress(job.profile_link, "Queued for processing..."),
+    # job state is shared by every gunicorn worker through the progress database
+    db_path=config.PROGRESS_DB_PATH
+)
+
 # Define allowed origins
 ALLOWED_ORIGINS = [
     "https://curation-tool.vercel.app",
@@ -59,14 +74,16 @@ def _search(search_type, name, page):
 
     # try to get the estimated max pages from the database
     typ = model.SearchType.from_string(search_type)
-    try:
-        max_pages = db.get_records(model.MaxPagesCache.max_pages, {'name': normalized_name, 'search_type': typ})[0][0]
-    except IndexError:
-        # scrape it and add to the cache if not found
+    filters = {'name': normalized_name, 'search_type': typ}
+    cached = db.get_records(model.MaxPagesCache.max_pages, filters)
+    max_pages = cached[0][0] if cached else None
+    if max_pages:
+        print(f"Cache hit for {search_type} {name}: {max_pages}")
+    else:
+        # scrape it and add to the cache if not found; a 0 or NULL entry is re-estimated
         print(f"Cache miss or new input. Running scraper.get_estimated_max_pages for: {search_type} {name}")
         try:
             max_pages = scraper.get_estimated_max_pages(name)  # Pass the timeout to scraper
-            db.add_record(model.MaxPagesCache(name=normalized_name, max_pages=max_pages, search_type=typ))
         except requests.Timeout:
             msg = "The request to the external scraper timed out. Please try again later."
             print(msg)
@@ -75,8 +92,17 @@ def _search(search_type, name, page):
             msg = f"An unexpected error occurred during scraping: {e}"
             print(msg)
             return jsonify(error=msg), 500
-    else:
-        print(f"Cache hit for {search_type} {name}: {max_pages}")
+
+        # the estimate is 0 when ACM failed or timed out as well as when nothing matches, so it is
+        # not cached and the next search estimates again; this one returns no results rather than
+        # making a second round trip on a path that just failed
+        if max_pages:
+            if cached:
+                db.update_record(model.MaxPagesCache, filters, {'max_pages': max_pages, 'date_created': datetime.utcnow()})
+            else:
+                db.add_record(model.MaxPagesCache(name=normalized_name, max_pages=max_pages, search_type=typ))
+        else:
+            max_pages = 0
 
     # perform the search
     try:
@@ -87,7 +113,8 @@ def _search(search_type, name, page):
         search_results = scraper.identify_input_type_and_search(
             input_value=name,
             page_number=page,
-            search_type=search_type
+            search_type=search_type,
+            max_pages=max_pages
         )
         print(f"Search results: {search_results}")
 
@@ -105,7 +132,9 @@ def _search(search_type, name, page):
 @app.route('/network/<name>')
 def network(name):
     try:
-        network_data = nw.convert_to_json(name)
+        depth = request.args.get('depth', default=1, type=int)
+        max_nodes = request.args.get('max_nodes', default=50, type=int)
+        network_data = nw.convert_to_json(name, depth=depth, max_nodes=max_nodes)
         return network_data,200
     except Exception as e:
         return jsonify({"error":str(e)}), 500
@@ -118,19 +147,34 @@ def search_author(name, page):
 def search_field(name, page):
     return _search('field', name, page)
 
+def _query_response(update_result, author_details_db):
+    response = {'author_details': author_details_db}
+    if update_result is None:
+        response['message'] = "Author details updated, but summary not available yet."
+    else:
+        response |= {'message': "Author summary retrieved successfully.", "summary": update_result}
+    return response
+
 @app.route('/query/<name>/<profile_link>')
 def query(name, profile_link):
     profile_link = f'https://dl.acm.org/profile/{profile_link}'
     print(f"Author Name: {name}, Profile Link: {profile_link}")
 
-    update_result, author_details_db = scraper.update_author_if_needed(name, profile_link)
+    # scraping, database writes and the LLM call run on the job queue's worker pool
+    job = job_queue.enqueue(name, profile_link)
 
-    response = {'author_details': author_details_db}
-    if update_result is None:
-        response['message'] = "Author details updated, but summary not available yet."
-    else:
-        response |= {'message': "Author summary retrieved successfully.", "summary": update_result}
+    response = job.to_dict() | {'message': "Author query queued. Poll /jobs/<job_id> for the result."}
+    return jsonify(response), 202
 
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job id."}), 404
+
+    response = job.to_dict()
+    if job.status == DONE:
+        response |= _query_response(*job.result)
     return jsonify(response), 200
 
 @app.route('/progress/<profile_link>', methods=['GET'])
@@ -139,6 +183,26 @@ def get_progress(profile_link):
     print(f"[DEBUG] Fetching progress for {profile_link}: {status}")
     return jsonify({"status": status}), 200
 
+@app.route('/progress/<profile_link>/stream', methods=['GET'])
+def stream_progress(profile_link):
+    '''Server-Sent Events stream of the progress statuses of one profile'''
+    def events():
+        deadline = time.monotonic() + PROGRESS_STREAM_DURATION
+        statuses = progress_manager.stream_progress(
+            profile_link, max_duration=PROGRESS_STREAM_DURATION, is_active=job_queue.has_active_job
+        )
+        for status in statuses:
+            if status is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"data: {json.dumps({'status': status})}\n\n"
+        # a stream that ran out of time closes without "end", so EventSource reconnects
+        if time.monotonic() < deadline:
+            yield "event: end\ndata: {}\n\n"
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return Response(stream_with_context(events()), mimetype="text/event-stream", headers=headers)
+
 
 # TODO make this work with the new database
 @app.route('/misc_profiles/<int:number>')
@@ -160,7 +224,11 @@ def regenerate_request(author_name):
     print(author_name, json)
 
     # regenerate the researcher summary
-    llm.regenerate_request(author_name, json)
+    try:
+        llm.regenerate_request(author_name, json, timeout=REGENERATE_TIMEOUT)
+    except FutureTimeoutError:
+        # the generation keeps running and stores the summary when it finishes
+        return jsonify({"error": "Summary regeneration is taking too long, please try again later."}), 504
     # get the new summary from the database
     res = db.get_researcher_summary(author_name)
     print(res)
@@ -222,9 +290,8 @@ def get_recommendations():
         except ValueError:
             return jsonify({"error": "Invalid input: max_recommendations and max_results_per_field must be integers."}), 400
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        results = loop.run_until_complete(get_acm_recommendations_and_field_authors(
+        # runs on the process-wide event loop shared by every request
+        results = async_runtime.runtime.run(get_acm_recommendations_and_field_authors(
             authors=authors,
             max_recommendations=max_recommendations,
             max_results_per_field=max_results_per_field
@@ -236,6 +303,16 @@ def get_recommendations():
         print(f"[ERROR] Exception occurred: {e}")
         return jsonify({"error": f"An unexpected error occurred: {str(e)}"}), 500
 
+@app.route('/cache_stats', methods=['GET'])
+def cache_stats():
+    '''Hit, miss and eviction counters of the in-process caches'''
+    return jsonify({
+        "recommendations": recommendations_cache.stats(),
+        "field_authors": field_author_cache.stats(),
+        "search_pages": scraper.search_page_cache.stats(),
+        "doi_metadata": scraper.metadata_client.stats(),
+    }), 200
+
 @app.route('/authors_with_summaries', methods=['GET'])
 def get_authors_with_summaries():
     try:
@@ -254,7 +331,8 @@ def get_authors_with_summaries():
 @app.route('/coauthor_rewind/<string:author_name>', methods=['GET'])
 def coauthor_rewind(author_name):
     try:
-        wrapped_data = db.get_author_wrapped(author_name)
+        by_year = request.args.get('by_year', 'false').lower() in ('1', 'true', 'yes')
+        wrapped_data = db.get_author_wrapped(author_name, by_year=by_year)
         print(json.dumps(wrapped_data, indent=4))
         if not wrapped_data:
             return jsonify({"error": "No data found for the given profile ID."}), 404
@@ -1,56 +1,231 @@
+import atexit
+import queue
 import sqlite3
+import threading
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from backend.app import config
+
+# statuses after which the scraper stops reporting progress for a profile
+TERMINAL_STATUS_MARKERS = ("Process complete", "Process stopped")
+
+def is_terminal_status(status):
+    return any(marker in status for marker in TERMINAL_STATUS_MARKERS)
 
 class ProgressManager:
+    '''Process-wide store of scraping progress per profile, backed by config.PROGRESS_DB_PATH.
+
+    Writes are buffered and flushed by a background thread every _batch_interval
+    seconds, so a burst of updates costs one transaction; the latest buffered
+    status is served to readers until it has been written. Rows that have not been
+    updated for _ttl seconds are removed every _cleanup_interval seconds.
+    A cleared profile keeps its last status for _clear_delay seconds, so streams
+    polling from other worker processes still see how the job ended.'''
     _instance = None
-    _db_path = "progress.db"
+    _db_path = config.PROGRESS_DB_PATH
+    _batch_interval = 0.05
+    _ttl = 6 * 3600
+    _cleanup_interval = 600
+    _clear_delay = 60
 
     def __new__(cls, *args, **kwargs):
         if not cls._instance:
             cls._instance = super(ProgressManager, cls).__new__(cls, *args, **kwargs)
+            # pin the path so the writer thread keeps using the database it started with
+            cls._instance._db_path = cls._db_path
+            cls._instance._subscribers = {}
+            cls._instance._subscribers_lock = threading.Lock()
+            cls._instance._local = threading.local()
+            cls._instance._pending = {}
+            cls._instance._pending_lock = threading.Lock()
+            cls._instance._clears = {}
+            cls._instance._pending_event = threading.Event()
+            cls._instance._flush_lock = threading.Lock()
             cls._instance._initialize_db()
+            cls._instance._start_writer()
         return cls._instance
 
+    def _connection(self):
+        '''Return this thread's connection to the progress database, opening it on first use.'''
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
     def _initialize_db(self):
-        conn = sqlite3.connect(self._db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
+        config.ensure_parent_dir(self._db_path)
+        conn = self._connection()
+        conn.execute("""
             CREATE TABLE IF NOT EXISTS progress (
                 profile_link TEXT PRIMARY KEY,
                 status TEXT,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_progress_updated_at ON progress (updated_at)")
         conn.commit()
-        conn.close()
+
+    def _start_writer(self):
+        writer = threading.Thread(target=self._writer_loop, name="progress-writer", daemon=True)
+        writer.start()
+        atexit.register(self.flush)
+
+    def _writer_loop(self):
+        last_cleanup = time.monotonic()
+        while True:
+            self._pending_event.wait(timeout=self._clear_delay if self._clears else self._cleanup_interval)
+            # let a burst of updates accumulate into one transaction
+            time.sleep(self._batch_interval)
+            try:
+                self.flush()
+                if time.monotonic() - last_cleanup >= self._cleanup_interval:
+                    self.cleanup()
+                    last_cleanup = time.monotonic()
+            except sqlite3.Error as e:
+                print(f"[DEBUG] Failed to write progress: {e}")
+
+    def flush(self):
+        '''Write all buffered updates, and the clears that are due, in a single transaction.'''
+        with self._flush_lock:
+            due = (datetime.now() - timedelta(seconds=self._clear_delay)).isoformat(" ")
+            with self._pending_lock:
+                self._pending_event.clear()
+                batch = dict(self._pending)
+                deletes = [(profile_link, cleared_at) for profile_link, cleared_at in self._clears.items() if cleared_at <= due]
+                for profile_link, _ in deletes:
+                    del self._clears[profile_link]
+            if not batch and not deletes:
+                return
+
+            upserts = [(profile_link, status, updated_at) for profile_link, (status, updated_at) in batch.items()]
+
+            conn = self._connection()
+            with conn:
+                conn.executemany("""
+                    INSERT INTO progress (profile_link, status, updated_at)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(profile_link) DO UPDATE SET
+                        status=excluded.status,
+                        updated_at=excluded.updated_at
+                """, upserts)
+                # a status written after the clear belongs to a new job and is kept
+                conn.executemany("DELETE FROM progress WHERE profile_link = ? AND updated_at <= ?", deletes)
+
+            # keep entries that were updated again while the batch was being written
+            with self._pending_lock:
+                for profile_link, entry in batch.items():
+                    if self._pending.get(profile_link) is entry:
+                        del self._pending[profile_link]
+
+    def cleanup(self, ttl=None):
+        '''Delete rows that have not been updated for ttl seconds.'''
+        if ttl is None:
+            ttl = self._ttl
+        cutoff = (datetime.now() - timedelta(seconds=ttl)).isoformat(" ")
+        conn = self._connection()
+        with conn:
+            deleted = conn.execute("DELETE FROM progress WHERE updated_at < ?", (cutoff,)).rowcount
+        if deleted:
+            print(f"[DEBUG] Removed {deleted} stale progress rows")
+        return deleted
+
+    def _buffer(self, profile_link, status):
+        with self._pending_lock:
+            self._pending[profile_link] = (status, datetime.now().isoformat(" "))
+        self._pending_event.set()
 
     def update_progress(self, profile_link, status):
-        conn = sqlite3.connect(self._db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO progress (profile_link, status, updated_at)
-            VALUES (?, ?, ?)
-            ON CONFLICT(profile_link) DO UPDATE SET
-                status=excluded.status,
-                updated_at=excluded.updated_at
-        """, (profile_link, status, datetime.now()))
-        conn.commit()
-        conn.close()
+        self._buffer(profile_link, status)
+        self._publish(profile_link, status)
         print(f"[DEBUG] Updated progress for '{profile_link}' to '{status}'")
 
+    def _read_status(self, profile_link):
+        with self._pending_lock:
+            entry = self._pending.get(profile_link)
+        if entry is not None:
+            return entry[0]
+
+        row = self._connection().execute(
+            "SELECT status FROM progress WHERE profile_link = ?", (profile_link,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def subscribe(self, profile_link):
+        '''Return a queue that receives every status published for the profile.
+        None is put on the queue when the profile's progress is cleared.'''
+        subscriber = queue.Queue()
+        with self._subscribers_lock:
+            self._subscribers.setdefault(profile_link, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, profile_link, subscriber):
+        with self._subscribers_lock:
+            subscribers = self._subscribers.get(profile_link)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[profile_link]
+
+    def _publish(self, profile_link, status):
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers.get(profile_link, ()))
+        for subscriber in subscribers:
+            subscriber.put(status)
+
+    def stream_progress(self, profile_link, poll_interval=5, max_duration=60, is_active=None):
+        '''Yield the profile's status each time it changes, starting with the stored one.
+
+        Updates made in this process are pushed through subscribe(); the SQLite table
+        is re-read every poll_interval seconds so updates written by other worker
+        processes are still picked up. The generator ends once a terminal status has
+        been sent, the progress is cleared, or max_duration seconds have passed.
+        If is_active is given, it also ends as soon as the profile has no stored
+        status and is_active(profile_link) is false, i.e. there is nothing to follow.
+        Between changes it yields None so callers can send keep-alives.'''
+        subscriber = self.subscribe(profile_link)
+        try:
+            deadline = time.monotonic() + max_duration
+            last_status = self._read_status(profile_link)
+            if last_status is not None:
+                yield last_status
+                if is_terminal_status(last_status):
+                    return
+            elif is_active is not None and not is_active(profile_link):
+                return
+
+            while time.monotonic() < deadline:
+                try:
+                    status = subscriber.get(timeout=poll_interval)
+                    if status is None:
+                        return
+                except queue.Empty:
+                    status = self._read_status(profile_link)
+                    if status is None and is_active is not None and not is_active(profile_link):
+                        return
+
+                if status is None or status == last_status:
+                    yield None
+                    continue
+
+                last_status = status
+                yield status
+                if is_terminal_status(status):
+                    return
+        finally:
+            self.unsubscribe(profile_link, subscriber)
+
     def get_progress(self, profile_link, max_retries=10, retry_delay=0.5):
         retries = 0
         while retries < max_retries:
-            conn = sqlite3.connect(self._db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT status FROM progress WHERE profile_link = ?", (profile_link,))
-            result = cursor.fetchone()
-            conn.close()
+            status = self._read_status(profile_link)
 
-            if result:
-                print(f"[DEBUG] Progress for '{profile_link}': {result[0]}")
-                return result[0]
+            if status is not None:
+                print(f"[DEBUG] Progress for '{profile_link}': {status}")
+                return status
 
             print(f"[DEBUG] Progress not found for '{profile_link}'. Retrying... ({retries + 1}/{max_retries})")
             time.sleep(retry_delay)
@@ -60,9 +235,8 @@ class ProgressManager:
         return "No progress available."
 
     def clear_progress(self, profile_link):
-        conn = sqlite3.connect(self._db_path)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM progress WHERE profile_link = ?", (profile_link,))
-        conn.commit()
-        conn.close()
-        print(f"[DEBUG] Cleared progress for '{profile_link}'")
\ No newline at end of file
+        '''End the profile's streams in this process and delete its stored status after _clear_delay seconds.'''
+        with self._pending_lock:
+            self._clears[profile_link] = datetime.now().isoformat(" ")
+        self._publish(profile_link, None)
+        print(f"[DEBUG] Cleared progress for '{profile_link}'")
@@ -0,0 +1,142 @@
+import heapq
+import json
+import sqlite3
+import threading
+import time
+
+from backend.app import config
+
+
+class RecommendationsCache:
+    '''Size-bounded LRU + TTL cache of /recommendations results keyed by the requested authors.
+
+    Entries and their recency are only changed under the lock, so an eviction always
+    removes a key from both maps. When the cache is full, the least recently used
+    tenth of the entries is evicted. When db_path is given, entries are also written
+    to SQLite so other worker processes can serve them; the database is only created
+    on first use, and it is read and written outside the lock, so callers on an
+    event loop should run get and set in a worker thread.'''
+
+    def __init__(self, max_entries=1024, ttl=3600, db_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self.entries = {}
+        self.last_used = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.store_hits = 0
+        self._initialized = False
+
+    @staticmethod
+    def _store_key(key):
+        return json.dumps(list(key))
+
+    def _connect(self):
+        if not self._initialized:
+            self._initialize_db()
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _initialize_db(self):
+        config.ensure_parent_dir(self.db_path)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS recommendations (
+                cache_key TEXT PRIMARY KEY,
+                recommendations TEXT,
+                weights TEXT,
+                expires_at REAL
+            )
+        """)
+        conn.commit()
+        conn.close()
+        self._initialized = True
+
+    def _load(self, key):
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT recommendations, weights, expires_at FROM recommendations WHERE cache_key = ? AND expires_at > ?",
+                (self._store_key(key), time.time())
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        # the store uses wall-clock expiry, the in-memory entries a monotonic clock
+        remaining = row[2] - time.time()
+        return json.loads(row[0]), [tuple(weight) for weight in json.loads(row[1])], time.monotonic() + remaining
+
+    def get(self, key):
+        '''Return (recommendations, weights), or (None, None) on a miss.'''
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[2] <= now:
+                del self.entries[key]
+                self.last_used.pop(key, None)
+                self.expirations += 1
+                entry = None
+            if entry is not None:
+                self.last_used[key] = now
+                self.hits += 1
+                return entry[0], entry[1]
+
+        entry = self._load(key) if self.db_path is not None else None
+        if entry is None:
+            with self.lock:
+                self.misses += 1
+            return None, None
+
+        self._insert(key, entry)
+        with self.lock:
+            self.store_hits += 1
+            self.hits += 1
+        return entry[0], entry[1]
+
+    def _insert(self, key, entry):
+        with self.lock:
+            if key not in self.entries and len(self.entries) >= self.max_entries:
+                count = max(1, self.max_entries // 10)
+                oldest = heapq.nsmallest(count, self.entries, key=lambda k: self.last_used.get(k, 0))
+                for old_key in oldest:
+                    del self.entries[old_key]
+                    self.last_used.pop(old_key, None)
+                self.evictions += len(oldest)
+            self.entries[key] = entry
+            self.last_used[key] = time.monotonic()
+
+    def set(self, key, recommendations, weights):
+        weights = [tuple(weight) for weight in weights]
+        self._insert(key, (recommendations, weights, time.monotonic() + self.ttl))
+        if self.db_path is None:
+            return
+        conn = self._connect()
+        try:
+            conn.execute("""
+                INSERT INTO recommendations (cache_key, recommendations, weights, expires_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    recommendations=excluded.recommendations,
+                    weights=excluded.weights,
+                    expires_at=excluded.expires_at
+            """, (self._store_key(key), json.dumps(recommendations), json.dumps(weights), time.time() + self.ttl))
+            conn.execute("DELETE FROM recommendations WHERE expires_at <= ?", (time.time(),))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "store_hits": self.store_hits,
+            }
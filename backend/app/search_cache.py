@@ -0,0 +1,226 @@
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+from backend.app import config
+
+
+def normalize_query(query):
+    return ' '.join(query.lower().split())
+
+
+class SearchPageCache:
+    '''Bounded LRU + TTL cache of parsed ACM search result pages.
+
+    Entries are keyed by (search type, normalized query, page) and stored in SQLite
+    so they are shared by every request and every worker process on the host. The
+    database (config.SEARCH_CACHE_PATH by default) is only created on first use.'''
+
+    def __init__(self, db_path=None, ttl=24 * 3600, max_entries=5000):
+        self.db_path = db_path if db_path is not None else config.SEARCH_CACHE_PATH
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self):
+        if not self._initialized:
+            self._initialize_db()
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _initialize_db(self):
+        config.ensure_parent_dir(self.db_path)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS search_pages (
+                search_type TEXT,
+                query TEXT,
+                page INTEGER,
+                results TEXT,
+                created_at REAL,
+                accessed_at REAL,
+                PRIMARY KEY (search_type, query, page)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_search_pages_accessed_at ON search_pages (accessed_at)")
+        conn.commit()
+        conn.close()
+        self._initialized = True
+
+    def get(self, search_type, query, page):
+        '''Return the cached results of a page, or None if missing or expired.'''
+        key = (search_type, normalize_query(query), page)
+        now = time.time()
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT results FROM search_pages WHERE search_type = ? AND query = ? AND page = ? AND created_at >= ?",
+                (*key, now - self.ttl)
+            ).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE search_pages SET accessed_at = ? WHERE search_type = ? AND query = ? AND page = ?",
+                    (now, *key)
+                )
+                conn.commit()
+        finally:
+            conn.close()
+
+        with self._lock:
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return json.loads(row[0]) if row else None
+
+    def set(self, search_type, query, page, results):
+        key = (search_type, normalize_query(query), page)
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("""
+                INSERT INTO search_pages (search_type, query, page, results, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(search_type, query, page) DO UPDATE SET
+                    results=excluded.results,
+                    created_at=excluded.created_at,
+                    accessed_at=excluded.accessed_at
+            """, (*key, json.dumps(results), now, now))
+            # drop expired entries, then the least recently used ones above the bound
+            conn.execute("DELETE FROM search_pages WHERE created_at < ?", (now - self.ttl,))
+            conn.execute("""
+                DELETE FROM search_pages WHERE rowid IN (
+                    SELECT rowid FROM search_pages ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+class FieldAuthorCache:
+    '''Process-wide cache of the authors found for a research field, with
+    stale-while-revalidate semantics.
+
+    Entries younger than ttl are fresh. Entries up to stale_ttl older than that are
+    still served, but the caller should refresh them in the background (see
+    begin_refresh); callers that find a refresh already running can wait for its
+    result with refresh_future. When db_path is given, entries are also persisted to SQLite
+    so they survive restarts and are shared between worker processes; the database
+    is only created on first use.'''
+
+    def __init__(self, db_path=None, ttl=24 * 3600, stale_ttl=7 * 24 * 3600):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.entries = {}
+        self.refreshing = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self):
+        if not self._initialized:
+            self._initialize_db()
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _initialize_db(self):
+        config.ensure_parent_dir(self.db_path)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS field_authors (
+                field TEXT PRIMARY KEY,
+                authors TEXT,
+                fetched_at REAL
+            )
+        """)
+        conn.commit()
+        conn.close()
+        self._initialized = True
+
+    def _load(self, key):
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT authors, fetched_at FROM field_authors WHERE field = ?", (key,)).fetchone()
+        finally:
+            conn.close()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def get(self, field):
+        '''Return (authors, fresh). authors is None when there is no usable entry.'''
+        key = normalize_query(field)
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry is None and self.db_path is not None:
+            entry = self._load(key)
+            if entry is not None:
+                with self._lock:
+                    self.entries.setdefault(key, entry)
+
+        age = time.time() - entry[1] if entry is not None else None
+        with self._lock:
+            if age is None or age >= self.ttl + self.stale_ttl:
+                self.misses += 1
+                return None, False
+            if age < self.ttl:
+                self.hits += 1
+                return entry[0], True
+            self.stale_hits += 1
+            return entry[0], False
+
+    def set(self, field, authors):
+        key = normalize_query(field)
+        now = time.time()
+        with self._lock:
+            self.entries[key] = (authors, now)
+        if self.db_path is None:
+            return
+        conn = self._connect()
+        try:
+            conn.execute("""
+                INSERT INTO field_authors (field, authors, fetched_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(field) DO UPDATE SET
+                    authors=excluded.authors,
+                    fetched_at=excluded.fetched_at
+            """, (key, json.dumps(authors), now))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def begin_refresh(self, field):
+        '''Return True if the caller should refresh the field, False if a refresh is already running.
+
+        A caller that gets True must call end_refresh once it is done.'''
+        key = normalize_query(field)
+        with self._lock:
+            if key in self.refreshing:
+                return False
+            self.refreshing[key] = Future()
+            return True
+
+    def refresh_future(self, field):
+        '''Return a Future for the authors of the running refresh of field, or None if none is running.'''
+        with self._lock:
+            return self.refreshing.get(normalize_query(field))
+
+    def end_refresh(self, field, authors=None):
+        '''Finish the refresh started by begin_refresh and pass authors to everyone waiting for it.'''
+        with self._lock:
+            future = self.refreshing.pop(normalize_query(field), None)
+        if future is not None:
+            future.set_result(authors)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "stale_hits": self.stale_hits, "misses": self.misses}
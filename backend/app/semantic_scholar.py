@@ -0,0 +1,177 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.app import config, http_client
+
+DEFAULT_METADATA = ("No abstract available.", "Unknown", 0)
+
+
+class DOIMetadataCache:
+    '''Local SQLite store of Semantic Scholar metadata keyed by DOI.
+
+    The database (config.DOI_CACHE_PATH by default) is only created on first use.'''
+
+    def __init__(self, db_path=None, ttl=7 * 24 * 3600):
+        self.db_path = db_path if db_path is not None else config.DOI_CACHE_PATH
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self):
+        if not self._initialized:
+            self._initialize_db()
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _initialize_db(self):
+        config.ensure_parent_dir(self.db_path)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS doi_metadata (
+                doi TEXT PRIMARY KEY,
+                abstract TEXT,
+                publication_date TEXT,
+                citation_count INTEGER,
+                fetched_at REAL
+            )
+        """)
+        conn.commit()
+        conn.close()
+        self._initialized = True
+
+    def get_many(self, dois):
+        '''Return a dict of the cached, non-expired metadata for the given DOIs.'''
+        if not dois:
+            return {}
+
+        cutoff = time.time() - self.ttl
+        found = {}
+        conn = self._connect()
+        try:
+            # stay well below SQLite's bound parameter limit
+            for i in range(0, len(dois), 500):
+                chunk = dois[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f"SELECT doi, abstract, publication_date, citation_count FROM doi_metadata "
+                    f"WHERE doi IN ({placeholders}) AND fetched_at >= ?",
+                    (*chunk, cutoff)
+                ).fetchall()
+                for doi, abstract, publication_date, citation_count in rows:
+                    found[doi] = (abstract, publication_date, citation_count)
+        finally:
+            conn.close()
+
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(dois) - len(found)
+        return found
+
+    def set_many(self, metadata):
+        '''Store a dict of DOI -> (abstract, publication date, citation count).'''
+        if not metadata:
+            return
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.executemany("""
+                INSERT INTO doi_metadata (doi, abstract, publication_date, citation_count, fetched_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(doi) DO UPDATE SET
+                    abstract=excluded.abstract,
+                    publication_date=excluded.publication_date,
+                    citation_count=excluded.citation_count,
+                    fetched_at=excluded.fetched_at
+            """, [(doi, *values, now) for doi, values in metadata.items()])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+class SemanticScholarClient:
+    '''Resolves DOI metadata through the Semantic Scholar paper/batch endpoint.
+
+    Lookups are served from a DOIMetadataCache first; only the DOIs that are not
+    cached are POSTed, in batches of at most batch_size ids.'''
+
+    base_url = "https://api.semanticscholar.org/graph/v1"
+    fields = "title,abstract,publicationDate,citationCount"
+
+    def __init__(self, cache=None, base_url=None, batch_size=500, max_workers=4, timeout=10):
+        self.cache = cache if cache is not None else DOIMetadataCache()
+        if base_url is not None:
+            self.base_url = base_url
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.api_key = os.getenv('SEMANTIC_SCHOLAR_API_KEY')
+        self.requests_sent = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _parse_paper(data):
+        abstract = data.get('abstract', 'No abstract available.')
+        publication_date = data.get('publicationDate', 'Unknown publication date')
+        citation_count = data.get('citationCount', 0)
+        return abstract, publication_date, citation_count
+
+    def _fetch_batch(self, dois, timeout):
+        '''POST one batch of DOIs; returns a dict containing only the DOIs that were found.'''
+        headers = {'x-api-key': self.api_key} if self.api_key else None
+        with self._lock:
+            self.requests_sent += 1
+        try:
+            response = http_client.post(
+                f"{self.base_url}/paper/batch",
+                params={'fields': self.fields},
+                json={'ids': [f"DOI:{doi}" for doi in dois]},
+                headers=headers,
+                timeout=timeout
+            )
+            if response.status_code != 200:
+                print(f"Failed to retrieve batch metadata for {len(dois)} DOIs: {response.status_code}")
+                return {}
+
+            # the response is aligned with the requested ids, with null for unknown papers
+            return {
+                doi: self._parse_paper(paper)
+                for doi, paper in zip(dois, response.json())
+                if paper
+            }
+        except Exception as e:
+            print(f"Error retrieving batch metadata from Semantic Scholar: {e}")
+            return {}
+
+    def get_metadata(self, dois, max_workers=None, timeout=None):
+        '''Return a dict mapping each DOI to (abstract, publication date, citation count).
+
+        DOIs that cannot be resolved map to DEFAULT_METADATA and are not cached, so
+        they are retried on the next lookup.'''
+        if max_workers is None:
+            max_workers = self.max_workers
+        if timeout is None:
+            timeout = self.timeout
+
+        unique_dois = list(dict.fromkeys(doi for doi in dois if doi))
+        results = self.cache.get_many(unique_dois)
+
+        missing = [doi for doi in unique_dois if doi not in results]
+        if missing:
+            batches = [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+                for fetched in executor.map(lambda batch: self._fetch_batch(batch, timeout), batches):
+                    self.cache.set_many(fetched)
+                    results.update(fetched)
+
+        return {doi: results.get(doi, DEFAULT_METADATA) for doi in unique_dois}
+
+    def stats(self):
+        return {**self.cache.stats(), "requests": self.requests_sent}
@@ -1,6 +1,13 @@
 import json
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
+
 from backend.db import db_helper
-from backend.db.models import PaperAuthors, Researcher
+from backend.db.models import PaperAuthors, Researcher, normalize_name
 
 def retrieve_formatted_records(model, filters=None):
     session = db_helper.get_session()
@@ -12,61 +19,216 @@ def retrieve_formatted_records(model, filters=None):
     return [{key: str(value) for key, value in result.__dict__.items() if not key.startswith('_')}
             for result in results]
 
-def generatesNodesAndEdges(id, max_nodes=50):
-    var = retrieve_formatted_records(PaperAuthors, {'id': id})
-    nodes = []
+def get_collaborations(session, id):
+    '''Return {doi: [co-author ids]} for every paper of the researcher, in one query.'''
+    own_papers = aliased(PaperAuthors)
+    co_authors = aliased(PaperAuthors)
+    rows = (
+        session.query(co_authors.doi, co_authors.id)
+        .join(own_papers, own_papers.doi == co_authors.doi)
+        .filter(own_papers.id == id, co_authors.id != id)
+        .order_by(co_authors.doi, co_authors.id)
+        .all()
+    )
+
+    papers = {}
+    for doi, co_author_id in rows:
+        papers.setdefault(doi, []).append(co_author_id)
+    return papers
+
+def get_researcher_nodes(session, ids):
+    '''Return {id: (name, profile_link)} for the given researcher ids.'''
+    researchers = {}
+    for chunk in db_helper._chunks(ids):
+        rows = (
+            session.query(Researcher.id, Researcher.name, Researcher.profile_link)
+            .filter(Researcher.id.in_(chunk))
+            .all()
+        )
+        for id, name, profile_link in rows:
+            researchers[id] = (name, profile_link)
+    return researchers
+
+def generatesNodesAndEdges(id, max_nodes=50, session=None):
+    '''Build the co-author network of a researcher with one collaborations query and
+    one (chunked) researcher query.
+
+    The most frequent collaborators are kept, up to max_nodes, skipping any whose
+    profile link is already in the network. Node ids are strings, as before.'''
+    if session is None:
+        session = db_helper.get_session()
+    try:
+        papers = get_collaborations(session, id)
+        paper_counts = Counter(co_author for co_authors in papers.values() for co_author in co_authors)
+        collaborators = sorted(paper_counts, key=lambda co_author: (-paper_counts[co_author], co_author))
+        researchers = get_researcher_nodes(session, [id] + collaborators)
+    finally:
+        session.close()
+
+    name, profile_link = researchers[id]
+    nodes = [{"id": str(id), "name": name, "link": profile_link}]
+    links = {profile_link}
+    node_ids = set()
+
+    for co_author in collaborators:
+        if len(nodes) >= max_nodes + 1:
+            break
+        if co_author not in researchers:
+            continue
+        name, profile_link = researchers[co_author]
+        if profile_link in links:
+            continue
+        nodes.append({"id": str(co_author), "name": name, "link": profile_link})
+        links.add(profile_link)
+        node_ids.add(co_author)
+
+    # co-author pairs on the same paper, deduplicated regardless of direction
     edges = []
-    relevantdois = []
-    ids = []
-    idset = set()
+    seen_pairs = set()
+    for co_authors in papers.values():
+        members = [co_author for co_author in co_authors if co_author in node_ids]
+        for i, person1 in enumerate(members):
+            for person2 in members[i + 1:]:
+                pair = (min(person1, person2), max(person1, person2))
+                if pair not in seen_pairs:
+                    seen_pairs.add(pair)
+                    edges.append({"source": str(person1), "target": str(person2)})
 
-    for record in var:
-        relevantdois.append(record.get('doi'))
+    # Add edges connecting the main node to collaborators
+    for node in nodes[1:]:
+        edges.append({"source": str(id), "target": node["id"]})
 
-    for doi in relevantdois:
-        collaborators = []
-        for entry in retrieve_formatted_records(PaperAuthors, {'doi': doi}):
-            collaborators.append(entry.get('id')) if entry.get('id') != str(id) else None
-        ids.append(collaborators)
+    return nodes, edges
 
-    for element in ids:
-        for number in element:
-            idset.add(number)
+def get_collaborator_weights(session, ids):
+    '''Return {(researcher id, co-author id): shared papers} for the given researchers.'''
+    own_papers = aliased(PaperAuthors)
+    co_authors = aliased(PaperAuthors)
+    weights = {}
+    for chunk in db_helper._chunks(ids):
+        rows = (
+            session.query(own_papers.id, co_authors.id, func.count(co_authors.doi))
+            .join(co_authors, co_authors.doi == own_papers.doi)
+            .filter(own_papers.id.in_(chunk), co_authors.id != own_papers.id)
+            .group_by(own_papers.id, co_authors.id)
+            .all()
+        )
+        for id, co_author_id, shared_papers in rows:
+            weights[(id, co_author_id)] = shared_papers
+    return weights
+
+def generate_multi_hop_network(id, depth=2, max_nodes=100, session=None):
+    '''Build the co-author network up to depth hops away from a researcher.
+
+    Each hop adds the researchers with the most papers shared with the current
+    network, until max_nodes researchers besides the main one are included. Uses one
+    grouped query per hop, one for the links of the last hop and one for the names.'''
+    if session is None:
+        session = db_helper.get_session()
+    try:
+        included = [id]
+        included_ids = {id}
+        frontier = [id]
+        weights = {}
+        for hop in range(depth + 1):
+            hop_weights = get_collaborator_weights(session, frontier)
+            weights.update(hop_weights)
+            budget = max_nodes + 1 - len(included)
+            if hop == depth or budget <= 0:
+                break
+
+            candidates = Counter()
+            for (_, co_author), shared_papers in hop_weights.items():
+                if co_author not in included_ids:
+                    candidates[co_author] += shared_papers
+            frontier = sorted(candidates, key=lambda co_author: (-candidates[co_author], co_author))[:budget]
+            if not frontier:
+                break
+            included.extend(frontier)
+            included_ids.update(frontier)
+        researchers = get_researcher_nodes(session, included)
+    finally:
+        session.close()
 
-    temp = retrieve_formatted_records(Researcher, {'id': id})[0]
-    nodes.append({"id": temp.get("id"), "name": temp.get("name"), "link": temp.get("profile_link")})
+    nodes = []
+    node_ids = set()
+    links = set()
+    for researcher_id in included:
+        if researcher_id not in researchers:
+            continue
+        name, profile_link = researchers[researcher_id]
+        # duplicate researcher rows of the same profile are shown once
+        if profile_link in links:
+            continue
+        nodes.append({"id": str(researcher_id), "name": name, "link": profile_link})
+        node_ids.add(researcher_id)
+        links.add(profile_link)
 
-    for item in idset:
-        if len(nodes) >= max_nodes + 1:
-            break
-        record = retrieve_formatted_records(Researcher, {'id': int(item)})[0]
-        if not any(node['link'] == record.get("profile_link") for node in nodes):
-            nodes.append({"id": record.get("id"), "name": record.get("name"), "link": record.get("profile_link")})
+    edges = []
+    seen_pairs = set()
+    for (person1, person2) in weights:
+        pair = (min(person1, person2), max(person1, person2))
+        if person1 in node_ids and person2 in node_ids and pair not in seen_pairs:
+            seen_pairs.add(pair)
+            edges.append({"source": str(pair[0]), "target": str(pair[1])})
 
-    node_ids = {node['id'] for node in nodes}
+    return nodes, edges
 
-    for lists in ids:
-        for person1 in lists:
-            for person2 in lists:
-                if person1 in node_ids and person2 in node_ids and person1 != person2:
-                    edge = {"source": person1, "target": person2}
-                    reverse_edge = {"source": person2, "target": person1}
-                    if edge not in edges and reverse_edge not in edges:
-                        edges.append(edge)
+class NetworkCache:
+    '''LRU cache of network JSON keyed by (researcher id, depth, max_nodes).
 
-    # Add edges connecting the main node to collaborators
-    for lists in ids:
-        for person1 in lists:
-            if person1 in node_ids:
-                edges.append({"source": temp.get("id"), "target": person1})
+    An entry is only served while the network version it was built from (see
+    db_helper.get_network_version) is still current and it is younger than ttl seconds.'''
 
-    return nodes, edges
+    def __init__(self, max_entries=256, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, version):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] != version or time.monotonic() - entry[1] >= self.ttl:
+                return None
+            self.entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key, version, value):
+        with self.lock:
+            self.entries[key] = (version, time.monotonic(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+network_cache = NetworkCache()
+
+MAX_DEPTH = 3
+MAX_NODES = 500
 
-def convert_to_json(name):
+def convert_to_json(name, depth=1, max_nodes=50, session=None):
     # Retrieve the ID for the given name
-    record = retrieve_formatted_records(Researcher, {'name': name})
-    id = record[0].get('id')
-    nodes, edges = generatesNodesAndEdges(int(id))
+    depth = max(1, min(depth, MAX_DEPTH))
+    max_nodes = max(1, min(max_nodes, MAX_NODES))
+    if session is None:
+        session = db_helper.get_session()
+    try:
+        record = session.query(Researcher.id).filter(Researcher.normalized_name == normalize_name(name)).first()
+        version = db_helper.get_network_version(session)
+    finally:
+        session.close()
+    if record is None:
+        raise ValueError(f"No researcher named '{name}'")
+
+    key = (record.id, depth, max_nodes)
+    cached = network_cache.get(key, version)
+    if cached is not None:
+        return cached
+
+    if depth == 1:
+        nodes, edges = generatesNodesAndEdges(record.id, max_nodes=max_nodes, session=session)
+    else:
+        nodes, edges = generate_multi_hop_network(record.id, depth=depth, max_nodes=max_nodes, session=session)
 
     # Construct the graph data
     graph_data = {
@@ -74,9 +236,8 @@ def convert_to_json(name):
         "links": edges
     }
 
-    # Write to JSON file
     json_string = json.dumps(graph_data, indent=4)
-    print(json_string)
+    network_cache.set(key, version, json_string)
     return json_string
 
-# convert_to_json("JERZY WILDE")
\ No newline at end of file
+# convert_to_json("JERZY WILDE")
@@ -0,0 +1,106 @@
+'''Replay benchmark for ACMAuthorSearcher author and field search.
+
+Serves the recorded search pages in benchmarks/fixtures from a local server that
+adds a fixed response latency, and rate limits it like dl.acm.org. Compares the
+sequential page loop with the concurrent fetch_pages window.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_acm_search
+'''
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from backend.app import http_client
+from backend.app.acm_author_searcher import ACMAuthorSearcher
+from backend.app.http_client import HostRateLimiter, HOST_LIMITS
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+# ACM search pages typically take more than a second to render
+LATENCY = 1.5
+REPEATS = 1
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        query = parse_qs(urlsplit(self.path).query)
+        kind = 'author' if query.get('content') == ['people'] else 'field'
+        path = os.path.join(FIXTURES_DIR, f"acm_{kind}_search_page_{query.get('startPage', ['0'])[0]}.html")
+
+        time.sleep(LATENCY)
+        body = open(path, 'rb').read() if os.path.exists(path) else b'<html><body></body></html>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class LegacySearcher(ACMAuthorSearcher):
+    '''Sequential window with the unconditional one second sleep before every request.'''
+
+    def fetch_page(self, url, headers):
+        time.sleep(1)
+        return super().fetch_page(url, headers)
+
+    def fetch_page_window(self, base_url, headers, profile_url_pattern, is_field, start_page, end_page):
+        return SequentialSearcher.fetch_page_window(self, base_url, headers, profile_url_pattern, is_field, start_page, end_page)
+
+
+class SequentialSearcher(ACMAuthorSearcher):
+    '''One page at a time, paced only by the shared rate limiter.'''
+
+    def fetch_page_window(self, base_url, headers, profile_url_pattern, is_field, start_page, end_page):
+        return [
+            self.scrape_page(f"{base_url}&startPage={i}", headers, profile_url_pattern, is_field)
+            for i in range(start_page, end_page)
+        ]
+
+
+def time_search(searcher_class, server_url, search):
+    timings = []
+    result = None
+    for _ in range(REPEATS):
+        # a fresh limiter per run, so every run starts with a full bucket
+        http_client.rate_limiter = HostRateLimiter(host_limits={'127.0.0.1': HOST_LIMITS['dl.acm.org']})
+        searcher = searcher_class()
+        searcher.base_url = server_url
+        start = time.perf_counter()
+        result = search(searcher)
+        timings.append(time.perf_counter() - start)
+    return result, min(timings)
+
+
+def run():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), ReplayHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    server_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+
+    searches = [
+        ('author search', lambda searcher: searcher.search_acm_author('adriana', 0, 6)),
+        ('field search', lambda searcher: searcher.search_acm_field('software engineering', 0)),
+    ]
+    rows = []
+    for label, search in searches:
+        legacy, legacy_time = time_search(LegacySearcher, server_url, search)
+        sequential, sequential_time = time_search(SequentialSearcher, server_url, search)
+        concurrent, concurrent_time = time_search(ACMAuthorSearcher, server_url, search)
+        assert legacy == sequential == concurrent
+        rows.append((label, len(concurrent['results']), legacy_time, sequential_time, concurrent_time))
+
+    print(f"{'search':<14} | {'results':>7} | {'legacy s':>8} | {'sequential s':>12} | {'concurrent s':>12}")
+    for label, results, legacy_time, sequential_time, concurrent_time in rows:
+        print(f"{label:<14} | {results:>7} | {legacy_time:>8.2f} | {sequential_time:>12.2f} | {concurrent_time:>12.2f}")
+
+    httpd.shutdown()
+
+
+if __name__ == '__main__':
+    run()
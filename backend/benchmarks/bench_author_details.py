@@ -0,0 +1,107 @@
+'''Benchmark for get_author_details_from_db against a seeded SQLite database.
+
+Compares the set-based implementation with the previous per-paper co-author
+queries, reporting the number of SQL statements and the wall time for authors
+with an increasing number of publications.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_author_details
+'''
+import time
+from datetime import date
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.db.models import Base, Researcher, Paper, PaperAuthors, Fields_of_Study, ResearcherFieldsOfStudy
+from backend.db.db_helper import get_author_details_from_db
+
+CO_AUTHORS_PER_PAPER = 4
+PUBLICATION_COUNTS = [10, 50, 200, 1000]
+
+
+def legacy_get_author_details_from_db(author_name, session):
+    '''The N+1 implementation this benchmark compares against.'''
+    researcher = session.query(Researcher).filter(Researcher.name == author_name).first()
+    researcher_id = researcher.id
+    fields_of_study = [
+        field.field_name for field in session.query(Fields_of_Study)
+        .join(ResearcherFieldsOfStudy)
+        .filter(ResearcherFieldsOfStudy.id == researcher_id).all()
+    ]
+    publications = []
+    for paper in session.query(Paper).join(PaperAuthors).filter(PaperAuthors.id == researcher_id).all():
+        co_authors = [
+            {"Name": co_author.name, "Profile Link": co_author.profile_link}
+            for co_author in session.query(Researcher)
+            .join(PaperAuthors, Researcher.id == PaperAuthors.id)
+            .filter(PaperAuthors.doi == paper.doi, Researcher.id != researcher_id).all()
+        ]
+        publications.append({"DOI": paper.doi, "Co-Authors": co_authors})
+    return {"Fields of Study": fields_of_study, "Publications": publications}
+
+
+def seed(session, publication_count):
+    author = Researcher(name='Bench Author', profile_link='https://dl.acm.org/profile/1')
+    field = Fields_of_Study(field_name='Benchmarking')
+    author.fields_of_study.append(field)
+    session.add(author)
+
+    co_authors = [
+        Researcher(name=f'Co-Author {i}', profile_link=f'https://dl.acm.org/profile/{i + 2}')
+        for i in range(publication_count)
+    ]
+    session.add_all(co_authors)
+    session.flush()
+
+    papers = [
+        Paper(doi=f'10.1145/{i}', title=f'Paper {i}', publication_date=date(2020, 1, 1), citations=i)
+        for i in range(publication_count)
+    ]
+    session.add_all(papers)
+    session.flush()
+
+    rows = []
+    for i, paper in enumerate(papers):
+        rows.append({'doi': paper.doi, 'id': author.id})
+        for j in range(CO_AUTHORS_PER_PAPER):
+            rows.append({'doi': paper.doi, 'id': co_authors[(i + j) % publication_count].id})
+    session.execute(PaperAuthors.__table__.insert(), rows)
+    session.commit()
+
+
+def measure(func, engine, session):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', count)
+    start = time.perf_counter()
+    result = func('Bench Author', session=session)
+    elapsed = time.perf_counter() - start
+    event.remove(engine, 'before_cursor_execute', count)
+    session.expire_all()
+    return result, len(statements), elapsed
+
+
+def run():
+    print(f"{'publications':>12} | {'legacy queries':>14} | {'legacy ms':>9} | {'queries':>7} | {'ms':>7}")
+    for publication_count in PUBLICATION_COUNTS:
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        seed(session, publication_count)
+
+        legacy, legacy_queries, legacy_time = measure(legacy_get_author_details_from_db, engine, session)
+        current, queries, current_time = measure(get_author_details_from_db, engine, session)
+
+        assert [p['Co-Authors'] for p in legacy['Publications']] == [p['Co-Authors'] for p in current['Publications']]
+        print(f"{publication_count:>12} | {legacy_queries:>14} | {legacy_time * 1000:>9.1f} | {queries:>7} | {current_time * 1000:>7.1f}")
+
+        session.close()
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    run()
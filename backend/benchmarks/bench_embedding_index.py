@@ -0,0 +1,82 @@
+'''Benchmark of nearest-author search over 1k to 1M synthetic 32-dimensional embeddings.
+
+The vectors are drawn around one centre per 100 authors, mimicking the
+communities Node2Vec produces for the author-field graph.
+
+Compares the previous approach (stack every author vector into a new array, score
+them all with target @ all.T and sort a Python list of every author) with
+EmbeddingIndex.search, exact and with the approximate clustered index.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_embedding_index
+'''
+import time
+
+import numpy as np
+
+from backend.app.graph_embeddings import EmbeddingIndex
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DIMENSIONS = 32
+TARGETS = 3
+K = 200
+QUERIES = 20
+N_PROBE = 8
+# the previous approach builds Python lists of every author; skip it where it takes too long
+LEGACY_MAX_SIZE = 100_000
+
+
+def legacy_search(vectors, target_vectors, k):
+    all_embeddings = np.array([vectors[i] for i in range(len(vectors))])
+    similarities = np.array(target_vectors) @ all_embeddings.T
+    mean_similarities = similarities.mean(axis=0)
+    recommendations = [{"Author": i, "Similarity": float(s)} for i, s in enumerate(mean_similarities)]
+    return sorted(recommendations, key=lambda x: -x["Similarity"])[:k]
+
+
+def time_queries(search, queries):
+    start = time.perf_counter()
+    for query in queries:
+        search(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def recall(index, queries, k):
+    found = 0
+    for query in queries:
+        exact = {id for id, _ in index.search(query, k=k)}
+        approximate = {id for id, _ in index.search(query, k=k, approximate=True, n_probe=N_PROBE)}
+        found += len(exact & approximate)
+    return found / (k * len(queries))
+
+
+def run():
+    rng = np.random.default_rng(0)
+    print(f"{'authors':>9} | {'legacy ms':>9} | {'exact ms':>8} | {'approx ms':>9} | {'recall@200':>10} | {'build s':>7}")
+    for size in SIZES:
+        centres = rng.normal(size=(size // 100, DIMENSIONS))
+        vectors = (centres[rng.integers(len(centres), size=size)] + rng.normal(scale=0.3, size=(size, DIMENSIONS))).astype(np.float32)
+        ids = [f"Author: {i}" for i in range(size)]
+        index = EmbeddingIndex(DIMENSIONS)
+        index.add_many(ids, vectors)
+        start = time.perf_counter()
+        index.build_clusters()
+        build_seconds = time.perf_counter() - start
+
+        targets = [rng.choice(size, TARGETS, replace=False) for _ in range(QUERIES)]
+        queries = [index.matrix[t].mean(axis=0) for t in targets]
+
+        legacy_ms = (
+            time_queries(lambda t: legacy_search(vectors, vectors[t], K), targets[:3])
+            if size <= LEGACY_MAX_SIZE else float('nan')
+        )
+        exact_ms = time_queries(lambda q: index.search(q, k=K), queries)
+        approximate_ms = time_queries(lambda q: index.search(q, k=K, approximate=True, n_probe=N_PROBE), queries)
+        print(
+            f"{size:>9} | {legacy_ms:>9.2f} | {exact_ms:>8.2f} | {approximate_ms:>9.2f} | "
+            f"{recall(index, queries[:5], K):>10.2f} | {build_seconds:>7.2f}"
+        )
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,115 @@
+'''Benchmark for the /network co-author graph builder on a synthetic SQLite database.
+
+The researcher has 300 papers with 600 distinct collaborators. Compares the
+previous builder (one query per DOI and per collaborator, stringified ORM rows and
+list-based edge deduplication) with the joined, set-based generatesNodesAndEdges.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_network
+'''
+import random
+import time
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from backend import authorNetworkCode as nw
+from backend.db.models import Base, Paper, PaperAuthors, Researcher
+
+COLLABORATORS = 600
+PAPERS = 300
+AUTHORS_PER_PAPER = 6
+MAX_NODES = [50, 600]
+
+
+def seed(session):
+    rng = random.Random(0)
+    session.execute(insert(Researcher), [
+        {'id': i, 'name': f'Researcher {i}', 'profile_link': f'https://dl.acm.org/profile/{81100000000 + i}'}
+        for i in range(1, COLLABORATORS + 2)
+    ])
+    session.execute(insert(Paper), [{'doi': f'10.1145/{i}', 'title': f'Paper {i}'} for i in range(PAPERS)])
+    paper_authors = []
+    for i in range(PAPERS):
+        # every collaborator appears on at least one paper
+        co_authors = {2 + (i * 2) % COLLABORATORS, 3 + (i * 2) % COLLABORATORS}
+        co_authors.update(rng.sample(range(2, COLLABORATORS + 2), AUTHORS_PER_PAPER - 2))
+        paper_authors.extend({'doi': f'10.1145/{i}', 'id': id} for id in {1} | co_authors)
+    session.execute(insert(PaperAuthors), paper_authors)
+    session.commit()
+
+
+def legacy_nodes_and_edges(id, max_nodes):
+    '''The previous generatesNodesAndEdges, reading through retrieve_formatted_records.'''
+    retrieve = nw.retrieve_formatted_records
+    nodes, edges, ids, idset = [], [], [], set()
+    relevantdois = [record.get('doi') for record in retrieve(PaperAuthors, {'id': id})]
+    for doi in relevantdois:
+        ids.append([entry.get('id') for entry in retrieve(PaperAuthors, {'doi': doi}) if entry.get('id') != str(id)])
+    for element in ids:
+        idset.update(element)
+
+    temp = retrieve(Researcher, {'id': id})[0]
+    nodes.append({"id": temp.get("id"), "name": temp.get("name"), "link": temp.get("profile_link")})
+    for item in idset:
+        if len(nodes) >= max_nodes + 1:
+            break
+        record = retrieve(Researcher, {'id': int(item)})[0]
+        if not any(node['link'] == record.get("profile_link") for node in nodes):
+            nodes.append({"id": record.get("id"), "name": record.get("name"), "link": record.get("profile_link")})
+
+    node_ids = {node['id'] for node in nodes}
+    for lists in ids:
+        for person1 in lists:
+            for person2 in lists:
+                if person1 in node_ids and person2 in node_ids and person1 != person2:
+                    edge = {"source": person1, "target": person2}
+                    reverse_edge = {"source": person2, "target": person1}
+                    if edge not in edges and reverse_edge not in edges:
+                        edges.append(edge)
+    for lists in ids:
+        for person1 in lists:
+            if person1 in node_ids:
+                edges.append({"source": temp.get("id"), "target": person1})
+    return nodes, edges
+
+
+def timed(build, queries):
+    queries[0] = 0
+    start = time.perf_counter()
+    nodes, edges = build()
+    return time.perf_counter() - start, queries[0], nodes, edges
+
+
+def undirected(edges):
+    return {frozenset((edge['source'], edge['target'])) for edge in edges}
+
+
+def run():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    seed(Session())
+
+    queries = [0]
+    event.listen(engine, 'before_cursor_execute', lambda *args: queries.__setitem__(0, queries[0] + 1))
+
+    print(f"{'builder':<8} | {'max_nodes':>9} | {'queries':>7} | {'nodes':>5} | {'links':>6} | {'seconds':>7}")
+    with patch.object(nw.db_helper, 'get_session', Session):
+        for max_nodes in MAX_NODES:
+            rows = [
+                ('legacy', timed(lambda: legacy_nodes_and_edges(1, max_nodes), queries)),
+                ('joined', timed(lambda: nw.generatesNodesAndEdges(1, max_nodes=max_nodes), queries)),
+            ]
+            (_, (_, _, legacy_nodes, legacy_edges)), (_, (_, _, nodes, edges)) = rows
+            if max_nodes >= COLLABORATORS:
+                # the legacy builder repeats the main author's link once per shared paper
+                assert {node['id'] for node in legacy_nodes} == {node['id'] for node in nodes}
+                assert undirected(legacy_edges) == undirected(edges)
+            for label, (seconds, query_count, nodes, links) in rows:
+                print(f"{label:<8} | {max_nodes:>9} | {query_count:>7} | {len(nodes):>5} | {len(links):>6} | {seconds:>7.3f}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,103 @@
+'''Micro-benchmark of ProgressManager status updates under concurrent writers.
+
+Compares the previous connect/write/commit/close per update with the thread-local
+WAL connection and batched writes. Each writer thread reports the ~8 statuses of
+one author at a time, like the scraper does. The batched timing includes the
+final flush, so every update has reached progress.db.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_progress_manager
+'''
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from backend.app.progress_manager import ProgressManager
+
+WRITER_COUNTS = [1, 4, 16]
+AUTHORS_PER_WRITER = 25
+STATUSES = [
+    "Checking database for existing author...",
+    "Author found in database. Checking for updates...",
+    "Scraping latest publications...",
+    "Fetching author details from database...",
+    "Scraping full author details due to new publication...",
+    "Updating author details in database...",
+    "Generating new summary using LLM...",
+    "Process complete. Author details updated successfully.",
+]
+
+
+class LegacyProgressManager:
+    '''The previous implementation: one connection and commit per update.'''
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE IF NOT EXISTS progress (profile_link TEXT PRIMARY KEY, status TEXT, updated_at TIMESTAMP)")
+        conn.commit()
+        conn.close()
+
+    def update_progress(self, profile_link, status):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("""
+            INSERT INTO progress (profile_link, status, updated_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(profile_link) DO UPDATE SET
+                status=excluded.status,
+                updated_at=excluded.updated_at
+        """, (profile_link, status, datetime.now().isoformat(" ")))
+        conn.commit()
+        conn.close()
+
+    def flush(self):
+        pass
+
+
+def new_progress_manager(db_path):
+    ProgressManager._instance = None
+    ProgressManager._db_path = db_path
+    return ProgressManager()
+
+
+def updates_per_second(manager, writers):
+    def write(writer):
+        for author in range(AUTHORS_PER_WRITER):
+            for status in STATUSES:
+                manager.update_progress(f"{writer}-{author}", status)
+
+    threads = [threading.Thread(target=write, args=(writer,)) for writer in range(writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    manager.flush()
+    elapsed = time.perf_counter() - start
+    return writers * AUTHORS_PER_WRITER * len(STATUSES) / elapsed
+
+
+def run():
+    # the managers print every update; keep the benchmark output readable
+    import builtins
+    print_ = builtins.print
+    builtins.print = lambda *args, **kwargs: None
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for writers in WRITER_COUNTS:
+            legacy = LegacyProgressManager(os.path.join(directory, f"legacy_{writers}.db"))
+            batched = new_progress_manager(os.path.join(directory, f"batched_{writers}.db"))
+            results.append((writers, updates_per_second(legacy, writers), updates_per_second(batched, writers)))
+
+    builtins.print = print_
+    print(f"{'writers':>7} | {'legacy updates/s':>16} | {'batched updates/s':>17} | {'speedup':>7}")
+    for writers, legacy, batched in results:
+        print(f"{writers:>7} | {legacy:>16.0f} | {batched:>17.0f} | {batched / legacy:>6.1f}x")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,112 @@
+'''End-to-end latency of the /recommendations work against a local stub ACM server.
+
+Replays the recorded field search page with a fixed latency and dl.acm.org's rate
+limit, and runs get_acm_recommendations_and_field_authors the way the route did
+before (a new event loop per request, one field fetch at a time, a new aiohttp
+session per field) and the way it does now (the shared AsyncRuntime). The field
+cache is emptied before every request so each one reaches the stub server.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_recommendations
+'''
+import asyncio
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from unittest.mock import patch
+
+import aiohttp
+
+from backend.app import author_recommender, http_client
+from backend.app.async_runtime import AsyncRuntime, HOST_CONCURRENCY
+from backend.app.author_recommender import ACMAuthorSearcher, RecommendationsCache
+from backend.app.http_client import HostRateLimiter, HOST_LIMITS
+from backend.app.search_cache import FieldAuthorCache
+from backend.benchmarks.bench_acm_search import ReplayHandler
+
+REQUESTS = 3
+AUTHORS = [{
+    'Name': 'adriana wilde',
+    'Fields of Study': ['Computing education', 'Human computer interaction (HCI)', 'Visualization',
+                        'Sensor devices and platforms', 'Ubiquitous computing']
+}]
+
+
+class LegacySearcher(ACMAuthorSearcher):
+    '''One fetch at a time behind an asyncio.Semaphore(1) and a new session per field.'''
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.semaphore = asyncio.Semaphore(1)
+
+    async def fetch_page(self, session, field_name, page_number):
+        async with self.semaphore:
+            return await super().fetch_page(session, field_name, page_number)
+
+    async def scrape_field(self, field_name, pages_to_fetch=1):
+        async with aiohttp.ClientSession() as session:
+            pages = await asyncio.gather(*(
+                self.fetch_page(session, field_name, page) for page in range(1, pages_to_fetch + 1)
+            ))
+        return [author for content in pages if content for author in self.parse_authors(content)]
+
+
+def legacy_request():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    return loop.run_until_complete(author_recommender.get_acm_recommendations_and_field_authors(AUTHORS))
+
+
+def time_requests(searcher_class, make_request):
+    timings = []
+    for _ in range(REQUESTS):
+        # start every request cold: full rate limit bucket, empty caches
+        http_client.rate_limiter = HostRateLimiter(host_limits={'127.0.0.1': HOST_LIMITS['dl.acm.org']})
+        with patch.object(author_recommender, 'ACMAuthorSearcher', searcher_class), \
+                patch.object(author_recommender, 'field_author_cache', FieldAuthorCache()), \
+                patch.object(author_recommender, 'recommendations_cache', RecommendationsCache()):
+            start = time.perf_counter()
+            result = make_request()
+            timings.append(time.perf_counter() - start)
+        assert result and result["Authors by Weighted Fields"]
+    return sum(timings) / len(timings)
+
+
+def run():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), ReplayHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    server_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+
+    runtime = AsyncRuntime(host_concurrency={'127.0.0.1': HOST_CONCURRENCY['dl.acm.org']})
+
+    class StubSearcher(ACMAuthorSearcher):
+        base_url = server_url
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, runtime=runtime, **kwargs)
+
+    # only used for its per-host slots; each legacy request runs on its own loop
+    legacy_runtime = AsyncRuntime(host_concurrency={'127.0.0.1': HOST_CONCURRENCY['dl.acm.org']})
+
+    class LegacyStubSearcher(LegacySearcher):
+        base_url = server_url
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, runtime=legacy_runtime, **kwargs)
+
+    legacy = time_requests(LegacyStubSearcher, legacy_request)
+    current = time_requests(
+        StubSearcher,
+        lambda: runtime.run(author_recommender.get_acm_recommendations_and_field_authors(AUTHORS))
+    )
+
+    print(f"{'':<28} | {'mean latency s':>14}")
+    print(f"{'new loop + Semaphore(1)':<28} | {legacy:>14.2f}")
+    print(f"{'shared AsyncRuntime':<28} | {current:>14.2f}")
+
+    runtime.shutdown()
+    httpd.shutdown()
+
+
+if __name__ == '__main__':
+    run()
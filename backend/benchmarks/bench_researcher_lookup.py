@@ -0,0 +1,66 @@
+'''Benchmark for indexed Researcher lookups on a synthetic 100k-researcher SQLite database.
+
+Compares the previous func.lower(name) and profile_link.like() filters with the
+indexed normalized_name and profile_id columns.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_researcher_lookup
+'''
+import random
+import time
+
+from sqlalchemy import create_engine, func, insert
+from sqlalchemy.orm import sessionmaker
+
+from backend.db.models import Base, Researcher, normalize_name, extract_profile_id
+
+RESEARCHER_COUNT = 100_000
+LOOKUPS = 200
+
+
+def seed(session):
+    rows = [
+        {'name': f'Researcher {i} Example', 'profile_link': f'https://dl.acm.org/profile/{81100000000 + i}'}
+        for i in range(RESEARCHER_COUNT)
+    ]
+    session.execute(insert(Researcher), rows)
+    session.commit()
+    return rows
+
+
+def time_lookups(session, build_filter, values):
+    start = time.perf_counter()
+    for value in values:
+        assert session.query(Researcher.id).filter(build_filter(value)).first() is not None
+    return (time.perf_counter() - start) / len(values) * 1000
+
+
+def run():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    start = time.perf_counter()
+    rows = seed(session)
+    print(f"Seeded {RESEARCHER_COUNT} researchers in {time.perf_counter() - start:.1f}s")
+
+    sample = random.Random(0).sample(rows, LOOKUPS)
+    names = [row['name'].upper() for row in sample]
+    links = [row['profile_link'] for row in sample]
+
+    cases = [
+        ('name: func.lower(name)', lambda name: func.lower(Researcher.name) == func.lower(name), names),
+        ('name: normalized_name', lambda name: Researcher.normalized_name == normalize_name(name), names),
+        ('link: profile_link.like', lambda link: Researcher.profile_link.like(link), links),
+        ('link: profile_id', lambda link: Researcher.profile_id == extract_profile_id(link), links),
+    ]
+    print(f"{'lookup':<26} | {'ms/lookup':>9}")
+    for label, build_filter, values in cases:
+        print(f"{label:<26} | {time_lookups(session, build_filter, values):>9.3f}")
+
+    session.close()
+    engine.dispose()
+
+
+if __name__ == '__main__':
+    run()
@@ -1,10 +1,10 @@
 import os
 from datetime import datetime
-from sqlalchemy import create_engine, func
-from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy import and_, create_engine, extract, func, insert, select, update
+from sqlalchemy.orm import aliased, sessionmaker, scoped_session
 from sqlalchemy.exc import SQLAlchemyError
 from dotenv import load_dotenv
-from backend.db.models import Researcher, Paper, PaperAuthors, Fields_of_Study, ResearcherFieldsOfStudy, MaxPagesCache
+from backend.db.models import Researcher, Paper, PaperAuthors, Fields_of_Study, ResearcherFieldsOfStudy, MaxPagesCache, NetworkVersion, normalize_name, extract_profile_id
 
 # Load environment variables
 base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -138,73 +138,64 @@ def convert_date_string(date_str):
     except ValueError:
         return None
 
+# Researcher lookups go through the indexed normalized_name and profile_id columns
+def _researcher_name_filter(author_name):
+    return Researcher.normalized_name == normalize_name(author_name)
+
+def _researcher_profile_filter(profile_link):
+    profile_id = extract_profile_id(profile_link)
+    if profile_id:
+        return Researcher.profile_id == profile_id
+    if profile_link is None:
+        return Researcher.profile_link.is_(None)
+    return Researcher.profile_link == profile_link
+
+# Largest IN-list sent in a single statement, well below SQL Server's 2100 parameter limit
+IN_CLAUSE_CHUNK_SIZE = 1000
+
+def _chunks(values, size=IN_CLAUSE_CHUNK_SIZE):
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+NETWORK_VERSION_ID = 1
+
+def bump_network_version(session):
+    '''Increment the collaboration network version as part of the session's transaction.
+    Call it last before committing, so the counter row stays locked only for the commit.
+    The row is seeded by migrate_network_version.py and never inserted here.'''
+    bumped = session.execute(
+        update(NetworkVersion)
+        .where(NetworkVersion.id == NETWORK_VERSION_ID)
+        .values(version=NetworkVersion.version + 1)
+    ).rowcount
+    if not bumped:
+        print("[DEBUG] Network version row is missing, run backend/db/migrate_network_version.py")
+
+def get_network_version(session):
+    '''Current collaboration network version, changed by every write to the collaboration data'''
+    version = session.query(NetworkVersion.version).filter(NetworkVersion.id == NETWORK_VERSION_ID).scalar()
+    return version or 0
+
 # Function to store author details from JSON
-def store_author_details_in_db(author_details, session=None):
+def store_author_details_in_db(author_details, session=None, bulk=True):
     if not session:
         session = get_session()
 
     try:
-        primary_author_name = author_details['Name']
-        primary_author_profile_link = author_details.get('Profile Link', None)
-        fields_of_study = author_details.get('Fields of Study', [])
-        publications = author_details.get('Publications', [])
-
-        primary_author = session.query(Researcher).filter_by(profile_link=primary_author_profile_link).first()
-        if not primary_author:
-            primary_author = Researcher(name=primary_author_name, profile_link=primary_author_profile_link)
-            session.add(primary_author)
-            session.flush()
-
-        for field_name in fields_of_study:
-            field = session.query(Fields_of_Study).filter_by(field_name=field_name).first()
-            if not field:
-                field = Fields_of_Study(field_name=field_name)
-                session.add(field)
-                session.flush()
-            if field not in primary_author.fields_of_study:
-                primary_author.fields_of_study.append(field)
-
-        for pub in publications:
+        if bulk:
             try:
-                publication = session.query(Paper).filter_by(doi=pub['DOI']).first()
-                if not publication:
-                    publication = Paper(
-                        doi=pub['DOI'],
-                        title=pub['Title'],
-                        abstract=pub.get('Abstract', None),
-                        publication_date=convert_date_string(pub.get('Publication Date')),
-                        citations=pub.get('Citation Count', 0),
-                    )
-                    session.add(publication)
-                    session.flush()
-                else:
-                    publication.title = pub['Title']
-                    publication.abstract = pub.get('Abstract', publication.abstract)
-                    publication.publication_date = convert_date_string(pub.get('Publication Date'))
-                    publication.citations = pub.get('Citation Count', publication.citations)
-
-                if primary_author not in publication.researchers:
-                    publication.researchers.append(primary_author)
-
-                co_authors = pub.get('Co-Authors', [])
-                for co_author in co_authors:
-                    co_author_name = co_author['Name']
-                    co_author_profile_link = co_author.get('Profile Link', None)
-
-                    co_author_entry = session.query(Researcher).filter_by(profile_link=co_author_profile_link).first()
-                    if not co_author_entry:
-                        co_author_entry = Researcher(name=co_author_name, profile_link=co_author_profile_link)
-                        session.add(co_author_entry)
-                        session.flush()
-
-                    if co_author_entry not in publication.researchers:
-                        publication.researchers.append(co_author_entry)
-
-            except Exception as e:
+                _bulk_store_author_details(author_details, session)
+                bump_network_version(session)
+                session.commit()
+                return
+            except SQLAlchemyError as e:
+                # fall back to the row by row path, which isolates failures per publication
                 session.rollback()
-                print(f"Skipping duplicate or problematic publication with DOI {pub['DOI']}: {e}")
-                continue
+                print(f"Bulk ingestion failed for {author_details.get('Name')}, retrying row by row: {e}")
 
+        _store_author_details_per_row(author_details, session)
+        bump_network_version(session)
         session.commit()
 
     except Exception as e:
@@ -214,13 +205,236 @@ def store_author_details_in_db(author_details, session=None):
         session.close()
 
 
+def _store_author_details_per_row(author_details, session):
+    primary_author_name = author_details['Name']
+    primary_author_profile_link = author_details.get('Profile Link', None)
+    fields_of_study = author_details.get('Fields of Study', [])
+    publications = author_details.get('Publications', [])
+
+    primary_author = session.query(Researcher).filter(_researcher_profile_filter(primary_author_profile_link)).first()
+    if not primary_author:
+        primary_author = Researcher(name=primary_author_name, profile_link=primary_author_profile_link)
+        session.add(primary_author)
+        session.flush()
+
+    for field_name in fields_of_study:
+        field = session.query(Fields_of_Study).filter_by(field_name=field_name).first()
+        if not field:
+            field = Fields_of_Study(field_name=field_name)
+            session.add(field)
+            session.flush()
+        if field not in primary_author.fields_of_study:
+            primary_author.fields_of_study.append(field)
+
+    for pub in publications:
+        try:
+            publication = session.query(Paper).filter_by(doi=pub['DOI']).first()
+            if not publication:
+                publication = Paper(
+                    doi=pub['DOI'],
+                    title=pub['Title'],
+                    abstract=pub.get('Abstract', None),
+                    publication_date=convert_date_string(pub.get('Publication Date')),
+                    citations=pub.get('Citation Count', 0),
+                )
+                session.add(publication)
+                session.flush()
+            else:
+                publication.title = pub['Title']
+                publication.abstract = pub.get('Abstract', publication.abstract)
+                publication.publication_date = convert_date_string(pub.get('Publication Date'))
+                publication.citations = pub.get('Citation Count', publication.citations)
+
+            if primary_author not in publication.researchers:
+                publication.researchers.append(primary_author)
+
+            co_authors = pub.get('Co-Authors', [])
+            for co_author in co_authors:
+                co_author_name = co_author['Name']
+                co_author_profile_link = co_author.get('Profile Link', None)
+
+                co_author_entry = session.query(Researcher).filter(_researcher_profile_filter(co_author_profile_link)).first()
+                if not co_author_entry:
+                    co_author_entry = Researcher(name=co_author_name, profile_link=co_author_profile_link)
+                    session.add(co_author_entry)
+                    session.flush()
+
+                if co_author_entry not in publication.researchers:
+                    publication.researchers.append(co_author_entry)
+
+        except Exception as e:
+            session.rollback()
+            print(f"Skipping duplicate or problematic publication with DOI {pub['DOI']}: {e}")
+            continue
+
+
+def _bulk_store_author_details(author_details, session):
+    '''Store author details with a fixed number of set-based statements.
+
+    Existing papers, researchers and fields are pre-loaded by key with IN queries, the
+    missing ones are inserted with executemany-style bulk inserts and all association
+    rows are written in one batch. Publications with malformed data are skipped.'''
+    primary_author_name = author_details['Name']
+    primary_author_profile_link = author_details.get('Profile Link', None)
+    fields_of_study = list(dict.fromkeys(author_details.get('Fields of Study', [])))
+    publications = author_details.get('Publications', [])
+
+    primary_author = session.query(Researcher).filter(_researcher_profile_filter(primary_author_profile_link)).first()
+    if not primary_author:
+        primary_author = Researcher(name=primary_author_name, profile_link=primary_author_profile_link)
+        session.add(primary_author)
+        session.flush()
+
+    if fields_of_study:
+        field_ids = _get_field_ids(session, fields_of_study)
+        missing_fields = [field_name for field_name in fields_of_study if field_name not in field_ids]
+        if missing_fields:
+            session.execute(insert(Fields_of_Study), [{'field_name': field_name} for field_name in missing_fields])
+            field_ids.update(_get_field_ids(session, missing_fields))
+
+        linked_field_ids = {
+            field_id for (field_id,) in session.query(ResearcherFieldsOfStudy.field_id)
+            .filter(ResearcherFieldsOfStudy.id == primary_author.id)
+        }
+        new_field_links = [
+            {'id': primary_author.id, 'field_id': field_ids[field_name]}
+            for field_name in fields_of_study if field_ids[field_name] not in linked_field_ids
+        ]
+        if new_field_links:
+            session.execute(insert(ResearcherFieldsOfStudy), new_field_links)
+
+    papers = {}
+    co_authors_by_doi = {}
+    for pub in publications:
+        try:
+            doi = pub['DOI']
+            paper = {
+                'doi': doi,
+                'title': pub['Title'],
+                'abstract': pub.get('Abstract', None),
+                'publication_date': convert_date_string(pub.get('Publication Date')),
+                'citations': pub.get('Citation Count', 0),
+                'has_abstract': 'Abstract' in pub,
+                'has_citations': 'Citation Count' in pub,
+            }
+            co_authors = [
+                (co_author['Name'], co_author.get('Profile Link', None))
+                for co_author in pub.get('Co-Authors', [])
+            ]
+        except Exception as e:
+            print(f"Skipping duplicate or problematic publication with DOI {pub.get('DOI')}: {e}")
+            continue
+
+        papers[doi] = paper
+        co_authors_by_doi.setdefault(doi, []).extend(co_authors)
+
+    if not papers:
+        return
+
+    existing_papers = {}
+    for chunk in _chunks(papers):
+        for paper in session.query(Paper).filter(Paper.doi.in_(chunk)):
+            existing_papers[paper.doi] = paper
+
+    new_papers = []
+    for doi, values in papers.items():
+        paper = existing_papers.get(doi)
+        if paper is None:
+            new_papers.append({key: values[key] for key in ('doi', 'title', 'abstract', 'publication_date', 'citations')})
+            continue
+        # updates of existing papers are batched by the unit of work on flush
+        paper.title = values['title']
+        paper.publication_date = values['publication_date']
+        if values['has_abstract']:
+            paper.abstract = values['abstract']
+        if values['has_citations']:
+            paper.citations = values['citations']
+    if new_papers:
+        session.execute(insert(Paper), new_papers)
+
+    co_author_ids = _get_or_create_researcher_ids(
+        session, {co_author for co_authors in co_authors_by_doi.values() for co_author in co_authors}
+    )
+
+    authorships = set()
+    for doi, co_authors in co_authors_by_doi.items():
+        authorships.add((doi, primary_author.id))
+        for co_author in co_authors:
+            authorships.add((doi, co_author_ids[_researcher_key(*co_author)]))
+
+    for chunk in _chunks(papers):
+        for row in session.query(PaperAuthors.doi, PaperAuthors.id).filter(PaperAuthors.doi.in_(chunk)):
+            authorships.discard((row.doi, row.id))
+    if authorships:
+        session.execute(insert(PaperAuthors), [{'doi': doi, 'id': researcher_id} for doi, researcher_id in authorships])
+
+
+def _get_field_ids(session, field_names):
+    field_ids = {}
+    for chunk in _chunks(field_names):
+        for field_id, field_name in (
+            session.query(Fields_of_Study.field_id, Fields_of_Study.field_name)
+            .filter(Fields_of_Study.field_name.in_(chunk))
+            .order_by(Fields_of_Study.field_id)
+        ):
+            field_ids.setdefault(field_name, field_id)
+    return field_ids
+
+
+def _researcher_key(name, profile_link):
+    # researchers are identified by ACM profile id, or by name when the profile is unknown
+    profile_id = extract_profile_id(profile_link)
+    return ('profile', profile_id) if profile_id else ('name', normalize_name(name))
+
+
+def _get_researcher_ids(session, keys):
+    profile_ids = [value for kind, value in keys if kind == 'profile']
+    names = [value for kind, value in keys if kind == 'name']
+    researcher_ids = {}
+    for chunk in _chunks(profile_ids):
+        for researcher_id, profile_id in (
+            session.query(Researcher.id, Researcher.profile_id)
+            .filter(Researcher.profile_id.in_(chunk))
+            .order_by(Researcher.id)
+        ):
+            researcher_ids.setdefault(('profile', profile_id), researcher_id)
+    for chunk in _chunks(names):
+        for researcher_id, normalized_name in (
+            session.query(Researcher.id, Researcher.normalized_name)
+            .filter(Researcher.profile_id.is_(None), Researcher.normalized_name.in_(chunk))
+            .order_by(Researcher.id)
+        ):
+            researcher_ids.setdefault(('name', normalized_name), researcher_id)
+    return researcher_ids
+
+
+def _get_or_create_researcher_ids(session, co_authors, report=None):
+    '''Map each (name, profile link) pair to a researcher id, bulk inserting unknown researchers.
+
+    When report is given, the inserted researchers are added to its "inserted" count.'''
+    names_by_key = {}
+    for name, profile_link in co_authors:
+        names_by_key.setdefault(_researcher_key(name, profile_link), (name, profile_link))
+
+    researcher_ids = _get_researcher_ids(session, names_by_key)
+    missing = [key for key in names_by_key if key not in researcher_ids]
+    if missing:
+        session.execute(insert(Researcher), [
+            {'name': names_by_key[key][0], 'profile_link': names_by_key[key][1]} for key in missing
+        ])
+        researcher_ids.update(_get_researcher_ids(session, missing))
+        if report is not None:
+            report["inserted"] += len(missing)
+    return researcher_ids
+
+
 # Function to get author details from the database
 def get_author_details_from_db(author_name, session=None):
     if session is None:
         session = get_session()
 
     try:
-        researcher = session.query(Researcher).filter(Researcher.name == author_name).first()
+        researcher = session.query(Researcher).filter(_researcher_name_filter(author_name)).first()
         if not researcher:
             return None
 
@@ -232,14 +446,23 @@ def get_author_details_from_db(author_name, session=None):
             .filter(ResearcherFieldsOfStudy.id == researcher_id).all()
         ]
 
+        papers = session.query(Paper).join(PaperAuthors).filter(PaperAuthors.id == researcher_id).all()
+
+        # fetch the co-authors of every paper in one round trip instead of one query per paper
+        researcher_dois = session.query(PaperAuthors.doi).filter(PaperAuthors.id == researcher_id)
+        co_author_rows = (
+            session.query(PaperAuthors.doi, Researcher.name, Researcher.profile_link)
+            .join(Researcher, Researcher.id == PaperAuthors.id)
+            .filter(PaperAuthors.doi.in_(researcher_dois.scalar_subquery()), Researcher.id != researcher_id)
+            .all()
+        )
+        co_authors_by_doi = {}
+        for doi, name, profile_link in co_author_rows:
+            co_authors_by_doi.setdefault(doi, []).append({"Name": name, "Profile Link": profile_link})
+
         publications = []
-        for paper in session.query(Paper).join(PaperAuthors).filter(PaperAuthors.id == researcher_id).all():
-            co_authors = [
-                {"Name": co_author.name, "Profile Link": co_author.profile_link}
-                for co_author in session.query(Researcher)
-                .join(PaperAuthors, Researcher.id == PaperAuthors.id)
-                .filter(PaperAuthors.doi == paper.doi, Researcher.id != researcher_id).all()
-            ]
+        for paper in papers:
+            co_authors = co_authors_by_doi.get(paper.doi, [])
 
             publication_date = paper.publication_date.strftime("%Y-%m-%d") if isinstance(paper.publication_date, datetime) else str(paper.publication_date)
 
@@ -267,82 +490,158 @@ def get_author_details_from_db(author_name, session=None):
 
 # Function to update author details in the database
 def update_author_details_in_db(author_details, session=None):
+    '''Apply a freshly scraped author payload to the stored state in a single transaction.
+
+    Only paper columns that changed are updated and only missing rows and associations
+    are inserted. Returns a dict with the number of rows inserted, updated and left
+    unchanged, or None if the researcher is not stored or the update failed.'''
     if session is None:
         session = get_session()
 
+    report = {"inserted": 0, "updated": 0, "unchanged": 0}
+
     try:
         author_name = author_details['Name']
         profile_link = author_details.get('Profile Link', None)
-        fields_of_study = author_details.get('Fields of Study', [])
+        fields_of_study = list(dict.fromkeys(author_details.get('Fields of Study', [])))
         publications = author_details.get('Publications', [])
 
-        researcher = session.query(Researcher).filter(func.lower(Researcher.name) == func.lower(author_name)).first()
+        researcher = session.query(Researcher).filter(_researcher_name_filter(author_name)).first()
+        if not researcher:
+            print(f"No researcher found with name: {author_name}")
+            return None
 
-        if researcher:
+        if researcher.profile_link != profile_link:
             researcher.profile_link = profile_link
-            session.commit()
+            report["updated"] += 1
+        else:
+            report["unchanged"] += 1
+
+        _update_researcher_fields(session, researcher, fields_of_study, report)
+
+        papers = {}
+        for pub in publications:
+            papers[pub['DOI']] = {
+                'title': pub['Title'],
+                'publication_date': convert_date_string(pub.get('Publication Date')),
+                'abstract': pub.get('Abstract', 'No abstract available.'),
+                'citations': pub.get('Citation Count', 0),
+                'co_authors': [
+                    (co_author.get("Name"), co_author.get("Profile Link"))
+                    for co_author in pub.get('Co-Authors', []) if co_author.get("Name")
+                ],
+            }
+
+        existing_papers = {}
+        for chunk in _chunks(papers):
+            for paper in session.query(Paper).filter(Paper.doi.in_(chunk)):
+                existing_papers[paper.doi] = paper
+
+        new_papers = []
+        for doi, values in papers.items():
+            paper = existing_papers.get(doi)
+            if paper is None:
+                new_papers.append({
+                    'doi': doi,
+                    'title': values['title'],
+                    'publication_date': values['publication_date'],
+                    'abstract': values['abstract'],
+                    'citations': values['citations'],
+                })
+                continue
 
-            for field in fields_of_study:
-                field_record = session.query(Fields_of_Study).filter(func.lower(Fields_of_Study.field_name) == func.lower(field)).first()
-                if not field_record:
-                    field_record = Fields_of_Study(field_name=field)
-                    session.add(field_record)
-                    session.commit()
-
-                researcher_field_assoc = session.query(ResearcherFieldsOfStudy).filter_by(id=researcher.id, field_id=field_record.field_id).first()
-                if not researcher_field_assoc:
-                    new_researcher_field = ResearcherFieldsOfStudy(id=researcher.id, field_id=field_record.field_id)
-                    session.add(new_researcher_field)
-                    session.commit()
-
-            for pub in publications:
-                doi = pub['DOI']
-                title = pub['Title']
-                pub_date = convert_date_string(pub.get('Publication Date'))
-                abstract = pub.get('Abstract', 'No abstract available.')
-                citation_count = pub.get('Citation Count', 0)
-
-                publication = session.query(Paper).filter_by(doi=doi).first()
-
-                if publication:
-                    publication.title = title
-                    publication.publication_date = pub_date
-                    publication.abstract = abstract
-                    publication.citations = citation_count
-                    session.commit()
-                else:
-                    new_paper = Paper(doi=doi, title=title, publication_date=pub_date, abstract=abstract, citations=citation_count)
-                    session.add(new_paper)
-                    session.commit()
-                    new_author_assoc = PaperAuthors(doi=doi, id=researcher.id)
-                    session.add(new_author_assoc)
-                    session.commit()
-
-                for co_author in pub.get('Co-Authors', []):
-                    co_author_name = co_author.get("Name")
-                    co_author_profile_link = co_author.get("Profile Link")
-
-                    if co_author_name:
-                        co_author_record = session.query(Researcher).filter(func.lower(Researcher.name) == func.lower(co_author_name)).first()
-                        if not co_author_record:
-                            co_author_record = Researcher(name=co_author_name, profile_link=co_author_profile_link)
-                            session.add(co_author_record)
-                            session.commit()
-
-                        paper_author_assoc = session.query(PaperAuthors).filter_by(doi=doi, id=co_author_record.id).first()
-                        if not paper_author_assoc:
-                            new_paper_author = PaperAuthors(doi=doi, id=co_author_record.id)
-                            session.add(new_paper_author)
-                            session.commit()
+            changed = False
+            for column in ('title', 'publication_date', 'abstract', 'citations'):
+                if not _same_value(getattr(paper, column), values[column]):
+                    setattr(paper, column, values[column])
+                    changed = True
+            report["updated" if changed else "unchanged"] += 1
+
+        if new_papers:
+            session.execute(insert(Paper), new_papers)
+            report["inserted"] += len(new_papers)
+
+        # co-authors are keyed like on ingestion: by profile id, else by normalized name
+        co_author_ids = _get_or_create_researcher_ids(
+            session, {co_author for values in papers.values() for co_author in values['co_authors']}, report
+        )
+
+        authorships = set()
+        for doi, values in papers.items():
+            authorships.add((doi, researcher.id))
+            for co_author in values['co_authors']:
+                authorships.add((doi, co_author_ids[_researcher_key(*co_author)]))
+
+        for chunk in _chunks(papers):
+            for row in session.query(PaperAuthors.doi, PaperAuthors.id).filter(PaperAuthors.doi.in_(chunk)):
+                if (row.doi, row.id) in authorships:
+                    authorships.discard((row.doi, row.id))
+                    report["unchanged"] += 1
+        if authorships:
+            session.execute(insert(PaperAuthors), [{'doi': doi, 'id': researcher_id} for doi, researcher_id in authorships])
+            report["inserted"] += len(authorships)
+
+        if report["inserted"] or report["updated"]:
+            bump_network_version(session)
+        session.commit()
+        print(f"Updated author details for {author_name}: {report}")
+        return report
 
     except SQLAlchemyError as e:
         session.rollback()
         print(f"Error updating author details: {e}")
+        return None
     finally:
         if session is not None:
             session.close()
 
 
+def _same_value(stored, scraped):
+    # Date columns load as dates while convert_date_string produces datetimes
+    if isinstance(scraped, datetime) and not isinstance(stored, datetime) and stored is not None:
+        scraped = scraped.date()
+    return stored == scraped
+
+
+def _update_researcher_fields(session, researcher, fields_of_study, report):
+    if not fields_of_study:
+        return
+
+    field_ids = _get_field_ids_by_lower_name(session, [field.lower() for field in fields_of_study])
+    missing_fields = {}
+    for field in fields_of_study:
+        if field.lower() not in field_ids:
+            missing_fields.setdefault(field.lower(), field)
+    if missing_fields:
+        session.execute(insert(Fields_of_Study), [{'field_name': field} for field in missing_fields.values()])
+        field_ids.update(_get_field_ids_by_lower_name(session, list(missing_fields)))
+        report["inserted"] += len(missing_fields)
+
+    linked_field_ids = {
+        field_id for (field_id,) in session.query(ResearcherFieldsOfStudy.field_id)
+        .filter(ResearcherFieldsOfStudy.id == researcher.id)
+    }
+    wanted_field_ids = {field_ids[field.lower()] for field in fields_of_study}
+    new_field_ids = wanted_field_ids - linked_field_ids
+    if new_field_ids:
+        session.execute(insert(ResearcherFieldsOfStudy), [
+            {'id': researcher.id, 'field_id': field_id} for field_id in new_field_ids
+        ])
+        report["inserted"] += len(new_field_ids)
+    report["unchanged"] += len(wanted_field_ids & linked_field_ids)
+
+
+def _get_field_ids_by_lower_name(session, lowered_names):
+    field_ids = {}
+    for chunk in _chunks(lowered_names):
+        for field_id, lowered_name in (
+            session.query(Fields_of_Study.field_id, func.lower(Fields_of_Study.field_name))
+            .filter(func.lower(Fields_of_Study.field_name).in_(chunk))
+            .order_by(Fields_of_Study.field_id)
+        ):
+            field_ids.setdefault(lowered_name, field_id)
+    return field_ids
+
 
 # Function to delete author details from the database
 def delete_author_details_from_db(author_name, session=None):
@@ -350,12 +649,13 @@ def delete_author_details_from_db(author_name, session=None):
         session = get_session()
 
     try:
-        researcher = session.query(Researcher).filter(func.lower(Researcher.name) == func.lower(author_name)).first()
+        researcher = session.query(Researcher).filter(_researcher_name_filter(author_name)).first()
 
         if researcher:
             session.query(PaperAuthors).filter(PaperAuthors.id == researcher.id).delete()
             session.query(ResearcherFieldsOfStudy).filter(ResearcherFieldsOfStudy.id == researcher.id).delete()
             session.delete(researcher)
+            bump_network_version(session)
             session.commit()
             print(f"Successfully deleted details for researcher: {author_name}")
         else:
@@ -373,7 +673,7 @@ def get_researcher_summary(author_name, session=None):
     if session is None:
         session = get_session()
     try:
-        researcher = session.query(Researcher).filter(func.lower(Researcher.name) == func.lower(author_name)).first()
+        researcher = session.query(Researcher).filter(_researcher_name_filter(author_name)).first()
         if researcher:
             return researcher.summary if researcher.summary else "Summary not available."
         else:
@@ -390,7 +690,7 @@ def update_researcher_summary(author_name, new_summary, session=None):
     if session is None:
         session = get_session()
     try:
-        researcher = session.query(Researcher).filter(func.lower(Researcher.name) == func.lower(author_name)).first()
+        researcher = session.query(Researcher).filter(_researcher_name_filter(author_name)).first()
 
         if researcher:
             researcher.summary = new_summary
@@ -409,7 +709,7 @@ def delete_researcher_summary(author_name, session=None):
     if session is None:
         session = get_session()
     try:
-        researcher = session.query(Researcher).filter(func.lower(Researcher.name) == func.lower(author_name)).first()
+        researcher = session.query(Researcher).filter(_researcher_name_filter(author_name)).first()
 
         if researcher.summary:
             researcher.summary = None
@@ -429,7 +729,7 @@ def get_researcher_by_profile_link(profile_link, session=None):
     if session is None:
         session = get_session()
     try:
-        return session.query(Researcher).filter(Researcher.profile_link.like(profile_link)).first()
+        return session.query(Researcher).filter(_researcher_profile_filter(profile_link)).first()
     except Exception as e:
         print(f"Error while querying researcher by profile link: {e}")
         return None
@@ -496,66 +796,102 @@ def get_latest_authors_with_summaries(limit=6, session=None):
         if session is not None:
             session.close()
 
-def get_author_wrapped(author_name, session=None):
+def _co_author_summary(counts):
+    return [
+        {"Name": name, "Profile Link": profile_link, "Collaboration Count": count}
+        for name, profile_link, count in counts
+    ]
+
+def get_author_wrapped(author_name, by_year=False, session=None):
+    '''Summarize how often the researcher published with each co-author.
+
+    Collaboration counts come from one grouped self-join of Paper_Authors, sorted by
+    the database. With by_year the counts are also bucketed by publication year
+    under "Collaborations By Year", most recent year first.'''
     if session is None:
         session = get_session()
 
     try:
-        researcher = session.query(Researcher).filter(Researcher.name == author_name).first()
-        if not researcher:
-            return None
+        main = aliased(Researcher)
+        own_papers = aliased(PaperAuthors)
+        co_papers = aliased(PaperAuthors)
+        co_author = aliased(Researcher)
+        main_id = (
+            select(Researcher.id)
+            .where(_researcher_name_filter(author_name))
+            .order_by(Researcher.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        collaborations = func.count(func.distinct(own_papers.doi))
+        year = extract('year', Paper.publication_date)
 
-        researcher_id = researcher.id
-        researcher_profile_link = researcher.profile_link
+        columns = [main.name, main.profile_link, co_author.name, func.min(co_author.profile_link), collaborations]
+        group_by = [main.name, main.profile_link, co_author.name]
+        if by_year:
+            columns.append(year)
+            group_by.append(year)
 
-        papers = (
-            session.query(Paper)
-            .join(PaperAuthors)
-            .filter(PaperAuthors.id == researcher_id)
+        # outer joins keep the researcher's row even without papers or co-authors
+        query = (
+            session.query(*columns)
+            .select_from(main)
+            .outerjoin(own_papers, own_papers.id == main.id)
+            .outerjoin(co_papers, and_(co_papers.doi == own_papers.doi, co_papers.id != main.id))
+            # co-authors sharing the researcher's profile link are duplicates of the researcher
+            .outerjoin(co_author, and_(
+                co_author.id == co_papers.id,
+                co_author.profile_link.is_distinct_from(main.profile_link)
+            ))
+        )
+        if by_year:
+            query = query.outerjoin(Paper, Paper.doi == own_papers.doi)
+        rows = (
+            query.filter(main.id == main_id)
+            .group_by(*group_by)
+            .order_by(collaborations.desc(), co_author.name)
             .all()
         )
+        if not rows:
+            return None
 
-        co_author_counts = {}
+        name, profile_link = rows[0][0], rows[0][1]
+        rows = [row for row in rows if row[2] is not None]
 
-        for paper in papers:
-            co_authors = (
-                session.query(Researcher)
-                .join(PaperAuthors, Researcher.id == PaperAuthors.id)
-                .filter(PaperAuthors.doi == paper.doi, Researcher.id != researcher_id)
-                .all()
-            )
+        if not by_year:
+            counts = [(row[2], row[3], row[4]) for row in rows]
+            return {
+                "Author Name": name,
+                "Profile Link": profile_link,
+                "Total Co-Authors": len(counts),
+                "Co-Author Summary": _co_author_summary(counts),
+            }
 
-            for co_author in co_authors:
-                # Skip the author if their profile link matches the main researcher
-                if co_author.profile_link == researcher_profile_link:
-                    continue
-
-                if co_author.name in co_author_counts:
-                    co_author_counts[co_author.name]["count"] += 1
-                else:
-                    co_author_counts[co_author.name] = {
-                        "count": 1,
-                        "profile_link": co_author.profile_link
-                    }
-
-        wrapped_data = {
-            "Author Name": researcher.name,
-            "Profile Link": researcher.profile_link,
-            "Total Co-Authors": len(co_author_counts),
-            "Co-Author Summary": [
+        totals = {}
+        years = {}
+        for _, _, co_author_name, co_author_link, count, paper_year in rows:
+            total = totals.setdefault(co_author_name, [co_author_name, co_author_link, 0])
+            total[2] += count
+            years.setdefault(paper_year, []).append((co_author_name, co_author_link, count))
+
+        counts = sorted(totals.values(), key=lambda total: (-total[2], total[0]))
+        return {
+            "Author Name": name,
+            "Profile Link": profile_link,
+            "Total Co-Authors": len(counts),
+            "Co-Author Summary": _co_author_summary(counts),
+            "Collaborations By Year": [
                 {
-                    "Name": co_author,
-                    "Profile Link": details["profile_link"],
-                    "Collaboration Count": details["count"]
+                    "Year": paper_year,
+                    "Total Co-Authors": len(years[paper_year]),
+                    "Co-Author Summary": _co_author_summary(years[paper_year]),
                 }
-                for co_author, details in sorted(
-                    co_author_counts.items(), key=lambda item: item[1]["count"], reverse=True
-                )
+                # papers without a publication date come last
+                for paper_year in sorted(years, key=lambda y: (y is None, -(y or 0)))
             ],
         }
-
-        return wrapped_data
     except Exception as e:
         print(f"Error retrieving author wrapped details: {e}")
         return None
-
+    finally:
+        session.close()
@@ -0,0 +1,26 @@
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.db.models import NetworkVersion
+from backend.db.db_helper import NETWORK_VERSION_ID
+
+
+def migrate(engine):
+    '''Create the Network_Version table and its single counter row.'''
+    try:
+        NetworkVersion.__table__.create(bind=engine, checkfirst=True)
+        with engine.begin() as conn:
+            exists = conn.execute(
+                NetworkVersion.__table__.select().where(NetworkVersion.id == NETWORK_VERSION_ID)
+            ).first()
+            if exists is None:
+                conn.execute(NetworkVersion.__table__.insert().values(id=NETWORK_VERSION_ID, version=0))
+        print("Network version table migrated successfully.")
+    except SQLAlchemyError as e:
+        print(f"Error migrating network version table: {e}")
+        raise
+
+
+# Example usage
+if __name__ == "__main__":
+    from backend.db.db_helper import engine
+    migrate(engine)
@@ -0,0 +1,80 @@
+from sqlalchemy import inspect, select, update, bindparam
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.schema import CreateColumn
+
+from backend.db.models import Researcher, normalize_name, extract_profile_id
+
+BATCH_SIZE = 1000
+LOOKUP_COLUMNS = [Researcher.__table__.c.normalized_name, Researcher.__table__.c.profile_id]
+
+
+def add_lookup_columns(engine):
+    '''Add the normalized_name and profile_id columns to an existing Researcher table.'''
+    existing = {column['name'] for column in inspect(engine).get_columns(Researcher.__tablename__)}
+    with engine.begin() as conn:
+        for column in LOOKUP_COLUMNS:
+            if column.name in existing:
+                continue
+            column_ddl = CreateColumn(column).compile(dialect=engine.dialect)
+            conn.exec_driver_sql(f"ALTER TABLE {Researcher.__tablename__} ADD {column_ddl}")
+            print(f"Added column: {column.name}")
+
+
+def backfill_lookup_columns(engine, batch_size=BATCH_SIZE):
+    '''Populate the lookup columns of every researcher in batches, returning the number of rows updated.'''
+    table = Researcher.__table__
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam('researcher_id'))
+        .values(normalized_name=bindparam('new_normalized_name'), profile_id=bindparam('new_profile_id'))
+    )
+
+    updated = 0
+    last_id = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(table.c.id, table.c.name, table.c.profile_link)
+                .where(table.c.id > last_id)
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            conn.execute(statement, [
+                {
+                    'researcher_id': researcher_id,
+                    'new_normalized_name': normalize_name(name),
+                    'new_profile_id': extract_profile_id(profile_link),
+                }
+                for researcher_id, name, profile_link in rows
+            ])
+        updated += len(rows)
+        last_id = rows[-1][0]
+        print(f"Backfilled {updated} researchers")
+
+    return updated
+
+
+def create_lookup_indexes(engine):
+    for index in Researcher.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+        print(f"Ensured index: {index.name}")
+
+
+def migrate(engine):
+    try:
+        add_lookup_columns(engine)
+        backfill_lookup_columns(engine)
+        create_lookup_indexes(engine)
+        print("Researcher lookup columns migrated successfully.")
+    except SQLAlchemyError as e:
+        print(f"Error migrating researcher lookup columns: {e}")
+        raise
+
+
+# Example usage
+if __name__ == "__main__":
+    from backend.db.db_helper import engine
+    migrate(engine)
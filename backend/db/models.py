@@ -1,21 +1,70 @@
+import re
 from datetime import datetime
 from enum import IntEnum
 
 from sqlalchemy import Column, String, Integer, ForeignKey, Date
-from sqlalchemy.orm import relationship, declarative_base
+from sqlalchemy.orm import relationship, declarative_base, validates
 
 Base = declarative_base()
 
+# Lookup columns must have a bounded length, SQL Server cannot index NVARCHAR(max)
+NORMALIZED_NAME_LENGTH = 255
+PROFILE_ID_LENGTH = 32
+
+def normalize_name(name):
+    '''Case-folded, whitespace-collapsed form of a name used for indexed lookups'''
+    if name is None:
+        return None
+    return ' '.join(name.split()).lower()[:NORMALIZED_NAME_LENGTH]
+
+def extract_profile_id(profile_link):
+    '''Numeric ACM profile id of a profile link, or None if the link is not an ACM profile'''
+    if not profile_link:
+        return None
+    match = re.search(r"profile/(\d+)", profile_link)
+    return match.group(1) if match else None
+
+def with_lookup_columns(values):
+    '''Copy of Researcher column values with normalized_name and profile_id derived from name and profile_link.
+
+    ORM attribute sets keep the lookup columns current through the Researcher validator;
+    Core update(Researcher) statements must pass their values through this.'''
+    values = dict(values)
+    if 'name' in values:
+        values['normalized_name'] = normalize_name(values['name'])
+    if 'profile_link' in values:
+        values['profile_id'] = extract_profile_id(values['profile_link'])
+    return values
+
+def _derived_from(source, derive):
+    # column default computing a lookup column from another value of the inserted row,
+    # so Core and bulk inserts are covered as well as ORM objects
+    def default(context):
+        return derive(context.get_current_parameters().get(source))
+    return default
+
 class Researcher(Base):
     __tablename__ = 'Researcher'
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String, nullable=True)
     profile_link = Column(String, nullable=True)
     summary = Column(String, nullable=True)
+    normalized_name = Column(String(NORMALIZED_NAME_LENGTH), nullable=True, index=True,
+                             default=_derived_from('name', normalize_name))
+    profile_id = Column(String(PROFILE_ID_LENGTH), nullable=True, index=True,
+                        default=_derived_from('profile_link', extract_profile_id))
 
     papers = relationship('Paper', secondary='Paper_Authors', back_populates='researchers')
     fields_of_study = relationship('Fields_of_Study', secondary='Researcher_Fields_of_Study', back_populates='researchers')
 
+    @validates('name', 'profile_link')
+    def _update_lookup_columns(self, key, value):
+        if key == 'name':
+            self.normalized_name = normalize_name(value)
+        else:
+            self.profile_id = extract_profile_id(value)
+        return value
+
 class Paper(Base):
     __tablename__ = 'Paper'
     doi = Column(String, primary_key=True, unique=True, nullable=False)
@@ -50,6 +99,13 @@ class MaxPagesCache(Base):
     date_created = Column(Date, default=datetime.utcnow)
     max_pages = Column(Integer, nullable=True)
 
+class NetworkVersion(Base):
+    # single row counter bumped by every write to the collaboration data,
+    # so cached networks can be validated with one primary key lookup
+    __tablename__ = 'Network_Version'
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(Integer, nullable=False, default=0)
+
 class EmailAccess(Base):
     __tablename__ = 'Email_Access'
     email = Column(String, primary_key=True)
@@ -8,6 +8,7 @@ load_dotenv(env_path)
 
 azure_openai_endpoint = os.getenv('AZURE_OPENAI_ENDPOINT')
 azure_openai_key_key = os.getenv('AZURE_OPENAI_KEY')
-azure_api_version = os.getenv('AZURE_API_VERSION', '2023-07-01-preview')
+# tool calls need 2023-12-01-preview or later
+azure_api_version = os.getenv('AZURE_API_VERSION', '2024-02-15-preview')
 azure_openai_deployment_name = os.getenv('AZURE_OPENAI_DEPLOYMENT_NAME')
 #serpapi_key = os.getenv("SERPAPI_KEY")
\ No newline at end of file
@@ -1,7 +1,9 @@
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Callable, List, Dict
 
+import httpx
 from openai import AzureOpenAI
 
 from backend.llm.core.parser import FunctionDefinitionParser
@@ -9,15 +11,31 @@ from backend.llm.core.parser import FunctionDefinitionParser
 # Configure logger for better debugging and monitoring
 logger = logging.getLogger(__name__)
 
+# Model turns that may call tools before the final answer is requested
+MAX_TOOL_ROUNDS = 4
+
 
 class AzureOpenAIFunctions:
+    """Function-calling assistant backed by one Azure OpenAI client.
+
+    The client and its connection pool are shared, but every ask() keeps its tool
+    results in its own list, so one instance can serve concurrent requests.
+
+    With use_tools (the default) functions are offered in the tools format, and all
+    tool calls the model makes in one turn run concurrently on a shared pool of
+    max_tool_workers threads. use_tools=False keeps the legacy single function_call
+    format for API versions that predate tools."""
+
     def __init__(
             self,
             azure_openai_endpoint: str,
             azure_openai_key_key: str,
             azure_api_version: str,
             model: str,
-            functions: Optional[List[Callable]] = None
+            functions: Optional[List[Callable]] = None,
+            http_client: Optional[httpx.Client] = None,
+            use_tools: bool = True,
+            max_tool_workers: int = 8
     ):
         self.azure_openai_endpoint = azure_openai_endpoint
         self.azure_openai_key_key = azure_openai_key_key
@@ -27,11 +45,14 @@ class AzureOpenAIFunctions:
             azure_endpoint=self.azure_openai_endpoint,
             api_key=self.azure_openai_key_key,
             api_version=self.azure_api_version,
+            http_client=http_client,
         )
         self.function_parser = FunctionDefinitionParser()  # Initialize the parser first
         self.functions = self._parse_functions(functions)  # Then use it in _parse_functions
         self.func_mapping = self._create_func_mapping(functions)
-        self.internal_thoughts = []
+        self.use_tools = use_tools
+        self.tools = self._create_tools(self.functions)
+        self.tool_executor = ThreadPoolExecutor(max_workers=max_tool_workers, thread_name_prefix="llm-tool")
 
     def _parse_functions(self, functions: Optional[List[Callable]]) -> Optional[List[Dict]]:
         """Converts the 'python functions' list into a JSON-serializable list."""
@@ -39,6 +60,19 @@ class AzureOpenAIFunctions:
             return None
         return [self.function_parser.convert_function_to_json_schema(func) for func in functions]
 
+    @staticmethod
+    def _create_tools(functions: Optional[List[Dict]]) -> Optional[List[Dict]]:
+        """Wraps the function definitions in the tools format, which expects 'required' inside the parameters."""
+        if not functions:
+            return None
+        tools = []
+        for function in functions:
+            function = dict(function)
+            required = function.pop('required', [])
+            function['parameters'] = {**function.get('parameters', {}), 'required': required}
+            tools.append({'type': 'function', 'function': function})
+        return tools
+
     def _create_func_mapping(self, functions: Optional[List[Callable]]) -> Dict[str, Callable]:
         """Creates a mapping between the function names and function definitions."""
         if functions is None:
@@ -49,7 +83,14 @@ class AzureOpenAIFunctions:
         """Calls the OpenAI API to create a chat completion, using the functions if specified."""
         try:
             logger.debug(f"Creating chat completion with messages: {messages} and use_functions: {use_functions}")
-            if use_functions and self.functions:
+            if use_functions and self.use_tools and self.tools:
+                return self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0,
+                    tools=self.tools
+                )
+            elif use_functions and self.functions:
                 return self.client.chat.completions.create(
                     model=self.model,
                     messages=messages,
@@ -66,30 +107,34 @@ class AzureOpenAIFunctions:
             logger.error(f"Error in creating chat completion with messages: {messages}, error: {e}", exc_info=True)
             raise
 
-    def _generate_response(self, chat_history: List[Dict]):
-        """Generates a response from the OpenAI API."""
+    def _generate_response(self, chat_history: List[Dict], internal_thoughts: List[Dict]):
+        """Generates a response from the OpenAI API, collecting tool results in internal_thoughts."""
         try:
             logger.debug(f"Generating response with chat_history: {chat_history}")
+            rounds = 0
             while True:
-                response = self._create_chat_completion(chat_history + self.internal_thoughts)
+                response = self._create_chat_completion(chat_history + internal_thoughts)
                 finish_reason = response.choices[0].finish_reason
 
-                if finish_reason == 'stop' or len(self.internal_thoughts) > 3:
-                    final_thought = self._final_thought_answer()
+                if finish_reason == 'stop' or rounds >= MAX_TOOL_ROUNDS:
+                    final_thought = self._final_thought_answer(internal_thoughts)
                     final_res = self._create_chat_completion(
                         chat_history + [final_thought],
                         use_functions=False
                     )
                     return final_res
+                elif finish_reason == 'tool_calls':
+                    self._handle_tool_calls(response, internal_thoughts)
                 elif finish_reason == 'function_call':
-                    self._handle_function_call(response)
+                    self._handle_function_call(response, internal_thoughts)
                 else:
                     raise ValueError(f"Unexpected finish reason: {finish_reason}")
+                rounds += 1
         except Exception as e:
             logger.error(f"Error in generating response with chat_history: {chat_history}, error: {e}", exc_info=True)
             raise
 
-    def _handle_function_call(self, response):
+    def _handle_function_call(self, response, internal_thoughts: List[Dict]):
         """Handles when a function is called within the chat."""
         try:
             logger.debug(f"Handling function call with response: {response}")
@@ -104,11 +149,50 @@ class AzureOpenAIFunctions:
 
             result = self._call_function(func_name, args)
             res_msg = {'role': 'function', 'name': func_name, 'content': str(result)}
-            self.internal_thoughts.append(res_msg)
+            internal_thoughts.append(res_msg)
         except Exception as e:
             logger.error(f"Error in handling function call with response: {response}, error: {e}", exc_info=True)
             raise
 
+    def _handle_tool_calls(self, response, internal_thoughts: List[Dict]):
+        """Runs every tool call of one model turn concurrently and records the results in call order."""
+        try:
+            logger.debug(f"Handling tool calls with response: {response}")
+            message = response.choices[0].message
+            tool_calls = message.tool_calls or []
+
+            calls = [(tool_call.function.name, tool_call.function.arguments) for tool_call in tool_calls]
+            # map() yields results in submission order, whatever order the calls finish in
+            results = list(self.tool_executor.map(lambda call: self._call_tool(*call), calls))
+
+            # the assistant turn requesting the calls must precede their results
+            internal_thoughts.append({
+                'role': 'assistant',
+                'content': message.content,
+                'tool_calls': [
+                    {
+                        'id': tool_call.id,
+                        'type': 'function',
+                        'function': {'name': tool_call.function.name, 'arguments': tool_call.function.arguments},
+                    }
+                    for tool_call in tool_calls
+                ],
+            })
+            for tool_call, result in zip(tool_calls, results):
+                internal_thoughts.append({'role': 'tool', 'tool_call_id': tool_call.id, 'content': str(result)})
+        except Exception as e:
+            logger.error(f"Error in handling tool calls with response: {response}, error: {e}", exc_info=True)
+            raise
+
+    def _call_tool(self, func_name: str, args):
+        """Calls one tool of a turn, returning its error as the result so the other calls still complete."""
+        try:
+            if isinstance(args, str):
+                args = json.loads(args) if args else {}
+            return self._call_function(func_name, args)
+        except Exception as e:
+            return json.dumps({"error": str(e)})
+
     def _call_function(self, func_name: str, args: Dict):
         """Calls the actual function when invoked in _handle_function_call."""
         try:
@@ -124,10 +208,12 @@ class AzureOpenAIFunctions:
             logger.error(f"Error in calling function {func_name} with arguments: {args}, error: {e}", exc_info=True)
             raise
 
-    def _final_thought_answer(self) -> Dict[str, str]:
+    def _final_thought_answer(self, internal_thoughts: List[Dict]) -> Dict[str, str]:
         """Creates the final thought answer."""
         thoughts = "To answer user queries I will use following information as context. ---CONTEXT START---\n\n"
-        for thought in self.internal_thoughts:
+        for thought in internal_thoughts:
+            if 'tool_calls' in thought.keys():
+                continue
             if 'function_call' in thought.keys():
                 thoughts += (f"I will use the {thought['function_call']['name']} "
                              "function to calculate the answer with arguments "
@@ -145,7 +231,8 @@ class AzureOpenAIFunctions:
 
     def ask(self, messages: List[Dict]):
         """Asks a question to the OpenAI API. The main method to interact with the OpenAI GPT-4 model."""
-        self.internal_thoughts = []
+        # per-call state: concurrent calls must not see each other's tool results
+        internal_thoughts = []
         chat_history = messages
-        response = self._generate_response(chat_history)
+        response = self._generate_response(chat_history, internal_thoughts)
         return response
\ No newline at end of file
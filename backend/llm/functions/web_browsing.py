@@ -1,10 +1,10 @@
 import json
 
 from functions.duck_duck_go_search import DuckDuckGoSearchManager
-from functions.web_scraper import WebContentScraper
+from functions.web_scraper import PageContentCache, WebContentScraper
 
 ddg = DuckDuckGoSearchManager()
-scraper = WebContentScraper()
+scraper = WebContentScraper(cache=PageContentCache())
 
 
 def text_search(query: str, num_results: int = 7) -> str:
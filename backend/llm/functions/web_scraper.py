@@ -1,30 +1,248 @@
+import codecs
 import json
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from html.parser import HTMLParser
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
 
 # Configure logging
 logging = logging.getLogger(__name__)
 
+# Words of paragraph text kept per page, which keeps tool results and prompts bounded
+DEFAULT_MAX_TOKENS = 2000
+
+_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+class _ParagraphHTMLParser(HTMLParser):
+    """Standard library fallback for ParagraphExtractor when lxml is not installed."""
+
+    def __init__(self, on_paragraph):
+        super().__init__(convert_charrefs=True)
+        self.on_paragraph = on_paragraph
+        self.parts = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'p':
+            # an unclosed <p> ends where the next one starts
+            self.handle_endtag('p')
+            self.parts = []
+
+    def handle_endtag(self, tag):
+        if tag == 'p' and self.parts is not None:
+            self.on_paragraph(''.join(self.parts))
+            self.parts = None
+
+    def handle_data(self, data):
+        if self.parts is not None:
+            self.parts.append(data)
+
+
+class ParagraphExtractor:
+    """Extracts the text of <p> elements from HTML fed in chunks as it is downloaded.
+
+    Uses lxml's incremental HTML parser when it is installed, discarding elements as
+    soon as they are closed, and html.parser otherwise. Collection stops once
+    max_tokens whitespace-separated words have been kept; feed() then returns True
+    so the caller can stop downloading. Bytes are decoded with encoding, else the
+    charset declared by a <meta> tag in the first 2 KB, else UTF-8."""
+
+    def __init__(self, max_tokens=DEFAULT_MAX_TOKENS, encoding=None):
+        self.max_tokens = max_tokens
+        self.encoding = encoding
+        self.paragraphs = []
+        self.tokens = 0
+        self.done = False
+        self._decoder = None
+        self._head = b''
+        self._open_paragraphs = 0
+        if etree is not None:
+            self._parser = etree.HTMLPullParser(events=('start', 'end'))
+        else:
+            self._parser = _ParagraphHTMLParser(self._add_paragraph)
+
+    def _decode(self, data, final=False):
+        if self._decoder is None:
+            # hold back the start of the page until the <meta> charset can be seen
+            data = self._head + data
+            if self.encoding is None and len(data) < 2048 and not final:
+                self._head = data
+                return ''
+            encoding = self.encoding
+            if encoding is None:
+                match = _CHARSET_PATTERN.search(data[:2048])
+                encoding = match.group(1).decode('ascii') if match else 'utf-8'
+            try:
+                self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            except LookupError:
+                self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        return self._decoder.decode(data, final)
+
+    def _add_paragraph(self, text):
+        if self.done:
+            return
+        text = text.strip()
+        if not text:
+            return
+        if self.max_tokens is not None:
+            words = text.split()
+            remaining = self.max_tokens - self.tokens
+            if len(words) >= remaining:
+                text = ' '.join(words[:remaining])
+                self.done = True
+            self.tokens += min(len(words), remaining)
+        self.paragraphs.append(text)
+
+    def _read_events(self):
+        for event, element in self._parser.read_events():
+            if element.tag == 'p':
+                if event == 'start':
+                    self._open_paragraphs += 1
+                    continue
+                self._open_paragraphs -= 1
+                self._add_paragraph(''.join(element.itertext()))
+            elif event == 'start' or self._open_paragraphs:
+                continue
+            # free everything already read; text inside an open <p> is still needed
+            element.clear(keep_tail=True)
+            parent = element.getparent()
+            while parent is not None and element.getprevious() is not None:
+                del parent[0]
+
+    def feed(self, data):
+        """Parse the next chunk (bytes or str) and return True once the token budget is used up."""
+        if self.done:
+            return True
+        if isinstance(data, bytes):
+            data = self._decode(data)
+        self._parser.feed(data)
+        if etree is not None:
+            self._read_events()
+        return self.done
+
+    def close(self):
+        """Finish parsing and return the paragraph texts joined by newlines."""
+        if not self.done:
+            if self._decoder is not None or self._head:
+                self._parser.feed(self._decode(b'', final=True))
+            if etree is not None:
+                try:
+                    self._parser.close()
+                except etree.XMLSyntaxError:
+                    # nothing was fed
+                    pass
+                self._read_events()
+            else:
+                self._parser.close()
+                self._parser.handle_endtag('p')
+        return "\n".join(self.paragraphs)
+
+
+class PageContentCache:
+    """In-memory LRU cache of parsed page text keyed by URL, with a TTL in seconds."""
+
+    def __init__(self, max_entries=256, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, url):
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is None or time.monotonic() - entry[0] >= self.ttl:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(url)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, url, content):
+        with self.lock:
+            self.entries[url] = (time.monotonic(), content)
+            self.entries.move_to_end(url)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
 
 class WebContentScraper:
-    def __init__(self, user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"):
+    """Fetches web pages for the LLM tools and extracts their paragraph text.
+
+    Pages are fetched through one pooled requests session. scrape_multiple_websites
+    fetches its URLs concurrently on a pool shared by every caller; each URL gets its
+    timeout from when a worker picks it up, and URLs still waiting for a worker after
+    queue_timeout are dropped, so a busy pool does not pass off unfetched pages as slow.
+    Paragraph text is extracted while each page streams in, and the download stops
+    after max_tokens words or max_bytes bytes. Parsed text is kept in cache, when
+    given, so repeated tool calls for a URL do not fetch it again."""
+
+    def __init__(self, user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)", timeout=10,
+                 max_bytes=2 * 1024 * 1024, max_tokens=DEFAULT_MAX_TOKENS, max_workers=8, cache=None):
         self.headers = {"User-Agent": user_agent}
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_tokens = max_tokens
+        self.cache = cache
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="web-scraper")
 
-    def _fetch_page_content(self, url):
-        """Fetches the content of a web page from a given URL.
+    def _fetch_page_text(self, url, deadline=None):
+        """Downloads a web page and extracts its paragraph text while the body streams in.
 
         Parameters:
         - url (str): The URL of the web page to be fetched.
+        - deadline (float): time.monotonic() value after which the download is abandoned. Optional.
 
         Returns:
-        - bytes: The content of the web page in bytes if the request is successful; otherwise, None.
+        - str: The extracted text ('' if the page could not be parsed), or None if the request failed.
+          The download stops early once max_tokens words are extracted or max_bytes are read.
         """
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()  # Raises HTTPError for bad requests
-            return response.content
+            timeout = self.timeout
+            if deadline is not None:
+                timeout = max(0.1, min(timeout, deadline - time.monotonic()))
+            with self.session.get(url, headers=self.headers, timeout=timeout, stream=True) as response:
+                response.raise_for_status()  # Raises HTTPError for bad requests
+                # requests assumes ISO-8859-1 for text/* without a charset, so only trust an explicit one
+                charset = re.search(r'charset=["\']?([\w-]+)', response.headers.get('Content-Type', ''))
+                extractor = ParagraphExtractor(self.max_tokens, charset.group(1) if charset else None)
+                size = 0
+                try:
+                    for chunk in response.iter_content(chunk_size=16 * 1024):
+                        chunk = chunk[:self.max_bytes - size]
+                        size += len(chunk)
+                        if extractor.feed(chunk):
+                            break
+                        if size >= self.max_bytes:
+                            logging.debug(f"Truncated {url} at {self.max_bytes} bytes")
+                            break
+                        if deadline is not None and time.monotonic() > deadline:
+                            raise requests.exceptions.Timeout(f"Deadline exceeded while reading {url}")
+                    return extractor.close()
+                except requests.exceptions.RequestException:
+                    raise
+                except Exception as e:
+                    logging.error(f"Failed to parse the content of {url}: {e}")
+                    return ''
         except requests.exceptions.HTTPError as http_err:
             logging.error(f"HTTP error occurred: {http_err}")
             return None
@@ -37,25 +255,26 @@ class WebContentScraper:
 
         Parameters:
         - content (bytes or str): The HTML content to be parsed. It can be in bytes or
-          a string format. If in bytes, BeautifulSoup will handle the decoding.
+          a string format. Bytes are decoded by ParagraphExtractor.
 
         Returns:
-        - str: A single string containing all the extracted text from paragraph elements,
-          separated by newlines. If parsing fails, returns None.
+        - str: A single string containing the extracted text from paragraph elements,
+          separated by newlines and limited to max_tokens words. If parsing fails, returns None.
         """
         try:
-            soup = BeautifulSoup(content, "html.parser")
-            paragraphs = soup.find_all("p")
-            return "\n".join(paragraph.get_text() for paragraph in paragraphs)
+            extractor = ParagraphExtractor(self.max_tokens)
+            extractor.feed(content)
+            return extractor.close()
         except Exception as e:
             logging.error(f"Failed to parse the content: {e}")
             return None
 
-    def scrape_website(self, url):
+    def scrape_website(self, url, deadline=None):
         """Scrapes the content from a given website URL.
 
         Parameters:
         - url (str): The URL of the website to be scraped.
+        - deadline (float): time.monotonic() value after which the download is abandoned. Optional.
 
         Returns:
         - dict: A dictionary with two keys:
@@ -64,27 +283,60 @@ class WebContentScraper:
             - 'error': An error message, if the scraping process failed at any stage.
         """
         logging.debug(f"Scraping URL: {url}")
-        page_content = self._fetch_page_content(url)
-        if page_content:
-            parsed_content = self._parse_web_content(page_content)
-            if parsed_content:
-                return {"url": url, "content": parsed_content}
-            else:
-                return {"url": url, "error": "Failed to parse content"}
-        return {"url": url, "error": "Failed to fetch page content"}
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached is not None:
+                return {"url": url, "content": cached}
+        parsed_content = self._fetch_page_text(url, deadline)
+        if parsed_content is None:
+            return {"url": url, "error": "Failed to fetch page content"}
+        if not parsed_content:
+            return {"url": url, "error": "Failed to parse content"}
+        if self.cache is not None:
+            self.cache.set(url, parsed_content)
+        return {"url": url, "content": parsed_content}
 
-    def scrape_multiple_websites(self, urls):
-        """Scrapes the content from multiple websites.
+    def scrape_multiple_websites(self, urls, timeout=None, queue_timeout=None):
+        """Scrapes the content from multiple websites concurrently.
 
         Parameters:
         - urls (list of str): A list of URLs of the websites to be scraped.
+        - timeout (float): Seconds each page may take once a worker starts it; defaults to
+          the per-page timeout. Pages still loading after it are reported as timed out. Optional.
+        - queue_timeout (float): Seconds a URL may wait for a free worker; defaults to timeout.
+          URLs not started by then are cancelled and reported as not fetched. Optional.
 
         Returns:
         - str: A JSON-formatted string. Each element in the JSON represents the result
-          of scraping a single URL, containing either the scraped content or an error message.
+          of scraping a single URL, in the order given, containing either the scraped
+          content or an error message.
         """
         try:
-            return json.dumps([self.scrape_website(url) for url in urls], indent=2)
+            timeout = self.timeout if timeout is None else timeout
+            queue_timeout = timeout if queue_timeout is None else queue_timeout
+            started = {}
+
+            def scrape(index, url):
+                started[index] = time.monotonic()
+                return self.scrape_website(url, started[index] + timeout)
+
+            futures = [self.executor.submit(scrape, index, url) for index, url in enumerate(urls)]
+            wait(futures, timeout=queue_timeout)
+            # cancel() only succeeds for URLs no worker has picked up yet
+            queued = [future.cancel() for future in futures]
+
+            results = []
+            for index, (url, future) in enumerate(zip(urls, futures)):
+                if queued[index]:
+                    results.append({"url": url, "error": f"Not fetched: no worker was free within {queue_timeout} seconds"})
+                    continue
+                remaining = started.get(index, time.monotonic()) + timeout - time.monotonic()
+                try:
+                    results.append(future.result(timeout=max(0, remaining)))
+                except FutureTimeoutError:
+                    # the worker gives up on its own once the deadline passes
+                    results.append({"url": url, "error": f"Timed out after {timeout} seconds"})
+            return json.dumps(results, indent=2)
         except Exception as e:
             logging.error(f"Error during scraping multiple websites: {e}")
-            return json.dumps({"error": str(e)})
\ No newline at end of file
+            return json.dumps({"error": str(e)})
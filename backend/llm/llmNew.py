@@ -3,13 +3,16 @@ from datetime import datetime
 from pydantic import BaseModel
 from typing import List
 import sys
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
 from backend.llm.core.azure_functions import AzureOpenAIFunctions
 import backend.llm.config as config
 import backend.llm.functions.web_browsing as browser
+from backend.llm.summary_service import SummaryService
 from backend.db import db_helper
+from backend.db.models import normalize_name
 
 # -- The message schema for the assistant
 class Message(BaseModel):
@@ -34,6 +37,14 @@ assistant = AzureOpenAIFunctions(
     ]
 )
 
+# Generations run here; concurrent requests for the same researcher share one
+summary_service = SummaryService(db_helper.update_researcher_summary, max_workers=4)
+# seconds a scraping job waits for its summary before the job fails
+SUMMARY_TIMEOUT = 300
+
+class SummaryTimeoutError(TimeoutError):
+    '''Raised by request() when no summary arrives within SUMMARY_TIMEOUT seconds'''
+
 def log(response):
     try:
         with open("logfile.txt", 'a', encoding='utf-8') as log_file:
@@ -60,10 +71,11 @@ def load_prompt(prompt):
         return "Error reading prompt file due to encoding issues."
     
 
-def request(author_name):
+def generate_summary(author_name):
+    '''Ask the model for a new summary of the researcher, or return None if they are not in the database.'''
     author = db_helper.get_author_details_from_db(author_name)
     if author is None:
-        return {"reply": "Author not found in the database."}
+        return None
     conversation = Conversation(conversation=[])
     system_message = Message(role='system', content=load_prompt('generate_system_prompt.txt'))
     conversation.conversation.insert(0, system_message)
@@ -73,7 +85,19 @@ def request(author_name):
     response = assistant.ask(conversation_dict)
     summary = response.choices[0].message.content
     log(response)
-    db_helper.update_researcher_summary(author_name, summary)
+    return summary
+
+def request(author_name):
+    '''Generate and store the summary of the researcher, waiting for a generation already in progress if there is one.
+
+    Raises SummaryTimeoutError if no summary arrives within SUMMARY_TIMEOUT seconds.'''
+    try:
+        summary = summary_service.submit(author_name, generate_summary).result(timeout=SUMMARY_TIMEOUT)
+    except FutureTimeoutError as e:
+        raise SummaryTimeoutError(f"Summary generation for {author_name} took longer than {SUMMARY_TIMEOUT} seconds") from e
+    if summary is None:
+        return {"reply": "Author not found in the database."}
+    return summary
 
     
 def create_regeneration_prompt(author_name, json_change_list):
@@ -86,15 +110,24 @@ def create_regeneration_prompt(author_name, json_change_list):
         prompt += "Text to regenerate: " + text_to_change + "\n\nReason for change: " + reason_for_change + "\n\n"
     return prompt
 
-def regenerate_request (author_name, json):
+def regenerate_summary(author_name, json_change_list):
     conversation = Conversation(conversation=[])
     system_message = Message(role='system', content=load_prompt('regenerate_system_prompt.txt'))
     conversation.conversation.insert(0, system_message)
-    json_change_list = json['contentVal']
     prompt_message = Message(role='user', content=create_regeneration_prompt(author_name, json_change_list))
     conversation.conversation.insert(1, prompt_message)
     conversation_dict = [message.model_dump() for message in conversation.conversation]
     response = assistant.ask(conversation_dict)
     regenerated_text = response.choices[0].message.content
     log(response)
-    db_helper.update_researcher_summary(author_name, regenerated_text)
\ No newline at end of file
+    return regenerated_text
+
+def regenerate_request (author_name, json, timeout=None):
+    '''Regenerate and store the summary, waiting at most timeout seconds for it.
+
+    Raises concurrent.futures.TimeoutError if the generation takes longer; it keeps
+    running and its summary is still stored once it finishes.'''
+    json_change_list = json['contentVal']
+    # identical change requests for the same researcher are coalesced too
+    key = (normalize_name(author_name), repr(json_change_list))
+    return summary_service.submit(author_name, regenerate_summary, json_change_list, key=key).result(timeout=timeout)
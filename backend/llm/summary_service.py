@@ -0,0 +1,92 @@
+import threading
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from backend.db.models import normalize_name
+
+
+class SummaryService:
+    '''Runs LLM summary generations on a bounded worker pool.
+
+    Concurrent requests with the same key (by default the normalized researcher
+    name) share one in-flight generation and its Future, so opening the same new
+    author twice only calls the model once. The summary is written with store once
+    per generation; a generation that returns None is not stored.
+
+    Generations with different keys for the same researcher, such as a regeneration
+    and a first-time summary, run one at a time, so each one starts from the summary
+    the previous one stored and the last to be stored is the last to have run.'''
+
+    def __init__(self, store, max_workers=4):
+        self.store = store
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-summary")
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        # normalized name -> [lock, number of generations using it]
+        self.researcher_locks = {}
+        self.generations = 0
+        self.coalesced = 0
+
+    def submit(self, author_name, generate, *args, key=None):
+        '''Return a Future for generate(author_name, *args), joining a running one with the same key.'''
+        if key is None:
+            key = normalize_name(author_name)
+        with self.lock:
+            future = self.in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            future = Future()
+            self.in_flight[key] = future
+            self.generations += 1
+
+        self.executor.submit(self._run, key, future, author_name, generate, args)
+        return future
+
+    def _acquire_researcher(self, author_name):
+        name = normalize_name(author_name)
+        with self.lock:
+            entry = self.researcher_locks.setdefault(name, [threading.Lock(), 0])
+            entry[1] += 1
+        entry[0].acquire()
+        return name
+
+    def _release_researcher(self, name):
+        with self.lock:
+            entry = self.researcher_locks[name]
+            entry[0].release()
+            entry[1] -= 1
+            if not entry[1]:
+                del self.researcher_locks[name]
+
+    def _run(self, key, future, author_name, generate, args):
+        name = self._acquire_researcher(author_name)
+        try:
+            summary = generate(author_name, *args)
+            if summary is not None:
+                self.store(author_name, summary)
+        except Exception as e:
+            traceback.print_exc()
+            result, error = None, e
+        else:
+            result, error = summary, None
+        finally:
+            self._release_researcher(name)
+            # later requests start a new generation rather than reuse this result
+            with self.lock:
+                self.in_flight.pop(key, None)
+
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def stats(self):
+        return {
+            "in_flight": len(self.in_flight),
+            "generations": self.generations,
+            "coalesced": self.coalesced,
+        }
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
@@ -0,0 +1,123 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class StubServer:
+    '''Runs a local HTTP server in a background thread and records the requests it receives.'''
+
+    def __init__(self, handler_class):
+        self.requests = []
+        handler_class.stub = self
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler_class)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive so tests can observe connection reuse
+    protocol_version = 'HTTP/1.1'
+    stub = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'{}')
+
+
+class EchoHandler(JSONHandler):
+    def do_GET(self):
+        self.stub.requests.append((self.path, self.client_address))
+        self.send_json({'path': self.path})
+
+
+class SemanticScholarHandler(JSONHandler):
+    # DOI -> paper JSON returned by the stub; unknown DOIs come back as null
+    papers = {}
+
+    def do_POST(self):
+        if not self.path.startswith('/paper/batch'):
+            self.send_json({'error': 'not found'}, status=404)
+            return
+        ids = self.read_json().get('ids', [])
+        self.stub.requests.append(ids)
+        self.send_json([self.papers.get(paper_id.removeprefix('DOI:')) for paper_id in ids])
+
+
+class OpenAIHandler(JSONHandler):
+    '''Minimal OpenAI-compatible chat completions endpoint, also accepting Azure deployment paths.'''
+    reply = "Stub summary."
+    delay = 0
+
+    def do_POST(self):
+        if not self.path.split('?')[0].endswith('/chat/completions'):
+            self.send_json({'error': 'not found'}, status=404)
+            return
+        body = self.read_json()
+        self.stub.requests.append(body)
+        time.sleep(self.delay)
+        finish_reason, message = self.respond(body)
+        self.send_json({
+            'id': f"chatcmpl-{len(self.stub.requests)}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'stub'),
+            'choices': [{
+                'index': 0,
+                'finish_reason': finish_reason,
+                'message': message,
+            }],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+        })
+
+    def respond(self, body):
+        '''Return (finish_reason, message) for a request; subclasses can answer with function calls.'''
+        return 'stop', {'role': 'assistant', 'content': self.reply}
+
+
+@pytest.fixture
+def semantic_scholar_stub():
+    server = StubServer(SemanticScholarHandler).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def echo_stub():
+    server = StubServer(EchoHandler).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def openai_stub():
+    server = StubServer(OpenAIHandler).start()
+    yield server
+    server.stop()
+    OpenAIHandler.reply = "Stub summary."
+    OpenAIHandler.delay = 0
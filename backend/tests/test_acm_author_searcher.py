@@ -0,0 +1,49 @@
+import re
+import time
+from unittest.mock import patch, MagicMock
+
+from backend.app.acm_author_searcher import ACMAuthorSearcher
+
+PROFILE_URL_PATTERN = re.compile(r"^https://dl\.acm\.org/profile/\d+$")
+
+def people_page(*people):
+    items = ''.join(
+        f'<li class="people__people-list"><div class="name">{name}</div>'
+        f'<a href="/profile/{profile_id}" title="View Profile">View</a></li>'
+        for name, profile_id in people
+    )
+    return f'<ul>{items}</ul>'.encode()
+
+PAGES = {
+    0: people_page(("Adriana Wilde", 1), ("Les Carr", 2)),
+    1: people_page(("Les Carr", 2), ("Elsa Gunter", 3)),
+    2: people_page(("Mark Anderson", 4)),
+}
+
+def fake_get(url, headers=None):
+    page = int(url.rsplit('startPage=', 1)[1])
+    # later pages answer first, so ordering must not depend on completion order
+    time.sleep(0.05 * (len(PAGES) - page))
+    response = MagicMock(status_code=200, content=PAGES[page])
+    return response
+
+@patch('backend.app.acm_author_searcher.http_client.get', side_effect=fake_get)
+def test_fetch_pages_preserves_page_order_and_dedupes(mock_get):
+    searcher = ACMAuthorSearcher()
+
+    results = searcher.fetch_pages("https://dl.acm.org/action/doSearch?AllField=x", {}, PROFILE_URL_PATTERN, False, 0, 3)
+
+    assert [result["Name"] for result in results] == ["Adriana Wilde", "Les Carr", "Elsa Gunter", "Mark Anderson"]
+    assert mock_get.call_count == 3
+    assert searcher.seen_authors == {"Adriana Wilde", "Les Carr", "Elsa Gunter", "Mark Anderson"}
+
+@patch('backend.app.acm_author_searcher.http_client.get')
+def test_failed_page_is_skipped(mock_get):
+    mock_get.side_effect = lambda url, headers=None: (
+        MagicMock(status_code=500) if url.endswith('startPage=1') else fake_get(url)
+    )
+    searcher = ACMAuthorSearcher()
+
+    results = searcher.fetch_pages("https://dl.acm.org/action/doSearch?AllField=x", {}, PROFILE_URL_PATTERN, False, 0, 3)
+
+    assert [result["Name"] for result in results] == ["Adriana Wilde", "Les Carr", "Mark Anderson"]
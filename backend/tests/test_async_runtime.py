@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from conftest import JSONHandler, StubServer
+from backend.app.async_runtime import AsyncRuntime
+
+
+class SlowHandler(JSONHandler):
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        time.sleep(0.1)
+        with cls.lock:
+            cls.in_flight -= 1
+        self.stub.requests.append((self.path, self.client_address))
+        self.send_json({'path': self.path})
+
+
+@pytest.fixture
+def slow_stub():
+    server = StubServer(SlowHandler).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def runtime():
+    runtime = AsyncRuntime(host_concurrency={"127.0.0.1": 2})
+    yield runtime
+    runtime.shutdown()
+
+
+async def fetch(runtime, url):
+    session = await runtime.get_session()
+    async with runtime.host_slot(url):
+        async with session.get(url) as response:
+            return (await response.json())['path']
+
+
+def test_run_uses_one_loop_for_every_calling_thread(runtime):
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        loops = set(executor.map(lambda _: runtime.run(current_loop()), range(8)))
+
+    assert loops == {runtime.loop}
+
+def test_host_concurrency_limit_is_enforced(runtime, slow_stub):
+    async def fetch_all():
+        return await asyncio.gather(*(fetch(runtime, f"{slow_stub.url}/{i}") for i in range(6)))
+
+    start = time.perf_counter()
+    paths = runtime.run(fetch_all())
+    elapsed = time.perf_counter() - start
+
+    assert paths == [f"/{i}" for i in range(6)]
+    assert SlowHandler.max_in_flight == 2
+    # three rounds of two concurrent 100 ms requests
+    assert 0.25 < elapsed < 1.0
+
+def test_session_reuses_connections_across_requests(runtime, slow_stub):
+    for i in range(3):
+        runtime.run(fetch(runtime, f"{slow_stub.url}/{i}"))
+
+    client_ports = {client_address[1] for _, client_address in slow_stub.requests}
+    assert len(client_ports) == 1
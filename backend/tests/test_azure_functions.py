@@ -0,0 +1,151 @@
+import json
+import threading
+import time
+
+import pytest
+from backend.llm.core.azure_functions import AzureOpenAIFunctions
+from conftest import OpenAIHandler, StubServer
+
+
+def lookup(query: str) -> str:
+    """Look up a query.
+
+    :param query: The query to look up.
+    """
+    return f"result for {query}"
+
+
+class ToolCallingHandler(OpenAIHandler):
+    '''Looks up each comma-separated part of the question once, then echoes the context the assistant gathered.
+
+    Requests offering tools get every lookup as a parallel tool call in one turn;
+    requests offering legacy functions get a single function_call.'''
+    delay = 0.02
+
+    def respond(self, body):
+        messages = body['messages']
+        if 'tools' not in body and 'functions' not in body:
+            # the final answer call: reply with the assistant's context message
+            return 'stop', {'role': 'assistant', 'content': messages[-1]['content']}
+        if any(message['role'] in ('function', 'tool') for message in messages):
+            return 'stop', {'role': 'assistant', 'content': 'done'}
+        queries = messages[-1]['content'].split(', ')
+        if 'functions' in body:
+            return 'function_call', {
+                'role': 'assistant',
+                'content': None,
+                'function_call': {'name': 'lookup', 'arguments': json.dumps({'query': queries[0]})},
+            }
+        return 'tool_calls', {
+            'role': 'assistant',
+            'content': None,
+            'tool_calls': [
+                {
+                    'id': f"call_{i}",
+                    'type': 'function',
+                    'function': {'name': 'lookup', 'arguments': json.dumps({'query': query})},
+                }
+                for i, query in enumerate(queries)
+            ],
+        }
+
+
+@pytest.fixture
+def tool_stub():
+    server = StubServer(ToolCallingHandler).start()
+    yield server
+    server.stop()
+
+def make_assistant(url, functions, **kwargs):
+    return AzureOpenAIFunctions(
+        azure_openai_endpoint=url,
+        azure_openai_key_key="test-key",
+        azure_api_version="2024-02-15-preview",
+        model="gpt-4o",
+        functions=functions,
+        **kwargs,
+    )
+
+@pytest.mark.parametrize("use_tools", [True, False])
+def test_concurrent_asks_keep_their_own_tool_results(tool_stub, use_tools):
+    assistant = make_assistant(tool_stub.url, [lookup], use_tools=use_tools)
+    queries = [f"researcher {i}" for i in range(24)]
+    start = threading.Barrier(len(queries))
+    answers = {}
+    errors = []
+
+    def ask(query):
+        start.wait()
+        try:
+            response = assistant.ask([{"role": "user", "content": query}])
+            answers[query] = response.choices[0].message.content
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=ask, args=(query,)) for query in queries]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    for query, answer in answers.items():
+        assert f"result for {query}\n" in answer
+        # no other call's tool result leaked into this conversation
+        assert answer.count("result for ") == 1
+    assert len(answers) == len(queries)
+    # one function call, one follow-up and one final answer per conversation
+    assert len(tool_stub.requests) == 3 * len(queries)
+
+def test_parallel_tool_calls_run_concurrently_and_keep_their_order(tool_stub):
+    def slow_lookup(query: str) -> str:
+        """Look up a query slowly.
+
+        :param query: The query to look up.
+        """
+        # later calls finish first
+        time.sleep(0.6 - 0.2 * int(query[-1]))
+        return f"result for {query}"
+
+    slow_lookup.__name__ = "lookup"
+    assistant = make_assistant(tool_stub.url, [slow_lookup])
+
+    started = time.perf_counter()
+    response = assistant.ask([{"role": "user", "content": "paper 0, paper 1, paper 2"}])
+    elapsed = time.perf_counter() - started
+
+    # run one after another the lookups alone would take 1.2s
+    assert elapsed < 1.0
+    follow_up = tool_stub.requests[1]["messages"]
+    assert [call["id"] for call in follow_up[1]["tool_calls"]] == ["call_0", "call_1", "call_2"]
+    assert [(message["tool_call_id"], message["content"]) for message in follow_up[2:]] == [
+        ("call_0", "result for paper 0"),
+        ("call_1", "result for paper 1"),
+        ("call_2", "result for paper 2"),
+    ]
+    assert "result for paper 0\n\nresult for paper 1\n\nresult for paper 2" in response.choices[0].message.content
+    assert tool_stub.requests[0]["tools"][0]["function"]["parameters"]["required"] == ["query"]
+
+def test_a_failing_tool_call_is_reported_without_failing_the_others(tool_stub):
+    def flaky_lookup(query: str) -> str:
+        """Look up a query, failing for the second one.
+
+        :param query: The query to look up.
+        """
+        if query == "paper 1":
+            raise ConnectionError("profile page unreachable")
+        return f"result for {query}"
+
+    flaky_lookup.__name__ = "lookup"
+    assistant = make_assistant(tool_stub.url, [flaky_lookup])
+
+    response = assistant.ask([{"role": "user", "content": "paper 0, paper 1, paper 2"}])
+
+    follow_up = tool_stub.requests[1]["messages"]
+    assert [json.loads(message["content"]) if message["tool_call_id"] == "call_1" else message["content"]
+            for message in follow_up[2:]] == [
+        "result for paper 0",
+        {"error": "profile page unreachable"},
+        "result for paper 2",
+    ]
+    assert "result for paper 2" in response.choices[0].message.content
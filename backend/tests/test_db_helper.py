@@ -2,6 +2,7 @@ import pytest
 from backend.db.clear_db import clear_all_tables
 from backend.db.models import Base
 from backend.db.db_helper import *
+from backend.db.migrate_network_version import migrate as migrate_network_version
 
 DATABASE_URL = "sqlite:///:memory:"
 
@@ -11,6 +12,7 @@ Session = sessionmaker(bind=engine)
 @pytest.fixture(scope='function')
 def setup_database():
     Base.metadata.create_all(engine)
+    migrate_network_version(engine)
     yield
     Base.metadata.drop_all(engine)
 
@@ -266,3 +268,338 @@ def test_store_and_retrieve_co_authors(setup_database, session):
     assert primary_author_assoc is not None, "Primary author should be associated with the publication."
     assert co_author1_assoc is not None, "Co-author 'Jane Smith' should be associated with the publication."
     assert co_author2_assoc is not None, "Co-author 'Alice Johnson' should be associated with the publication."
+
+def test_get_author_details_groups_co_authors_by_paper(setup_database, session):
+    author_details = {
+        'Name': 'John Doe',
+        'Profile Link': "https://dl.acm.org/profile/1234",
+        'Fields of Study': ['Artificial Intelligence'],
+        'Publications': [
+            {
+                'Title': 'AI Revolution',
+                'DOI': '10.1234/airevolution2023',
+                'Publication Date': '2023-05-01',
+                'Citation Count': 10,
+                'Co-Authors': [
+                    {'Name': 'Jane Smith', 'Profile Link': "https://dl.acm.org/profile/5678"},
+                    {'Name': 'Alice Johnson', 'Profile Link': "https://dl.acm.org/profile/9101"}
+                ]
+            },
+            {
+                'Title': 'Robotics Advancements',
+                'DOI': '10.1234/robotics2024',
+                'Publication Date': '2024-03-01',
+                'Citation Count': 5,
+                'Co-Authors': [{'Name': 'Jane Smith', 'Profile Link': "https://dl.acm.org/profile/5678"}]
+            },
+            {
+                'Title': 'Solo Work',
+                'DOI': '10.1234/solo2022',
+                'Publication Date': '2022-01-01',
+                'Co-Authors': []
+            }
+        ]
+    }
+
+    store_author_details_in_db(author_details, session=session)
+
+    retrieved_details = get_author_details_from_db('John Doe', session=session)
+    co_authors = {
+        pub['DOI']: sorted(co_author['Name'] for co_author in pub['Co-Authors'])
+        for pub in retrieved_details['Publications']
+    }
+
+    assert co_authors == {
+        '10.1234/airevolution2023': ['Alice Johnson', 'Jane Smith'],
+        '10.1234/robotics2024': ['Jane Smith'],
+        '10.1234/solo2022': [],
+    }
+
+def test_bulk_store_is_idempotent_and_skips_bad_publications(setup_database, session):
+    author_details = {
+        'Name': 'John Doe',
+        'Profile Link': "https://dl.acm.org/profile/1234",
+        'Fields of Study': ['Artificial Intelligence', 'Robotics'],
+        'Publications': [
+            {
+                'Title': 'AI Revolution',
+                'DOI': '10.1234/airevolution2023',
+                'Publication Date': '2023-05-01',
+                'Citation Count': 10,
+                'Co-Authors': [
+                    {'Name': 'Jane Smith', 'Profile Link': "https://dl.acm.org/profile/5678"},
+                    {'Name': 'Tom Lee'}
+                ]
+            },
+            {
+                'DOI': '10.1234/missing-title',
+                'Co-Authors': [{'Name': 'Alice Johnson', 'Profile Link': "https://dl.acm.org/profile/9101"}]
+            },
+            {
+                'Title': 'Robotics Advancements',
+                'DOI': '10.1234/robotics2024',
+                'Publication Date': '2024-03-01',
+                'Co-Authors': [{'Name': 'Jane Smith', 'Profile Link': "https://dl.acm.org/profile/5678"}]
+            }
+        ]
+    }
+
+    store_author_details_in_db(author_details, session=session, bulk=True)
+    author_details['Publications'][0]['Citation Count'] = 12
+    store_author_details_in_db(author_details, session=session, bulk=True)
+
+    assert session.query(Researcher).count() == 3
+    assert session.query(Paper).count() == 2
+    assert session.query(PaperAuthors).count() == 5
+    assert session.query(Fields_of_Study).count() == 2
+    assert session.query(ResearcherFieldsOfStudy).count() == 2
+    assert session.query(Paper).filter_by(doi='10.1234/airevolution2023').one().citations == 12
+
+    retrieved_details = get_author_details_from_db('John Doe', session=session)
+    co_authors = {
+        pub['DOI']: sorted(co_author['Name'] for co_author in pub['Co-Authors'])
+        for pub in retrieved_details['Publications']
+    }
+    assert co_authors == {
+        '10.1234/airevolution2023': ['Jane Smith', 'Tom Lee'],
+        '10.1234/robotics2024': ['Jane Smith'],
+    }
+
+def test_update_author_details_reports_row_counts(setup_database, session):
+    author_details = {
+        'Name': 'John Doe',
+        'Profile Link': "https://dl.acm.org/profile/1234",
+        'Fields of Study': ['Artificial Intelligence'],
+        'Publications': [
+            {
+                'Title': 'AI Revolution',
+                'DOI': '10.1234/airevolution2023',
+                'Abstract': 'A groundbreaking paper on AI.',
+                'Publication Date': '2023-05-01',
+                'Citation Count': 10,
+                'Co-Authors': [{'Name': 'Jane Smith'}]
+            }
+        ]
+    }
+    store_author_details_in_db(author_details, session=session)
+
+    report = update_author_details_in_db(author_details, session=session)
+    assert report == {"inserted": 0, "updated": 0, "unchanged": 5}
+
+    author_details['Fields of Study'].append('Robotics')
+    author_details['Publications'][0]['Citation Count'] = 12
+    author_details['Publications'].append({
+        'Title': 'Robotics Advancements',
+        'DOI': '10.1234/robotics2024',
+        'Abstract': 'A new paper on robotics.',
+        'Publication Date': '2024-03-01',
+        'Citation Count': 5,
+        'Co-Authors': [{'Name': 'tom lee'}, {'Name': 'jane smith'}]
+    })
+
+    report = update_author_details_in_db(author_details, session=session)
+    # new field + field link + paper + Tom Lee + three authorships
+    assert report == {"inserted": 7, "updated": 1, "unchanged": 4}
+    assert session.query(Paper).filter_by(doi='10.1234/airevolution2023').one().citations == 12
+    assert session.query(Researcher).count() == 3
+
+def test_researcher_lookups_use_normalized_columns(setup_database, session):
+    researcher = Researcher(name='  John   DOE ', profile_link="https://dl.acm.org/profile/1234", summary='Expert in machine learning')
+    session.add(researcher)
+    session.commit()
+
+    assert researcher.normalized_name == 'john doe'
+    assert researcher.profile_id == '1234'
+    assert get_researcher_summary('john doe', session=session) == 'Expert in machine learning'
+    assert get_researcher_by_profile_link("https://dl.acm.org/profile/1234", session=session).id == researcher.id
+
+def test_migrate_researcher_lookup_backfills_existing_rows():
+    from sqlalchemy import text, inspect
+    from backend.db.migrate_researcher_lookup import migrate
+
+    legacy_engine = create_engine("sqlite:///:memory:")
+    with legacy_engine.begin() as conn:
+        conn.execute(text("CREATE TABLE Researcher (id INTEGER PRIMARY KEY, name VARCHAR, profile_link VARCHAR, summary VARCHAR)"))
+        conn.execute(text(
+            "INSERT INTO Researcher (name, profile_link) VALUES "
+            "('Jane Smith', 'https://dl.acm.org/profile/5678'), ('Tom LEE', NULL)"
+        ))
+
+    migrate(legacy_engine)
+    migrate(legacy_engine)
+
+    with legacy_engine.connect() as conn:
+        rows = conn.execute(text("SELECT normalized_name, profile_id FROM Researcher ORDER BY id")).all()
+    assert rows == [('jane smith', '5678'), ('tom lee', None)]
+    indexes = {index['name'] for index in inspect(legacy_engine).get_indexes('Researcher')}
+    assert {'ix_Researcher_normalized_name', 'ix_Researcher_profile_id'} <= indexes
+
+def test_network_nodes_and_links(setup_database, session):
+    import json
+    from backend.authorNetworkCode import convert_to_json
+
+    researchers = [
+        Researcher(id=1, name="Adriana Wilde", profile_link="https://dl.acm.org/profile/1"),
+        Researcher(id=2, name="Jerzy Wilde", profile_link="https://dl.acm.org/profile/2"),
+        Researcher(id=3, name="Enrico Gerding", profile_link="https://dl.acm.org/profile/3"),
+        Researcher(id=4, name="Unrelated Author", profile_link="https://dl.acm.org/profile/4"),
+    ]
+    session.add_all(researchers)
+    session.add_all([Paper(doi="10.1/a", title="A"), Paper(doi="10.1/b", title="B"), Paper(doi="10.1/c", title="C")])
+    session.add_all([
+        PaperAuthors(doi="10.1/a", id=1), PaperAuthors(doi="10.1/a", id=2), PaperAuthors(doi="10.1/a", id=3),
+        PaperAuthors(doi="10.1/b", id=1), PaperAuthors(doi="10.1/b", id=3),
+        PaperAuthors(doi="10.1/c", id=2), PaperAuthors(doi="10.1/c", id=4),
+    ])
+    session.commit()
+
+    graph = json.loads(convert_to_json("adriana  WILDE", session=session))
+
+    assert graph["nodes"] == [
+        {"id": "1", "name": "Adriana Wilde", "link": "https://dl.acm.org/profile/1"},
+        {"id": "3", "name": "Enrico Gerding", "link": "https://dl.acm.org/profile/3"},
+        {"id": "2", "name": "Jerzy Wilde", "link": "https://dl.acm.org/profile/2"},
+    ]
+    assert graph["links"] == [
+        {"source": "2", "target": "3"},
+        {"source": "1", "target": "3"},
+        {"source": "1", "target": "2"},
+    ]
+
+def test_multi_hop_network_ranks_by_collaboration_weight_and_is_cached(setup_database, session):
+    import json
+    from unittest.mock import patch
+    import backend.authorNetworkCode as nw
+
+    session.add_all([
+        Researcher(id=i, name=f"Researcher {i}", profile_link=f"https://dl.acm.org/profile/{i}")
+        for i in range(1, 7)
+    ])
+    # 1-2 share two papers and 1-3 one; 2-4 share two papers and 3-5 one; 6 is three hops away via 4
+    authors_by_paper = {"a": [1, 2], "b": [1, 2], "c": [1, 3], "d": [2, 4], "e": [2, 4], "f": [3, 5], "g": [4, 6]}
+    session.add_all([Paper(doi=doi, title=doi) for doi in authors_by_paper])
+    session.add_all([PaperAuthors(doi=doi, id=id) for doi, ids in authors_by_paper.items() for id in ids])
+    session.commit()
+    nw.network_cache = nw.NetworkCache()
+
+    graph = json.loads(nw.convert_to_json("Researcher 1", depth=2, max_nodes=3, session=session))
+
+    assert [node["id"] for node in graph["nodes"]] == ["1", "2", "3", "4"]
+    assert graph["links"] == [
+        {"source": "1", "target": "2"},
+        {"source": "1", "target": "3"},
+        {"source": "2", "target": "4"},
+    ]
+
+    with patch.object(nw, "generate_multi_hop_network") as generate:
+        assert json.loads(nw.convert_to_json("Researcher 1", depth=2, max_nodes=3, session=session)) == graph
+        generate.assert_not_called()
+
+    # writers bump the network version with a new collaboration, so the network is rebuilt
+    session.add(PaperAuthors(doi="g", id=1))
+    bump_network_version(session)
+    session.commit()
+    graph = json.loads(nw.convert_to_json("Researcher 1", depth=2, max_nodes=3, session=session))
+    assert {"source": "1", "target": "4"} in graph["links"]
+
+def test_author_wrapped_counts_collaborations_in_one_query(setup_database, session):
+    from datetime import date
+    from sqlalchemy import event
+
+    session.add_all([
+        Researcher(id=1, name="Main Author", profile_link="https://dl.acm.org/profile/1"),
+        Researcher(id=2, name="Frequent Author", profile_link="https://dl.acm.org/profile/2"),
+        Researcher(id=3, name="Occasional Author", profile_link="https://dl.acm.org/profile/3"),
+        # a duplicate row of the main author is not their own co-author
+        Researcher(id=4, name="M. Author", profile_link="https://dl.acm.org/profile/1"),
+    ])
+    authors_by_paper = {"a": ([1, 2, 4], 2023), "b": ([1, 2], 2023), "c": ([1, 2, 3], 2022), "d": ([2, 3], 2022)}
+    session.add_all([Paper(doi=doi, title=doi, publication_date=date(year, 1, 1)) for doi, (_, year) in authors_by_paper.items()])
+    session.add_all([PaperAuthors(doi=doi, id=id) for doi, (ids, _) in authors_by_paper.items() for id in ids])
+    session.commit()
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(session.bind, "before_cursor_execute", listener)
+    try:
+        wrapped = get_author_wrapped("Main Author", session=session)
+    finally:
+        event.remove(session.bind, "before_cursor_execute", listener)
+
+    assert len(statements) == 1
+    assert wrapped["Total Co-Authors"] == 2
+    assert wrapped["Co-Author Summary"] == [
+        {"Name": "Frequent Author", "Profile Link": "https://dl.acm.org/profile/2", "Collaboration Count": 3},
+        {"Name": "Occasional Author", "Profile Link": "https://dl.acm.org/profile/3", "Collaboration Count": 1},
+    ]
+
+    wrapped = get_author_wrapped("Main Author", by_year=True, session=session)
+    assert [bucket["Year"] for bucket in wrapped["Collaborations By Year"]] == [2023, 2022]
+    assert wrapped["Collaborations By Year"][0]["Co-Author Summary"] == [
+        {"Name": "Frequent Author", "Profile Link": "https://dl.acm.org/profile/2", "Collaboration Count": 2},
+    ]
+    assert wrapped["Collaborations By Year"][1]["Total Co-Authors"] == 2
+    assert wrapped["Co-Author Summary"][0]["Collaboration Count"] == 3
+
+    assert get_author_wrapped("Nobody", session=session) is None
+
+def test_update_author_details_keys_co_authors_by_profile_id(setup_database, session):
+    assert update_author_details_in_db({'Name': 'Nobody', 'Publications': []}, session=session) is None
+
+    session.add(Researcher(name='John Doe', profile_link="https://dl.acm.org/profile/1234"))
+    session.commit()
+    author_details = {
+        'Name': 'John Doe',
+        'Profile Link': "https://dl.acm.org/profile/1234",
+        'Publications': [{
+            'Title': 'Two Namesakes',
+            'DOI': '10.1234/namesakes',
+            'Co-Authors': [
+                {'Name': 'Wei Zhang', 'Profile Link': "https://dl.acm.org/profile/1111"},
+                {'Name': 'Wei Zhang', 'Profile Link': "https://dl.acm.org/profile/2222"},
+            ],
+        }],
+    }
+
+    version = get_network_version(session)
+    report = update_author_details_in_db(author_details, session=session)
+
+    # paper + two distinct co-authors + three authorships
+    assert report == {"inserted": 6, "updated": 0, "unchanged": 1}
+    assert session.query(Researcher).filter_by(name='Wei Zhang').count() == 2
+    assert get_network_version(session) == version + 1
+
+    update_author_details_in_db(author_details, session=session)
+    assert get_network_version(session) == version + 1
+
+def test_bump_network_version_never_inserts_the_counter_row(setup_database, session):
+    bump_network_version(session)
+    assert get_network_version(session) == 1
+
+    session.query(NetworkVersion).delete()
+    bump_network_version(session)
+    assert session.query(NetworkVersion).count() == 0
+    assert get_network_version(session) == 0
+
+def test_lookup_columns_follow_orm_and_core_updates(setup_database, session):
+    from sqlalchemy import update
+    from backend.db.models import with_lookup_columns
+
+    session.add_all([
+        Researcher(id=1, name='John Doe', profile_link="https://dl.acm.org/profile/1234"),
+        Researcher(id=2, name='Jane Roe', profile_link="https://dl.acm.org/profile/4321"),
+    ])
+    session.commit()
+
+    # ORM attribute update
+    assert update_record(Researcher, {'id': 1}, {'name': 'Jonathan  DOE', 'profile_link': "https://dl.acm.org/profile/5678"}, session=session)
+    # Core update
+    session.execute(update(Researcher).where(Researcher.id == 2).values(
+        **with_lookup_columns({'name': 'Janet  ROE', 'profile_link': "https://dl.acm.org/profile/8765"})
+    ))
+    session.commit()
+
+    rows = session.query(Researcher.id, Researcher.normalized_name, Researcher.profile_id).order_by(Researcher.id).all()
+    assert rows == [(1, 'jonathan doe', '5678'), (2, 'janet roe', '8765')]
+    assert get_author_details_from_db('jonathan doe', session=session)['Name'] == 'Jonathan  DOE'
+    assert get_author_details_from_db('janet roe', session=session)['Name'] == 'Janet  ROE'
@@ -0,0 +1,186 @@
+import threading
+
+import networkx as nx
+import numpy as np
+from backend.app.graph_embeddings import EmbeddingIndex, EmbeddingStore
+
+def make_store(train=None, **kwargs):
+    graph = nx.Graph()
+    lock = threading.Lock()
+    calls = []
+
+    def default_train(snapshot):
+        calls.append(snapshot.number_of_nodes())
+        return {node: np.full(4, float(len(calls)), dtype=np.float32) for node in snapshot.nodes}
+
+    store = EmbeddingStore(graph, lock, train or default_train, dimensions=4, **kwargs)
+    return graph, store, calls
+
+def test_new_nodes_are_embedded_from_their_neighbours():
+    graph, store, calls = make_store(min_new_nodes=100)
+    graph.add_edge("Author: a", "Field: HCI")
+    graph.add_edge("Author: a", "Field: Visualization")
+    store.index.add("Field: HCI", [1, 0, 0, 0])
+    store.index.add("Field: Visualization", [0, 1, 0, 0])
+
+    store.add_nodes(["Author: a"])
+
+    assert np.allclose(store.get("Author: a"), [np.sqrt(0.5), np.sqrt(0.5), 0, 0])
+    assert calls == []
+
+def test_unconnected_nodes_get_deterministic_vectors():
+    graph, store, _ = make_store(min_new_nodes=100)
+    graph.add_edge("Author: a", "Field: HCI")
+    graph.add_node("Author: b")
+
+    store.add_nodes(["Author: a", "Field: HCI", "Author: b"])
+
+    # the author and its field are both new, so the author follows the field's vector
+    assert np.allclose(store.get("Author: a"), store.get("Field: HCI"))
+    expected = store._random_vector("Author: b")
+    assert np.allclose(store.get("Author: b"), expected / np.linalg.norm(expected))
+    assert store.new_since_training == 3
+
+def test_retrain_runs_in_background_once_enough_nodes_are_added():
+    graph, store, calls = make_store(min_new_nodes=2)
+    graph.add_edge("Author: a", "Field: HCI")
+    store.add_nodes(["Author: a", "Field: HCI"])
+
+    for _ in range(100):
+        if not store.retraining and calls:
+            break
+        threading.Event().wait(0.01)
+
+    assert calls == [2]
+    assert np.allclose(store.get("Author: a"), 0.5)
+    assert store.trained_count == 2
+    assert store.new_since_training == 0
+    assert not store.schedule_retrain()
+
+def test_retrain_keeps_nodes_added_during_training():
+    def train(snapshot):
+        graph.add_node("Author: late")
+        store.add_nodes(["Author: late"])
+        return {node: np.ones(4, dtype=np.float32) for node in snapshot.nodes}
+
+    graph, store, _ = make_store(train=train, min_new_nodes=100)
+    graph.add_node("Author: a")
+    store.retrain()
+
+    assert np.allclose(store.get("Author: a"), 0.5)
+    assert store.get("Author: late") is not None
+    assert store.new_since_training == 1
+
+def test_late_nodes_are_embedded_again_in_the_new_basis():
+    def train(snapshot):
+        # the node joins while training runs, next to a node that is being retrained
+        graph.add_edge("Author: late", "Field: HCI")
+        store.add_nodes(["Author: late"])
+        return {node: np.array([0, 0, 1, 0], dtype=np.float32) for node in snapshot.nodes}
+
+    graph, store, _ = make_store(train=train, min_new_nodes=100)
+    graph.add_node("Field: HCI")
+    store.index.add("Field: HCI", [1, 0, 0, 0])
+    store.retrain()
+
+    assert np.allclose(store.get("Author: late"), [0, 0, 1, 0])
+
+def test_least_recently_added_nodes_are_evicted():
+    graph, store, _ = make_store(min_new_nodes=100, max_nodes=10)
+    for i in range(12):
+        graph.add_node(f"Author: {i}")
+        store.add_nodes([f"Author: {i}"])
+
+    assert graph.number_of_nodes() <= 10
+    assert "Author: 0" not in graph and store.get("Author: 0") is None
+    assert "Author: 11" in graph and store.get("Author: 11") is not None
+    assert set(store.index.ids) == set(graph.nodes)
+
+def test_graph_and_vectors_are_persisted_together(tmp_path):
+    path = str(tmp_path / "embeddings.npz")
+    graph, store, _ = make_store(min_new_nodes=100, path=path)
+    graph.add_edge("Author: a", "Field: HCI", weight=0.5)
+    graph.nodes["Author: a"]["profile_link"] = "https://dl.acm.org/profile/1"
+    store.add_nodes(["Author: a", "Field: HCI"])
+    store.retrain()
+
+    restarted_graph, restarted, _ = make_store(min_new_nodes=100, path=path)
+    assert restarted_graph.number_of_nodes() == 0
+
+    assert np.allclose(restarted.get("Author: a"), store.get("Author: a"))
+    assert restarted_graph.edges["Author: a", "Field: HCI"]["weight"] == 0.5
+    assert restarted_graph.nodes["Author: a"]["profile_link"] == "https://dl.acm.org/profile/1"
+
+def test_store_file_is_created_on_first_retrain(tmp_path):
+    path = tmp_path / "cache" / "embeddings.npz"
+    graph, store, _ = make_store(min_new_nodes=100, path=str(path))
+    graph.add_node("Author: a")
+    store.add_nodes(["Author: a"])
+    assert not path.exists()
+
+    store.retrain()
+    assert path.exists()
+
+def test_most_similar_scores_mean_similarity_within_tag():
+    graph, store, _ = make_store(tag_for=lambda node: node.split(":")[0])
+    store.index.add_many(
+        ["Author: a", "Author: b", "Author: c", "Field: HCI"],
+        [[1, 0, 0, 0], [0, 1, 0, 0], [1, 1, 0, 0], [1, 1, 0.1, 0]],
+        ["Author", "Author", "Author", "Field"]
+    )
+
+    results = store.most_similar(["Author: a", "Author: b"], k=5, tag="Author", exclude={"Author: a", "Author: b"})
+
+    assert [node for node, _ in results] == ["Author: c"]
+    assert np.isclose(results[0][1], np.sqrt(0.5))
+
+def random_index(count=2000, dimensions=16):
+    vectors = np.random.default_rng(0).normal(size=(count, dimensions))
+    index = EmbeddingIndex(dimensions, capacity=8)
+    index.add_many([f"Author: {i}" for i in range(count)], vectors, ["author" if i % 2 else "field" for i in range(count)])
+    return index, vectors
+
+def test_index_search_matches_brute_force():
+    index, vectors = random_index()
+    query = vectors[7]
+
+    results = index.search(query, k=10, tag="author", exclude={"Author: 7"})
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normalized @ (query / np.linalg.norm(query))
+    expected = [i for i in np.argsort(-scores) if i % 2 and i != 7][:10]
+    assert [node for node, _ in results] == [f"Author: {i}" for i in expected]
+    assert np.allclose([score for _, score in results], scores[expected], atol=1e-5)
+
+def test_index_search_among_scores_only_the_given_ids():
+    index, vectors = random_index()
+    among = ["Author: 1", "Author: 3", "Author: 5", "Author: 6", "missing"]
+
+    results = index.search(vectors[3], k=10, tag="author", exclude={"Author: 3"}, among=among)
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normalized @ (vectors[3] / np.linalg.norm(vectors[3]))
+    expected = sorted([1, 5], key=lambda i: -scores[i])
+    assert [node for node, _ in results] == [f"Author: {i}" for i in expected]
+    assert index.search(vectors[3], among=["missing"]) == []
+
+def test_approximate_search_finds_exact_neighbours():
+    index, vectors = random_index()
+    index.build_clusters(n_clusters=20)
+    query = vectors[3]
+
+    exact = index.search(query, k=1)
+    approximate = index.search(query, k=1, approximate=True, n_probe=4)
+
+    assert approximate == exact == [("Author: 3", approximate[0][1])]
+
+def test_index_save_and_load(tmp_path):
+    index, _ = random_index(count=100)
+    path = str(tmp_path / "embeddings.npz")
+    index.save(path)
+
+    loaded = EmbeddingIndex.load(path)
+
+    assert loaded.ids == index.ids
+    assert np.allclose(loaded.matrix, index.matrix)
+    assert loaded.search(index.get("Author: 5"), k=3, tag="author") == index.search(index.get("Author: 5"), k=3, tag="author")
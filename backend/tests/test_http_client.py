@@ -0,0 +1,39 @@
+import time
+from unittest.mock import patch
+
+from backend.app import http_client
+from backend.app.http_client import TokenBucket, HostRateLimiter
+
+def test_token_bucket_only_waits_when_empty():
+    bucket = TokenBucket(rate=20, capacity=2)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    # the third request is queued one interval behind the burst
+    assert abs(bucket.reserve() - 0.05) < 0.01
+
+def test_token_bucket_refills_after_idle_period():
+    bucket = TokenBucket(rate=20, capacity=1)
+    bucket.acquire()
+    time.sleep(0.06)
+
+    assert bucket.reserve() == 0.0
+
+def test_rate_limiter_keeps_a_bucket_per_host():
+    limiter = HostRateLimiter(host_limits={"dl.acm.org": (1.0, 1)}, default_limit=(100.0, 10))
+
+    assert limiter.bucket_for("https://dl.acm.org/profile/1") is limiter.bucket_for("https://dl.acm.org/doi/2")
+    assert limiter.bucket_for("https://dl.acm.org/profile/1") is not limiter.bucket_for("https://example.com/")
+    assert limiter.wait("https://dl.acm.org/profile/1") == 0.0
+    assert limiter.wait("https://example.com/") == 0.0
+
+def test_get_reuses_pooled_connections(echo_stub):
+    limiter = HostRateLimiter(default_limit=(1000.0, 10))
+    with patch.object(http_client, 'rate_limiter', limiter):
+        for page in range(3):
+            response = http_client.get(f"{echo_stub.url}/page/{page}")
+            assert response.json() == {'path': f'/page/{page}'}
+
+    client_ports = {client_address[1] for _, client_address in echo_stub.requests}
+    assert len(echo_stub.requests) == 3
+    assert len(client_ports) == 1
@@ -0,0 +1,129 @@
+import threading
+
+import pytest
+from backend.app.job_queue import AuthorJobQueue, Job, DONE, FAILED, QUEUED, RUNNING
+
+PROFILE = "https://dl.acm.org/profile/81100000001"
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "jobs.db")
+
+@pytest.fixture
+def blocking_queue(db_path):
+    release = threading.Event()
+    calls = []
+
+    def handler(author_name, profile_link):
+        calls.append((author_name, profile_link))
+        release.wait(5)
+        return "summary", {"Name": author_name}
+
+    queue = AuthorJobQueue(handler, max_workers=2, db_path=db_path)
+    yield queue, release, calls
+    release.set()
+    queue.shutdown()
+
+def test_jobs_for_the_same_profile_are_deduplicated(blocking_queue):
+    queue, release, calls = blocking_queue
+
+    first = queue.enqueue("Adriana Wilde", PROFILE)
+    second = queue.enqueue("Adriana Wilde", PROFILE + "?tab=publications")
+    assert second is first
+    assert first.status in (QUEUED, RUNNING)
+
+    release.set()
+    queue.shutdown()
+    assert len(calls) == 1
+    assert queue.get(first.job_id).status == DONE
+    assert first.result == ("summary", {"Name": "Adriana Wilde"})
+
+def test_finished_profile_can_be_queued_again(blocking_queue):
+    queue, release, calls = blocking_queue
+    release.set()
+
+    first = queue.enqueue("Adriana Wilde", PROFILE)
+    queue.executor.submit(lambda: None).result()
+    while first.status != DONE:
+        threading.Event().wait(0.01)
+
+    second = queue.enqueue("Adriana Wilde", PROFILE)
+    assert second.job_id != first.job_id
+
+def test_failed_job_records_the_error(db_path):
+    def handler(author_name, profile_link):
+        raise RuntimeError("scrape failed")
+
+    notified = []
+    queue = AuthorJobQueue(handler, on_enqueue=notified.append, db_path=db_path)
+    job = queue.enqueue("Adriana Wilde", PROFILE)
+    queue.shutdown()
+
+    assert notified == [job]
+    assert job.status == FAILED
+    assert job.error == "scrape failed"
+    assert job.to_dict()["profile_id"] == "81100000001"
+
+def test_unknown_job_id_returns_none(db_path):
+    queue = AuthorJobQueue(lambda *args: None, db_path=db_path)
+    assert queue.get("missing") is None
+    queue.shutdown()
+
+def test_jobs_are_shared_between_worker_processes(blocking_queue, db_path):
+    queue, release, calls = blocking_queue
+    # a second queue on the same database stands in for another gunicorn worker
+    other_calls = []
+    other_worker = AuthorJobQueue(lambda *args: other_calls.append(args), db_path=db_path)
+
+    job = queue.enqueue("Adriana Wilde", PROFILE)
+    assert other_worker.enqueue("Adriana Wilde", PROFILE).job_id == job.job_id
+    assert other_worker.get(job.job_id).status in (QUEUED, RUNNING)
+    assert other_worker.has_active_job(PROFILE)
+
+    release.set()
+    queue.shutdown()
+    other_worker.shutdown()
+    polled = other_worker.get(job.job_id)
+    assert polled.status == DONE
+    assert polled.result == ["summary", {"Name": "Adriana Wilde"}]
+    assert not other_worker.has_active_job(PROFILE)
+    assert other_calls == [] and len(calls) == 1
+
+def test_abandoned_jobs_do_not_block_new_ones(db_path):
+    queue = AuthorJobQueue(lambda *args: None, db_path=db_path, stale_after=5)
+    # a running job left behind by a worker that died
+    job = Job("Adriana Wilde", PROFILE)
+    conn = queue._connect()
+    conn.execute(
+        "INSERT INTO jobs (job_id, profile_id, author_name, profile_link, status, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+        (job.job_id, job.profile_id, job.author_name, job.profile_link, RUNNING, job.created_at - 10)
+    )
+    conn.close()
+
+    assert queue.enqueue("Adriana Wilde", PROFILE).job_id != job.job_id
+    assert queue.get(job.job_id).status == FAILED
+    queue.shutdown()
+
+def test_unencodable_result_fails_the_job(db_path):
+    queue = AuthorJobQueue(lambda *args: ("summary", {"Seen": {1, 2}}), db_path=db_path)
+    job = queue.enqueue("Adriana Wilde", PROFILE)
+    queue.shutdown()
+
+    polled = AuthorJobQueue(lambda *args: None, db_path=db_path).get(job.job_id)
+    assert polled.status == FAILED
+    assert polled.error.startswith("Job result could not be encoded")
+    assert not queue.has_active_job(PROFILE)
+
+def test_heartbeats_keep_long_jobs_active(db_path):
+    release = threading.Event()
+    queue = AuthorJobQueue(lambda *args: release.wait(5), db_path=db_path, stale_after=0.3, heartbeat_interval=0.05)
+    other_worker = AuthorJobQueue(lambda *args: None, db_path=db_path, stale_after=0.3)
+
+    job = queue.enqueue("Adriana Wilde", PROFILE)
+    threading.Event().wait(0.6)
+
+    assert other_worker.has_active_job(PROFILE)
+    assert other_worker.enqueue("Adriana Wilde", PROFILE).job_id == job.job_id
+    release.set()
+    queue.shutdown()
+    other_worker.shutdown()
@@ -0,0 +1,126 @@
+import sqlite3
+import threading
+
+import pytest
+from backend.app.progress_manager import ProgressManager
+
+PROFILE = "81100000001"
+
+@pytest.fixture
+def progress_manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(ProgressManager, "_db_path", str(tmp_path / "progress.db"))
+    monkeypatch.setattr(ProgressManager, "_instance", None)
+    return ProgressManager()
+
+def test_stream_starts_with_stored_status_and_follows_updates(progress_manager):
+    progress_manager.update_progress(PROFILE, "Checking database for existing author...")
+    stream = progress_manager.stream_progress(PROFILE, poll_interval=5)
+    assert next(stream) == "Checking database for existing author..."
+
+    def publish():
+        progress_manager.update_progress(PROFILE, "Scraping latest publications...")
+        progress_manager.update_progress(PROFILE, "Process complete. No updates required.")
+
+    threading.Timer(0.05, publish).start()
+    assert list(stream) == ["Scraping latest publications...", "Process complete. No updates required."]
+    assert progress_manager._subscribers == {}
+
+def test_stream_ends_when_progress_is_cleared(progress_manager):
+    stream = progress_manager.stream_progress(PROFILE, poll_interval=5)
+    threading.Timer(0.05, progress_manager.clear_progress, args=(PROFILE,)).start()
+
+    assert list(stream) == []
+
+def test_stream_ends_on_a_stopped_status(progress_manager):
+    progress_manager.update_progress(PROFILE, "Scraping failed. Process stopped.")
+
+    assert list(progress_manager.stream_progress(PROFILE, poll_interval=5)) == ["Scraping failed. Process stopped."]
+
+def test_stream_ends_when_nothing_is_running(progress_manager):
+    stream = progress_manager.stream_progress(PROFILE, poll_interval=5, is_active=lambda profile_link: False)
+
+    assert list(stream) == []
+
+def test_stream_ends_once_the_job_is_gone(progress_manager):
+    active = [True]
+    stream = progress_manager.stream_progress(PROFILE, poll_interval=0.01, is_active=lambda profile_link: active[0])
+    assert next(stream) is None
+
+    active[0] = False
+    assert list(stream) == []
+
+def test_stream_falls_back_to_the_stored_status(progress_manager):
+    stream = progress_manager.stream_progress(PROFILE, poll_interval=0.01)
+    # simulate a write made by another worker process, which is not published here
+    conn = sqlite3.connect(progress_manager._db_path)
+    conn.execute("INSERT INTO progress (profile_link, status) VALUES (?, ?)", (PROFILE, "Scraping latest publications..."))
+    conn.commit()
+    conn.close()
+
+    statuses = [status for status, _ in zip(stream, range(5)) if status is not None]
+    assert statuses[0] == "Scraping latest publications..."
+
+def stored_rows(progress_manager):
+    conn = sqlite3.connect(progress_manager._db_path)
+    rows = conn.execute("SELECT profile_link, status FROM progress ORDER BY profile_link").fetchall()
+    conn.close()
+    return rows
+
+def test_buffered_updates_are_flushed_as_latest_status(progress_manager):
+    progress_manager.update_progress(PROFILE, "Checking database for existing author...")
+    progress_manager.update_progress(PROFILE, "Scraping latest publications...")
+    progress_manager.update_progress("81100000002", "Process complete. No updates required.")
+
+    assert progress_manager.get_progress(PROFILE) == "Scraping latest publications..."
+    progress_manager.flush()
+
+    assert progress_manager._pending == {}
+    assert stored_rows(progress_manager) == [
+        (PROFILE, "Scraping latest publications..."),
+        ("81100000002", "Process complete. No updates required."),
+    ]
+
+def test_cleared_status_stays_visible_to_other_workers_until_the_delay(progress_manager, monkeypatch):
+    progress_manager.update_progress(PROFILE, "Process complete. No updates required.")
+    progress_manager.clear_progress(PROFILE)
+    progress_manager.flush()
+
+    # a stream in another worker process only polls the table
+    assert stored_rows(progress_manager) == [(PROFILE, "Process complete. No updates required.")]
+    assert list(progress_manager.stream_progress(PROFILE)) == ["Process complete. No updates required."]
+
+    monkeypatch.setattr(progress_manager, "_clear_delay", 0)
+    progress_manager.flush()
+    assert stored_rows(progress_manager) == []
+    assert progress_manager.get_progress(PROFILE, max_retries=1, retry_delay=0) == "No progress available."
+
+def test_delayed_clear_keeps_the_status_of_a_new_job(progress_manager, monkeypatch):
+    progress_manager.update_progress(PROFILE, "Process complete. No updates required.")
+    progress_manager.clear_progress(PROFILE)
+    progress_manager.update_progress(PROFILE, "Queued for processing...")
+
+    monkeypatch.setattr(progress_manager, "_clear_delay", 0)
+    progress_manager.flush()
+    assert stored_rows(progress_manager) == [(PROFILE, "Queued for processing...")]
+
+def test_connection_is_reused_per_thread(progress_manager):
+    conn = progress_manager._connection()
+    assert progress_manager._connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(progress_manager._connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+
+def test_cleanup_removes_stale_rows(progress_manager):
+    progress_manager.update_progress(PROFILE, "Scraping latest publications...")
+    progress_manager.flush()
+    conn = sqlite3.connect(progress_manager._db_path)
+    conn.execute("INSERT INTO progress (profile_link, status, updated_at) VALUES ('stale', 'Scraping...', '2020-01-01 00:00:00')")
+    conn.commit()
+    conn.close()
+
+    assert progress_manager.cleanup(ttl=3600) == 1
+    assert stored_rows(progress_manager) == [(PROFILE, "Scraping latest publications...")]
@@ -0,0 +1,74 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from backend.app.recommendations_cache import RecommendationsCache
+
+KEY = ("adriana wilde",)
+RECOMMENDATIONS = {"Recommended Authors": [], "Authors by Weighted Fields": []}
+WEIGHTS = [("Visualization", 2), ("Data Science", 1)]
+
+def test_get_returns_what_was_set():
+    cache = RecommendationsCache()
+    assert cache.get(KEY) == (None, None)
+
+    cache.set(KEY, RECOMMENDATIONS, WEIGHTS)
+
+    assert cache.get(KEY) == (RECOMMENDATIONS, WEIGHTS)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_entries_expire_after_ttl_even_across_days():
+    cache = RecommendationsCache(ttl=3600)
+    cache.set(KEY, RECOMMENDATIONS, WEIGHTS)
+
+    # a day and a minute later: timedelta.seconds would have wrapped round to 60
+    with patch('backend.app.recommendations_cache.time.monotonic', return_value=time.monotonic() + 86460):
+        assert cache.get(KEY) == (None, None)
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["entries"] == 0
+
+def test_least_recently_used_entries_are_evicted():
+    cache = RecommendationsCache(max_entries=10)
+    for i in range(10):
+        cache.set((f"author {i}",), RECOMMENDATIONS, WEIGHTS)
+    cache.get(("author 0",))
+
+    cache.set(("author 10",), RECOMMENDATIONS, WEIGHTS)
+
+    assert cache.get(("author 1",)) == (None, None)
+    assert cache.get(("author 0",)) == (RECOMMENDATIONS, WEIGHTS)
+    assert cache.stats()["entries"] == 10
+    assert cache.stats()["evictions"] == 1
+
+def test_backing_store_is_shared_between_instances(tmp_path):
+    db_path = str(tmp_path / "recommendations_cache.db")
+    cache = RecommendationsCache(db_path=db_path)
+    assert not (tmp_path / "recommendations_cache.db").exists()
+    cache.set(KEY, RECOMMENDATIONS, WEIGHTS)
+
+    other_worker = RecommendationsCache(db_path=db_path)
+
+    assert other_worker.get(KEY) == (RECOMMENDATIONS, WEIGHTS)
+    assert other_worker.stats()["store_hits"] == 1
+
+def test_eviction_keeps_entries_and_recency_in_step():
+    cache = RecommendationsCache(max_entries=10)
+    stop = threading.Event()
+
+    def read():
+        while not stop.is_set():
+            for i in range(20):
+                cache.get((f"author {i}",))
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for i in range(500):
+        cache.set((f"author {i % 20}",), RECOMMENDATIONS, WEIGHTS)
+    stop.set()
+    for reader in readers:
+        reader.join()
+
+    assert set(cache.last_used) == set(cache.entries)
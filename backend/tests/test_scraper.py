@@ -194,3 +194,69 @@ def test_author_in_database_up_to_date_with_summary(mock_get_researcher_summary,
     assert author_details_db == existing_data
     mock_get_researcher_summary.assert_called_once()
 
+
+PUBLICATIONS_PAGE = """
+<ul>
+    <li class="search__item">
+        <a href="/doi/10.1145/1">First Paper</a>
+        <a title="Jarutas Andritsch" href="/profile/99661013948">Jarutas Andritsch</a>
+    </li>
+    <li class="search__item">
+        <a href="/doi/10.1145/2">Second Paper</a>
+    </li>
+    <li class="search__item">
+        <a href="/doi/10.1145/1">First Paper</a>
+    </li>
+</ul>
+"""
+
+@patch('backend.app.author_scraper.get_metadata_for_dois')
+@patch('backend.app.author_scraper.delayed_request')
+def test_scrape_author_publications_fetches_metadata_per_doi(mock_delayed_request, mock_get_metadata):
+    mock_delayed_request.return_value.status_code = 200
+    mock_delayed_request.return_value.content = PUBLICATIONS_PAGE
+    mock_get_metadata.return_value = {
+        "10.1145/1": ("First abstract", "2023-09-07", 3),
+        "10.1145/2": ("No abstract available.", "Unknown", 0),
+    }
+
+    publications = scrape_author_publications("https://dl.acm.org/profile/99659070982", "Adriana Wilde")
+
+    assert [pub["DOI"] for pub in publications] == ["10.1145/1", "10.1145/2"]
+    mock_get_metadata.assert_called_once_with(["10.1145/1", "10.1145/2"])
+    assert publications[0]["Abstract"] == "First abstract"
+    assert publications[0]["Publication Date"] == "2023-09-07"
+    assert publications[0]["Citation Count"] == 3
+    assert publications[0]["Co-Authors"] == [
+        {"Name": "Jarutas Andritsch", "Profile Link": "https://dl.acm.org/profile/99661013948"}
+    ]
+    assert publications[1]["Publication Date"] is None
+    assert publications[1]["Citation Count"] == 0
+
+@patch('backend.app.author_scraper.stop_progress')
+@patch('backend.app.author_scraper.llmNew.request')
+@patch('backend.app.author_scraper.get_researcher_summary')
+@patch('backend.app.author_scraper.get_author_details_from_db')
+@patch('backend.app.author_scraper.scrape_latest_publication')
+@patch('backend.app.author_scraper.get_researcher_by_profile_link')
+def test_summary_timeout_fails_the_job(mock_get_researcher, mock_scrape_latest, mock_get_author_details,
+                                       mock_get_researcher_summary, mock_request, mock_stop_progress):
+    mock_get_researcher.return_value = None
+    mock_scrape_latest.return_value = {"Publication Date": "2023-09-07"}
+    mock_get_author_details.return_value = {"Publications": [{"Publication Date": "2023-09-07"}]}
+    mock_get_researcher_summary.return_value = None
+    mock_request.side_effect = llmNew.SummaryTimeoutError("Summary generation took too long")
+
+    with pytest.raises(llmNew.SummaryTimeoutError):
+        update_author_if_needed("Adriana Wilde", "https://dl.acm.org/profile/99659070982")
+    mock_stop_progress.assert_called_once_with(
+        "https://dl.acm.org/profile/99659070982", "Summary generation timed out. Process stopped."
+    )
+
+def test_summary_request_gives_up_after_the_timeout():
+    from concurrent.futures import Future
+
+    with patch.object(llmNew, 'SUMMARY_TIMEOUT', 0.01), \
+            patch.object(llmNew.summary_service, 'submit', return_value=Future()):
+        with pytest.raises(llmNew.SummaryTimeoutError):
+            llmNew.request("Adriana Wilde")
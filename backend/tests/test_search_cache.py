@@ -0,0 +1,101 @@
+import time
+from unittest.mock import patch, MagicMock
+
+import pytest
+from backend.app.search_cache import SearchPageCache, FieldAuthorCache
+from backend.app.acm_author_searcher import ACMAuthorSearcher
+
+RESULTS = [{"Name": "Adriana Wilde", "Location": "Southampton", "Profile Link": "https://dl.acm.org/profile/1"}]
+
+@pytest.fixture
+def cache(tmp_path):
+    return SearchPageCache(db_path=str(tmp_path / "search_cache.db"), max_entries=2)
+
+def test_pages_are_keyed_by_type_normalized_query_and_page(cache):
+    cache.set('author', 'Adriana  Wilde', 0, RESULTS)
+
+    assert cache.get('author', 'adriana wilde', 0) == RESULTS
+    assert cache.get('field', 'adriana wilde', 0) is None
+    assert cache.get('author', 'adriana wilde', 1) is None
+    assert cache.stats() == {"hits": 1, "misses": 2}
+
+def test_page_cache_file_is_created_on_first_use(tmp_path):
+    db_path = tmp_path / "cache" / "search_cache.db"
+    page_cache = SearchPageCache(db_path=str(db_path))
+    assert not db_path.exists()
+
+    page_cache.set('author', 'a', 0, RESULTS)
+    assert db_path.exists()
+
+def test_least_recently_used_page_is_evicted(cache):
+    cache.set('author', 'a', 0, RESULTS)
+    time.sleep(0.01)
+    cache.set('author', 'a', 1, RESULTS)
+    time.sleep(0.01)
+    cache.get('author', 'a', 0)
+    time.sleep(0.01)
+    cache.set('author', 'a', 2, RESULTS)
+
+    assert cache.get('author', 'a', 0) == RESULTS
+    assert cache.get('author', 'a', 1) is None
+    assert cache.get('author', 'a', 2) == RESULTS
+
+def test_expired_pages_are_ignored(tmp_path):
+    cache = SearchPageCache(db_path=str(tmp_path / "search_cache.db"), ttl=-1)
+    cache.set('author', 'a', 0, RESULTS)
+
+    assert cache.get('author', 'a', 0) is None
+
+@patch('backend.app.acm_author_searcher.http_client.get')
+def test_repeated_search_is_served_from_cache(mock_get, cache):
+    mock_get.return_value = MagicMock(
+        status_code=200,
+        content=b'<li class="search__item"><a href="/profile/1" title="Adriana Wilde">Adriana Wilde</a></li>'
+    )
+
+    first = ACMAuthorSearcher(page_cache=cache).search_acm_field("Computing Education", 0)
+    calls = mock_get.call_count
+    second = ACMAuthorSearcher(page_cache=cache).search_acm_field("computing education", 0)
+
+    assert calls == 2
+    assert mock_get.call_count == calls
+    assert first == second
+
+def test_field_cache_serves_fresh_then_stale_then_expires(tmp_path):
+    field_cache = FieldAuthorCache(ttl=60, stale_ttl=60)
+    field_cache.set('Data Science', RESULTS)
+    assert field_cache.get('data  science') == (RESULTS, True)
+
+    with patch('backend.app.search_cache.time.time', return_value=time.time() + 90):
+        assert field_cache.get('Data Science') == (RESULTS, False)
+    with patch('backend.app.search_cache.time.time', return_value=time.time() + 150):
+        assert field_cache.get('Data Science') == (None, False)
+    assert field_cache.stats() == {"hits": 1, "stale_hits": 1, "misses": 1}
+
+def test_field_cache_is_persisted(tmp_path):
+    db_path = str(tmp_path / "field_cache.db")
+    field_cache = FieldAuthorCache(db_path=db_path)
+    assert not (tmp_path / "field_cache.db").exists()
+    field_cache.set('Data Science', RESULTS)
+
+    assert FieldAuthorCache(db_path=db_path).get('Data Science') == (RESULTS, True)
+
+def test_only_one_refresh_runs_per_field():
+    field_cache = FieldAuthorCache()
+
+    assert field_cache.begin_refresh('Data Science')
+    assert not field_cache.begin_refresh('data science')
+    field_cache.end_refresh('Data Science')
+    assert field_cache.begin_refresh('Data Science')
+
+def test_waiters_get_the_result_of_the_running_refresh():
+    field_cache = FieldAuthorCache()
+    assert field_cache.begin_refresh('Data Science')
+    pending = field_cache.refresh_future('data science')
+
+    assert not field_cache.begin_refresh('Data Science')
+    assert field_cache.refresh_future('Data Science') is pending
+    field_cache.end_refresh('Data Science', RESULTS)
+
+    assert pending.result(timeout=1) == RESULTS
+    assert field_cache.refresh_future('Data Science') is None
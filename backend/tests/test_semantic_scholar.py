@@ -0,0 +1,57 @@
+import pytest
+from backend.app.semantic_scholar import SemanticScholarClient, DOIMetadataCache, DEFAULT_METADATA
+from conftest import SemanticScholarHandler
+
+PAPERS = {
+    "10.1145/1": {"title": "First Paper", "abstract": "First abstract", "publicationDate": "2023-09-07", "citationCount": 3},
+    "10.1145/2": {"title": "Second Paper", "abstract": None, "publicationDate": "2021-01-02", "citationCount": 1},
+}
+
+@pytest.fixture
+def client(tmp_path, semantic_scholar_stub, monkeypatch):
+    monkeypatch.setattr(SemanticScholarHandler, 'papers', PAPERS)
+    cache = DOIMetadataCache(db_path=str(tmp_path / "doi_cache.db"))
+    return SemanticScholarClient(cache=cache, base_url=semantic_scholar_stub.url, batch_size=2)
+
+def test_get_metadata_batches_and_falls_back(client, semantic_scholar_stub):
+    metadata = client.get_metadata(["10.1145/1", "10.1145/2", "10.1145/missing", "10.1145/1"])
+
+    assert metadata["10.1145/1"] == ("First abstract", "2023-09-07", 3)
+    assert metadata["10.1145/2"] == (None, "2021-01-02", 1)
+    assert metadata["10.1145/missing"] == DEFAULT_METADATA
+    # three unique DOIs with a batch size of two
+    assert sorted(len(ids) for ids in semantic_scholar_stub.requests) == [1, 2]
+
+def test_repeated_lookups_are_served_from_cache(client, semantic_scholar_stub):
+    client.get_metadata(["10.1145/1", "10.1145/2"])
+    requests_before = len(semantic_scholar_stub.requests)
+
+    metadata = client.get_metadata(["10.1145/2", "10.1145/1"])
+
+    assert len(semantic_scholar_stub.requests) == requests_before
+    assert metadata["10.1145/1"] == ("First abstract", "2023-09-07", 3)
+    assert client.stats() == {"hits": 2, "misses": 2, "requests": 1}
+
+def test_expired_entries_are_refetched(tmp_path, semantic_scholar_stub, monkeypatch):
+    monkeypatch.setattr(SemanticScholarHandler, 'papers', PAPERS)
+    cache = DOIMetadataCache(db_path=str(tmp_path / "doi_cache.db"), ttl=-1)
+    client = SemanticScholarClient(cache=cache, base_url=semantic_scholar_stub.url)
+
+    client.get_metadata(["10.1145/1"])
+    client.get_metadata(["10.1145/1"])
+
+    assert len(semantic_scholar_stub.requests) == 2
+
+def test_unreachable_server_returns_fallback(tmp_path):
+    cache = DOIMetadataCache(db_path=str(tmp_path / "doi_cache.db"))
+    client = SemanticScholarClient(cache=cache, base_url="http://127.0.0.1:9", timeout=1)
+
+    assert client.get_metadata(["10.1145/1"]) == {"10.1145/1": DEFAULT_METADATA}
+
+def test_cache_file_is_created_on_first_use(tmp_path):
+    db_path = tmp_path / "cache" / "doi_cache.db"
+    cache = DOIMetadataCache(db_path=str(db_path))
+    assert not db_path.exists()
+
+    assert cache.get_many(["10.1145/1"]) == {}
+    assert db_path.exists()
@@ -0,0 +1,132 @@
+import threading
+import time
+
+import pytest
+from backend.llm.core.azure_functions import AzureOpenAIFunctions
+from backend.llm.summary_service import SummaryService
+from conftest import OpenAIHandler
+
+
+@pytest.fixture
+def assistant(openai_stub):
+    return AzureOpenAIFunctions(
+        azure_openai_endpoint=openai_stub.url,
+        azure_openai_key_key="test-key",
+        azure_api_version="2024-02-15-preview",
+        model="gpt-4o",
+    )
+
+def test_concurrent_requests_for_the_same_researcher_share_one_generation(openai_stub, assistant):
+    OpenAIHandler.reply = "Researches graph embeddings."
+    OpenAIHandler.delay = 0.2
+    stored = []
+    service = SummaryService(lambda name, summary: stored.append((name, summary)), max_workers=4)
+
+    def generate(author_name):
+        response = assistant.ask([{"role": "user", "content": author_name}])
+        return response.choices[0].message.content
+
+    start = threading.Barrier(5)
+    futures = []
+
+    def open_author():
+        start.wait()
+        futures.append(service.submit("Adriana Wilde", generate))
+
+    threads = [threading.Thread(target=open_author) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [future.result(5) for future in futures] == ["Researches graph embeddings."] * 5
+    service.shutdown()
+    # ask() makes one completion call and one final answer call per generation
+    assert len(openai_stub.requests) == 2
+    assert stored == [("Adriana Wilde", "Researches graph embeddings.")]
+    assert service.stats() == {"in_flight": 0, "generations": 1, "coalesced": 4}
+
+def test_failed_generation_is_reported_and_not_stored():
+    stored = []
+    service = SummaryService(lambda name, summary: stored.append(summary), max_workers=1)
+    attempts = []
+
+    def generate(author_name):
+        attempts.append(author_name)
+        if len(attempts) == 1:
+            raise RuntimeError("model unavailable")
+        return "Second attempt."
+
+    with pytest.raises(RuntimeError):
+        service.submit("Adriana Wilde", generate).result(5)
+    # the failed generation is no longer in flight, so the next request retries
+    assert service.submit("adriana  WILDE", generate).result(5) == "Second attempt."
+    service.shutdown()
+    assert stored == ["Second attempt."]
+
+def test_different_keys_generate_separately():
+    release = threading.Event()
+    service = SummaryService(lambda name, summary: None, max_workers=2)
+
+    def generate(author_name, suffix=""):
+        release.wait(5)
+        return author_name + suffix
+
+    first = service.submit("Adriana Wilde", generate)
+    regenerated = service.submit("Adriana Wilde", generate, " (revised)", key=("Adriana Wilde", "revise"))
+    assert regenerated is not first
+    release.set()
+    assert first.result(5) == "Adriana Wilde"
+    assert regenerated.result(5) == "Adriana Wilde (revised)"
+    service.shutdown()
+
+def test_generation_outlives_a_timed_out_wait():
+    release = threading.Event()
+    stored = []
+    service = SummaryService(lambda name, summary: stored.append((name, summary)))
+
+    def generate(author_name):
+        release.wait(5)
+        return author_name + " (revised)"
+
+    future = service.submit("Adriana Wilde", generate)
+    with pytest.raises(TimeoutError):
+        future.result(timeout=0.05)
+
+    release.set()
+    assert future.result(5) == "Adriana Wilde (revised)"
+    assert stored == [("Adriana Wilde", "Adriana Wilde (revised)")]
+
+def test_generations_for_one_researcher_run_one_at_a_time():
+    stored = []
+    service = SummaryService(lambda name, summary: stored.append(summary), max_workers=3)
+    running = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def generate(author_name, suffix=""):
+        running.append(author_name)
+        started.set()
+        release.wait(5)
+        running.remove(author_name)
+        return author_name + suffix
+
+    first = service.submit("Adriana Wilde", generate)
+    assert started.wait(5)
+    regenerated = service.submit("adriana wilde", generate, " (revised)", key=("adriana wilde", "revise"))
+    other = service.submit("Jarutas Andritsch", generate)
+    # a different researcher is not held up by the running generation
+    for _ in range(500):
+        if len(running) == 2:
+            break
+        time.sleep(0.01)
+    assert sorted(running) == ["Adriana Wilde", "Jarutas Andritsch"]
+    release.set()
+
+    assert first.result(5) == "Adriana Wilde"
+    assert regenerated.result(5) == "adriana wilde (revised)"
+    assert other.result(5) == "Jarutas Andritsch"
+    service.shutdown()
+    # the regeneration ran after the first generation, so its summary is the one kept
+    assert stored.index("adriana wilde (revised)") > stored.index("Adriana Wilde")
+    assert service.researcher_locks == {}
@@ -0,0 +1,100 @@
+import json
+import time
+
+import pytest
+from backend.llm.functions import web_scraper
+from backend.llm.functions.web_scraper import PageContentCache, WebContentScraper
+from conftest import JSONHandler, StubServer
+
+
+class PageHandler(JSONHandler):
+    def do_GET(self):
+        self.stub.requests.append(self.path)
+        if self.path.startswith('/slow'):
+            time.sleep(1.5)
+        elif self.path.startswith('/medium'):
+            time.sleep(0.3)
+        paragraphs = 20000 if self.path.startswith('/big') else 1
+        body = ("<html><body>" + "<p>Text of %s</p>" % self.path * paragraphs + "</body></html>").encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def page_stub():
+    server = StubServer(PageHandler).start()
+    yield server
+    server.stop()
+
+def test_slow_pages_do_not_hold_back_the_others(page_stub):
+    scraper = WebContentScraper(timeout=5)
+    urls = [f"{page_stub.url}/fast/{i}" for i in range(4)] + [f"{page_stub.url}/slow"]
+
+    started = time.perf_counter()
+    results = json.loads(scraper.scrape_multiple_websites(urls, timeout=0.5))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.2
+    assert [result["url"] for result in results] == urls
+    assert [result["content"] for result in results[:4]] == [f"Text of /fast/{i}" for i in range(4)]
+    assert "error" in results[4]
+
+def test_page_timeout_starts_when_a_worker_picks_the_url_up(page_stub):
+    scraper = WebContentScraper(max_workers=1)
+    urls = [f"{page_stub.url}/medium/{i}" for i in range(2)]
+
+    # the second page waits 0.3s for the only worker, then loads within its own 0.5s
+    results = json.loads(scraper.scrape_multiple_websites(urls, timeout=0.5, queue_timeout=1))
+
+    assert [result.get("content") for result in results] == ["Text of /medium/0", "Text of /medium/1"]
+
+def test_urls_left_in_the_queue_are_reported_as_not_fetched(page_stub):
+    scraper = WebContentScraper(max_workers=1)
+    urls = [f"{page_stub.url}/slow", f"{page_stub.url}/fast/0"]
+
+    results = json.loads(scraper.scrape_multiple_websites(urls, timeout=0.5, queue_timeout=0.1))
+
+    assert "content" not in results[0]
+    assert results[1] == {"url": urls[1], "error": "Not fetched: no worker was free within 0.1 seconds"}
+    assert page_stub.requests == ["/slow"]
+
+def test_downloads_are_capped_and_cached(page_stub):
+    cache = PageContentCache()
+    scraper = WebContentScraper(max_bytes=10_000, cache=cache)
+
+    first = scraper.scrape_website(f"{page_stub.url}/big")
+    assert 0 < len(first["content"]) < 10_000
+
+    assert scraper.scrape_website(f"{page_stub.url}/big") == first
+    assert page_stub.requests == ["/big"]
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+def test_extraction_stops_at_the_token_budget(page_stub):
+    scraper = WebContentScraper(max_tokens=50)
+
+    result = scraper.scrape_website(f"{page_stub.url}/big")
+
+    assert len(result["content"].split()) == 50
+    assert result["content"].startswith("Text of /big\nText of /big")
+
+@pytest.mark.parametrize("use_lxml", [True, False])
+def test_paragraphs_are_extracted_from_chunks(monkeypatch, use_lxml):
+    if not use_lxml:
+        monkeypatch.setattr(web_scraper, "etree", None)
+    html = (
+        '<html><head><meta charset="iso-8859-1"></head><body><div>'
+        '<p>Zoë <b>café</b> one</p><span>not a paragraph</span><p>two three<p>four five</p>'
+        '</div></body></html>'
+    ).encode('latin-1') + b' ' * 4096
+
+    extractor = web_scraper.ParagraphExtractor(max_tokens=None)
+    for i in range(0, len(html), 7):
+        assert extractor.feed(html[i:i + 7]) is False
+    assert extractor.close() == "Zoë café one\ntwo three\nfour five"
+
+    extractor = web_scraper.ParagraphExtractor(max_tokens=4)
+    assert extractor.feed(html) is True
+    assert extractor.close() == "Zoë café one\ntwo"
@@ -61,13 +61,27 @@ function Page() {
     try {
       setLoading(true);
       const response = await fetch(`${BASE_URL}/query/${name}/${profileId}`);
-      const fetchedData = await response.json();
+      let fetchedData = await response.json();
 
       if (!response.ok) {
         throw new Error(
           fetchedData.message || `HTTP error! Status: ${response.status}`
         );
       }
+      // the query runs as a background job; poll it until it finishes
+      while (fetchedData.job_id && !["done", "failed"].includes(fetchedData.status)) {
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+        const jobResponse = await fetch(`${BASE_URL}/jobs/${fetchedData.job_id}`);
+        fetchedData = await jobResponse.json();
+        if (!jobResponse.ok) {
+          throw new Error(
+            fetchedData.error || `HTTP error! Status: ${jobResponse.status}`
+          );
+        }
+      }
+      if (fetchedData.status === "failed") {
+        throw new Error(fetchedData.error || "Failed to process author");
+      }
       if (!fetchedData.author_details) {
         throw new Error("Author details not found");
       }
@@ -29,33 +29,23 @@ const Loading = ({ profileLink }: { profileLink: string }) => {
     "Process complete. No updates required.": 100,
   };
 
-  const fetchProgress = async () => {
-    try {
-      const profileId = profileLink.split("/").pop();
-      const response = await fetch(`${BASE_URL}/progress/${profileId}`);
-      if (response.ok) {
-        const data = await response.json();
-        console.log("Fetched status:", data.status);
-        setStatus(data.status);
-      } else {
-        console.error("Failed to fetch progress. HTTP Status:", response.status);
-        setStatus("Failed to fetch progress. Please try again later.");
-      }
-    } catch (error) {
-      console.error("Error fetching progress:", error.message || error);
-      setStatus("A network error occurred. Please check your connection.");
-    }
-  };
-
   useEffect(() => {
-    const interval = setInterval(fetchProgress, 5000);
-    if (status === "Process complete. Author details updated successfully." ||
-        status === "Process complete. Author details and summary updated successfully." ||
-        status === "Process complete. No updates required.") {
-      clearInterval(interval); // Stop polling
-    }
-    return () => clearInterval(interval); // Cleanup
-  }, [status]);
+    const profileId = profileLink.split("/").pop();
+    // the backend pushes each status change over Server-Sent Events
+    const source = new EventSource(`${BASE_URL}/progress/${profileId}/stream`);
+
+    source.onmessage = (event) => {
+      const data = JSON.parse(event.data);
+      console.log("Received status:", data.status);
+      setStatus(data.status);
+    };
+    source.addEventListener("end", () => source.close());
+    source.onerror = () => {
+      console.error("Progress stream interrupted. Reconnecting...");
+    };
+
+    return () => source.close(); // Cleanup
+  }, [profileLink]);
 
   // Determine progress based on the current status
   const progress = statusProgressMap[status] || 0;